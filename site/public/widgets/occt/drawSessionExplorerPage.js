@@ -91,7 +91,7 @@ async function initOne(root) {
     }
     try {
       const url = resolveUrl(`/occt/draw/${encodeURIComponent(sessionId)}/${encodeURIComponent(logFile)}`);
-      const res = await fetch(url);
+      const res = await fetch(url, { cache: 'no-cache' });
       const text = await res.text();
       logEl.textContent = text;
       logWrapEl.style.display = '';
@@ -101,7 +101,63 @@ async function initOne(root) {
     }
   };
 
+  const stepsOf = (idx) => (Array.isArray(idx?.steps) ? idx.steps : []);
+
+  const fillSteps = (steps) => {
+    stepSel.replaceChildren(
+      ...steps.map((s) => {
+        const id = String(s?.id || '');
+        return el('option', { value: id }, [id ? titleize(id) : 'Step']);
+      }),
+    );
+  };
+
+  // Sessions published with `draw_to_site.py --stream` are "running" until DRAWEXE exits:
+  // re-read the index, append new steps and follow the newest one unless the user picked another.
+  let pollTimer = null;
+  const stopPolling = () => {
+    if (pollTimer) clearTimeout(pollTimer);
+    pollTimer = null;
+  };
+  const schedulePoll = (sessionId) => {
+    stopPolling();
+    pollTimer = setTimeout(() => void pollSession(sessionId), 1500);
+  };
+  const pollSession = async (sessionId) => {
+    pollTimer = null;
+    if (sessionId !== currentSession) return;
+    let idx;
+    try {
+      const res = await fetch(sessionIndexUrl(sessionId), { cache: 'no-store' });
+      if (!res.ok) throw new Error(`HTTP ${res.status}`);
+      idx = await res.json();
+    } catch {
+      schedulePoll(sessionId);
+      return;
+    }
+    if (sessionId !== currentSession) return;
+
+    const prev = stepsOf(currentIndex);
+    const steps = stepsOf(idx);
+    const following = !prev.length || stepSel.value === String(prev[prev.length - 1]?.id);
+    currentIndex = idx;
+    if (steps.length !== prev.length) {
+      const selected = stepSel.value;
+      fillSteps(steps);
+      const last = String(steps[steps.length - 1]?.id || '');
+      stepSel.value = following ? last : selected;
+      if (following && last) await loadStep(last);
+    }
+    await loadLog(sessionId, idx);
+    if (idx?.status === 'running') {
+      schedulePoll(sessionId);
+    } else if (!steps.length) {
+      setStatus('Session has no steps.');
+    }
+  };
+
   const loadSession = async (sessionId) => {
+    stopPolling();
     currentSession = String(sessionId || '');
     setStatus('Loading session…');
     try {
@@ -112,33 +168,37 @@ async function initOne(root) {
       return;
     }
 
-    const steps = Array.isArray(currentIndex?.steps) ? currentIndex.steps : [];
+    const running = currentIndex?.status === 'running';
+    if (running) schedulePoll(currentSession);
+
+    const steps = stepsOf(currentIndex);
     if (!steps.length) {
-      setStatus('Session has no steps.');
+      setStatus(running ? 'Session is running; waiting for the first step…' : 'Session has no steps.');
       return;
     }
 
-    stepSel.replaceChildren(
-      ...steps.map((s) => {
-        const id = String(s?.id || '');
-        return el('option', { value: id }, [id ? titleize(id) : 'Step']);
-      }),
-    );
+    fillSteps(steps);
 
     await loadLog(currentSession, currentIndex);
 
-    // Load first step
-    await loadStep(steps[0]?.id || '');
+    // Load first step (the newest one while the session is still running)
+    const first = running ? steps[steps.length - 1] : steps[0];
+    stepSel.value = String(first?.id || '');
+    await loadStep(first?.id || '');
     setStatus('');
   };
 
   const loadStep = async (stepId) => {
-    const steps = Array.isArray(currentIndex?.steps) ? currentIndex.steps : [];
+    const steps = stepsOf(currentIndex);
     const st = steps.find((s) => String(s?.id) === String(stepId)) || steps[0];
     if (!st) return;
     updateTitle(currentSession, st.id);
     applyViewerOptions();
-    viewer.setMeshFromUrl(meshUrl(currentSession, st.mesh));
+    // Coarse LOD levels (all but the last, which is st.mesh) stream in first.
+    const lods = Array.isArray(st.lods) ? st.lods.slice(0, -1) : [];
+    viewer.setMeshFromUrl(meshUrl(currentSession, st.mesh), {
+      lods: lods.map((l) => meshUrl(currentSession, l?.mesh)),
+    });
   };
 
   sessionSel.addEventListener('change', () => void loadSession(sessionSel.value));
@@ -31,8 +31,57 @@ export function resolveUrl(u) {
   return `${prefix}/${u}`;
 }
 
+// Published oracles/artifacts are listed with their sha256 in per-lane manifests
+// (written by tools/sync_starlight_site.py). Fetching them under a content-versioned
+// URL lets the browser reuse its cached copy until the file actually changes.
+const manifestCache = new Map();
+
+function loadManifest(url) {
+  if (!manifestCache.has(url)) {
+    const p = fetch(resolveUrl(url), { cache: 'no-cache' })
+      .then((res) => (res.ok ? res.json() : null))
+      .catch(() => null);
+    manifestCache.set(url, p);
+  }
+  return manifestCache.get(url);
+}
+
+function sitePath(url) {
+  let p = new URL(resolveUrl(url), window.location.href).pathname;
+  const prefix = detectSitePrefix();
+  if (prefix && p.startsWith(`${prefix}/`)) p = p.slice(prefix.length);
+  return p;
+}
+
+export async function publishedVersion(url) {
+  const p = sitePath(url);
+  let manifestUrl = null;
+  const artifact = p.match(/^\/occt\/artifacts\/([^/]+)\//);
+  if (artifact) {
+    manifestUrl = `/occt/oracles/${artifact[1]}.manifest.json`;
+  } else if (p.startsWith('/occt/oracles/')) {
+    const index = await loadManifest('/occt/oracles/index.json');
+    const lane = Object.values(index || {}).find((l) => Array.isArray(l?.oracles) && l.oracles.includes(p));
+    manifestUrl = lane?.manifest ?? null;
+  }
+  if (!manifestUrl) return null;
+  const manifest = await loadManifest(manifestUrl);
+  return manifest?.files?.[p]?.sha256 ?? null;
+}
+
+export async function fetchPublished(url) {
+  const resolved = resolveUrl(url);
+  let version = null;
+  try {
+    version = await publishedVersion(url);
+  } catch {}
+  if (!version) return await fetch(resolved);
+  const sep = resolved.includes('?') ? '&' : '?';
+  return await fetch(`${resolved}${sep}v=${version.slice(0, 12)}`, { cache: 'force-cache' });
+}
+
 export async function fetchJson(url) {
-  const res = await fetch(resolveUrl(url));
+  const res = await fetchPublished(url);
   if (!res.ok) throw new Error(`HTTP ${res.status}`);
   return await res.json();
 }
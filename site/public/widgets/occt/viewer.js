@@ -2,6 +2,7 @@
 import * as THREE from 'three';
 import { OrbitControls } from 'three/examples/jsm/controls/OrbitControls.js';
 import { RoomEnvironment } from 'three/examples/jsm/environments/RoomEnvironment.js';
+import { fetchPublished, resolveUrl } from './url.js';
 
 function detectTheme() {
   try {
@@ -15,6 +16,38 @@ function detectTheme() {
   }
 }
 
+const MESH_V2 = 'occt-research-mesh-v2';
+const TYPED = { float32: Float32Array, uint16: Uint16Array, uint32: Uint32Array };
+
+function meshView(buffer, spec, what) {
+  const Typed = TYPED[spec?.type];
+  if (!Typed) throw new Error(`${what}: unsupported type ${spec?.type}`);
+  const offset = Number(spec.byteOffset || 0);
+  const count = Number(spec.count || 0);
+  if (offset % 4 || offset + count * Typed.BYTES_PER_ELEMENT > buffer.byteLength) {
+    throw new Error(`${what}: view outside buffer`);
+  }
+  return new Typed(buffer, offset, count);
+}
+
+// mesh-v2 (tools/occt_mesh.py): JSON header + little-endian buffer, viewed in place as typed arrays.
+async function loadMeshV2(header, headerUrl) {
+  const base = new URL(resolveUrl(headerUrl), window.location.href);
+  const res = await fetchPublished(new URL(String(header?.buffer?.uri || ''), base).href);
+  if (!res.ok) throw new Error(`HTTP ${res.status} (mesh buffer)`);
+  const buffer = await res.arrayBuffer();
+  return {
+    ...header,
+    positions: meshView(buffer, header.positions, 'positions'),
+    indices: meshView(buffer, header.indices, 'indices'),
+    faces: header.faces ? meshView(buffer, header.faces, 'faces') : null,
+  };
+}
+
+function isArrayLike(a) {
+  return Array.isArray(a) || ArrayBuffer.isView(a);
+}
+
 export function createThreeViewer(container, setStatus) {
   const theme = detectTheme();
   const scene = new THREE.Scene();
@@ -55,6 +88,7 @@ export function createThreeViewer(container, setStatus) {
   let current = null;
   let currentEdges = null;
   let currentMeshUrl = null;
+  let currentLods = [];
   let meshLoadId = 0;
   let lastLoadOk = true;
   let retryTimer = null;
@@ -197,18 +231,19 @@ export function createThreeViewer(container, setStatus) {
   }
   requestAnimationFrame(animate);
 
-  async function setMeshFromData(data) {
-    currentMeshUrl = null;
+  function showMesh(data, { fit = true } = {}) {
     const positions = data?.positions;
     const indices = data?.indices;
-    if (!Array.isArray(positions) || !Array.isArray(indices) || positions.length < 9 || indices.length < 3) {
+    if (!isArrayLike(positions) || !isArrayLike(indices) || positions.length < 9 || indices.length < 3) {
       setStatus('No mesh: invalid format');
-      return;
+      return false;
     }
 
     const geom = new THREE.BufferGeometry();
-    geom.setAttribute('position', new THREE.BufferAttribute(new Float32Array(positions), 3));
-    geom.setIndex(new THREE.BufferAttribute(new Uint32Array(indices), 1));
+    const pos = positions instanceof Float32Array ? positions : new Float32Array(positions);
+    const ind = indices instanceof Uint16Array || indices instanceof Uint32Array ? indices : new Uint32Array(indices);
+    geom.setAttribute('position', new THREE.BufferAttribute(pos, 3));
+    geom.setIndex(new THREE.BufferAttribute(ind, 1));
     geom.computeVertexNormals();
 
     if (current) {
@@ -219,13 +254,29 @@ export function createThreeViewer(container, setStatus) {
     current = new THREE.Mesh(geom, material);
     current.visible = wantBaseVisible;
     scene.add(current);
-    fitToObject(current);
+    if (fit) fitToObject(current);
     setWireframe(wantWireframe);
     setEdges(wantEdges);
     setStatus('');
+    return true;
+  }
+
+  async function setMeshFromData(data) {
+    currentMeshUrl = null;
+    showMesh(data);
+  }
+
+  async function fetchMesh(url) {
+    const res = await fetchPublished(url);
+    if (!res.ok) throw new Error(`HTTP ${res.status}`);
+    const data = await res.json();
+    return data?.format === MESH_V2 ? await loadMeshV2(data, url) : data;
   }
 
-  async function setMeshFromUrl(meshJsonUrl) {
+  // `lods`: coarser versions of the same mesh, coarse → fine. They are fetched alongside
+  // the full mesh and shown as they arrive (best-effort) until the full mesh replaces them;
+  // only the first mesh shown moves the camera.
+  async function setMeshFromUrl(meshJsonUrl, { lods = [] } = {}) {
     const url = String(meshJsonUrl || '');
     if (url && url === currentMeshUrl && current && lastLoadOk) {
       // Avoid flicker and unnecessary network work on UI toggles.
@@ -242,15 +293,31 @@ export function createThreeViewer(container, setStatus) {
     }
 
     currentMeshUrl = url;
+    currentLods = Array.isArray(lods) ? lods.map(String) : [];
     const loadId = ++meshLoadId;
     setStatus('Loading mesh…');
+    let shownLevel = -1;
+    let done = false;
+    currentLods.forEach((lodUrl, level) => {
+      fetchMesh(lodUrl)
+        .then((lod) => {
+          if (done || loadId !== meshLoadId || level <= shownLevel) return;
+          if (showMesh(lod, { fit: shownLevel < 0 })) {
+            shownLevel = level;
+            setStatus('Refining mesh…');
+          }
+        })
+        .catch(() => {});
+    });
+
     let data;
     try {
-      const res = await fetch(url);
+      const res = await fetchPublished(url);
       if (!res.ok) {
         // Permanent missing mesh: don't retry and don't keep a stale previous mesh.
         if (res.status === 404 || res.status === 410) {
           if (loadId !== meshLoadId) return;
+          done = true;
           lastLoadOk = false;
           clearMesh();
           setStatus(`Mesh not found (HTTP ${res.status}). Try switching Input/Result.`);
@@ -259,6 +326,7 @@ export function createThreeViewer(container, setStatus) {
         throw new Error(`HTTP ${res.status}`);
       }
       data = await res.json();
+      if (data?.format === MESH_V2) data = await loadMeshV2(data, url);
     } catch (e) {
       if (loadId !== meshLoadId) return;
       lastLoadOk = false;
@@ -267,14 +335,17 @@ export function createThreeViewer(container, setStatus) {
       retryTimer = setTimeout(() => {
         retryTimer = null;
         retryDelayMs = Math.min(5000, Math.floor(retryDelayMs * 1.6));
-        void setMeshFromUrl(currentMeshUrl);
+        void setMeshFromUrl(currentMeshUrl, { lods: currentLods });
       }, retryDelayMs);
       return;
     }
     if (loadId !== meshLoadId) return;
+    done = true;
     lastLoadOk = true;
     retryDelayMs = 600;
-    await setMeshFromData(data);
+    // As with setMeshFromData: the next call for this URL re-fetches (picks up republished meshes).
+    currentMeshUrl = null;
+    showMesh(data, { fit: shownLevel < 0 });
   }
 
   function setWireframeSticky(on) {
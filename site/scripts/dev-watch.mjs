@@ -1,4 +1,3 @@
-import chokidar from 'chokidar';
 import { spawn } from 'node:child_process';
 import path from 'node:path';
 import process from 'node:process';
@@ -8,17 +7,6 @@ const __dirname = path.dirname(fileURLToPath(import.meta.url));
 const siteRoot = path.resolve(__dirname, '..');
 const repoRoot = path.resolve(siteRoot, '..');
 
-function spawnChecked(command, args, options) {
-	return new Promise((resolve, reject) => {
-		const child = spawn(command, args, { stdio: 'inherit', ...options });
-		child.on('error', reject);
-		child.on('exit', (code) => {
-			if (code === 0) resolve();
-			else reject(new Error(`${command} ${args.join(' ')} exited with code ${code}`));
-		});
-	});
-}
-
 let astro = null;
 let restartingAstro = false;
 function startAstro() {
@@ -46,76 +34,57 @@ async function stopAstro() {
 	});
 }
 
-let syncing = false;
-let syncQueued = false;
-let syncTimer = null;
+// The Python side keeps the doc list, OCCT tag and transform state in memory and
+// re-syncs only the files that changed (inotify, with a polling fallback).
+console.log('[watch] initial sync...');
+const sync = spawn(
+	path.join(repoRoot, 'tools', 'py.sh'),
+	[
+		path.join(repoRoot, 'tools', 'sync_starlight_site.py'),
+		'--root', repoRoot,
+		'--site', 'site',
+		'--dest-subdir', 'occt',
+		'--watch',
+	],
+	{ cwd: siteRoot, stdio: ['ignore', 'pipe', 'inherit'] },
+);
+sync.on('error', (err) => {
+	console.error(`[watch] sync daemon failed: ${err.message}`);
+	shutdown(1);
+});
+sync.on('exit', (code) => shutdown(code ?? 1));
 
-async function syncOnce() {
-	if (syncing) {
-		syncQueued = true;
-		return;
-	}
-	syncing = true;
+let restarting = false;
+async function restartAstro() {
+	// Avoid transient "slug does not exist" errors from Starlight when docs are
+	// added or removed while the dev server is running.
+	if (restarting) return;
+	restarting = true;
 	try {
-		// Avoid transient "slug does not exist" errors from Starlight when docs are
-		// being regenerated while the dev server is running.
-		if (astro) {
-			console.log('[watch] syncing docs; restarting astro...');
-			await stopAstro();
-		} else {
-			console.log('[watch] syncing docs...');
-		}
-		await spawnChecked('npm', ['run', 'sync'], { cwd: siteRoot });
-		if (!astro) startAstro();
+		console.log('[watch] docs added/removed; restarting astro...');
+		await stopAstro();
+		startAstro();
 	} finally {
-		syncing = false;
-		if (syncQueued) {
-			syncQueued = false;
-			queueSync();
-		}
+		restarting = false;
 	}
 }
 
-function queueSync() {
-	if (syncTimer) clearTimeout(syncTimer);
-	syncTimer = setTimeout(() => {
-		syncTimer = null;
-		void syncOnce();
-	}, 200);
-}
-
-const watchTargets = [
-	path.join(repoRoot, 'notes'),
-	path.join(repoRoot, 'repros'),
-	path.join(repoRoot, 'backlog', 'docs'),
-];
-
-const ignored = [
-	'**/.git/**',
-	'**/.cache/**',
-	'**/.local/**',
-	'**/.venv/**',
-	'**/build-occt/**',
-	'**/occt/**',
-];
-
-console.log('[watch] initial sync...');
-await syncOnce();
-
-const watcher = chokidar.watch(watchTargets, {
-	ignoreInitial: true,
-	ignored,
-	awaitWriteFinish: { stabilityThreshold: 200, pollInterval: 50 },
-});
-
-watcher.on('all', (eventName, changedPath) => {
-	console.log(`[watch] ${eventName}: ${path.relative(repoRoot, changedPath)}`);
-	queueSync();
+let pending = '';
+sync.stdout.setEncoding('utf8');
+sync.stdout.on('data', (chunk) => {
+	pending += chunk;
+	const lines = pending.split('\n');
+	pending = lines.pop();
+	for (const line of lines) {
+		console.log(line);
+		if (line.startsWith('[watch] watching') && !astro) startAstro();
+		else if (line === '[watch] layout changed') void restartAstro();
+	}
 });
 
 function shutdown(code) {
 	try {
-		void watcher.close();
+		sync.kill('SIGINT');
 	} catch {}
 	try {
 		astro?.kill('SIGINT');
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: site-sync markdown transform, line pipeline vs whole-document passes.
+
+transform_reference() below is the transform as it was before the single-pass
+pipeline: one regex/split pass over the whole document per rewrite. It lives only
+here, as the spec transform_markdown() is checked against. Runs both over every
+doc sync_starlight_site.py would publish (notes/, repros READMEs, backlog docs),
+checks the outputs are byte-identical, and reports the best of `--repeat` timings.
+Nothing is written.
+
+    tools/bench_site_transform.py --root .
+"""
+import argparse
+import json
+import time
+from pathlib import Path
+
+import sync_starlight_site as sync
+
+
+def strip_section(md: str, heading: str) -> str:
+    """
+    Remove a markdown section by exact heading line (e.g. "## Backlog tasks"),
+    up to (but not including) the next heading of same or higher level.
+    """
+    lines = md.splitlines(keepends=True)
+    i = 0
+    while i < len(lines):
+        if lines[i].rstrip("\n") != heading:
+            i += 1
+            continue
+
+        level = len(heading.split(" ", 1)[0])  # number of '#'
+        start = i
+        i += 1
+        while i < len(lines):
+            line = lines[i]
+            if line.startswith("#"):
+                hashes = len(line) - len(line.lstrip("#"))
+                if hashes <= level and line[hashes : hashes + 1] == " ":
+                    break
+            i += 1
+
+        del lines[start:i]
+        # trim extra blank lines where the section was removed
+        while start < len(lines) and lines[start].strip() == "":
+            del lines[start]
+        if start > 0 and lines[start - 1].strip() == "":
+            while start < len(lines) and lines[start].strip() == "":
+                del lines[start]
+        i = start
+
+    return "".join(lines)
+
+
+def transform_reference(text: str, *, src_rel: str, dst_rel: str, occt_tag: str) -> str:
+    """The transform as a sequence of whole-document rewrites (the pre-pipeline code)."""
+    text = sync.LINK_RE.sub(sync.internal_link_repl(dst_rel), text)
+    text = sync.OCCT_CODE_REF_RE.sub(sync.occt_code_ref_repl(occt_tag), text)
+
+    # Site-specific cleanup for generated scaffolding.
+    text = sync.GENERATED_BANNER_RE.sub("", text)
+    if src_rel.startswith("maps/hub-"):
+        # Hubs are generated index pages; keep the “meat” and drop redundant artifact pointers.
+        text = strip_section(text, "## Artifacts")
+        text = strip_section(text, "## Backlog")
+
+    if not text.startswith("---\n"):
+        title = None
+        for line in text.splitlines():
+            line = line.strip()
+            if line.startswith("# "):
+                title = line[len("# ") :].strip()
+                break
+        if not title:
+            title = Path(dst_rel).stem.replace("-", " ").strip() or "Document"
+        # YAML frontmatter accepts JSON scalars; JSON encoding avoids quoting pitfalls.
+        text = f"---\ntitle: {json.dumps(title)}\n---\n\n{text}"
+
+    # Starlight will render the frontmatter title as the page heading.
+    # Many repo docs also include an H1 (`# ...`) as the first line, which would
+    # otherwise show the title twice. Strip the first H1 after frontmatter.
+    if text.startswith("---\n"):
+        end = text.find("\n---\n", 4)
+        if end != -1:
+            frontmatter = text[: end + len("\n---\n")]
+            body = text[end + len("\n---\n") :]
+            body_lines = body.splitlines(keepends=True)
+            for i, line in enumerate(body_lines):
+                if line.startswith("# "):
+                    del body_lines[i]
+                    if i < len(body_lines) and body_lines[i].strip() == "":
+                        del body_lines[i]
+                    body = "".join(body_lines)
+                    text = frontmatter + body
+                    break
+
+    # Site-specific pruning: keep backlog tracking out of the rendered docs.
+    text = strip_section(text, "## Backlog tasks")
+    return text
+
+
+def best_of(fn, docs, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for doc, text in docs:
+            fn(text, src_rel=doc.src_rel, dst_rel=doc.dst_rel, occt_tag="V7_9_3")
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--root", default=".", help="repo root (default: .)")
+    ap.add_argument("--repeat", type=int, default=20)
+    args = ap.parse_args()
+
+    repo_root = Path(args.root).resolve()
+    docs = [
+        (doc, doc.src.read_text(encoding="utf-8", errors="replace"))
+        for doc in sync.collect_docs(repo_root, Path("/nonexistent"))
+    ]
+    n_bytes = sum(len(text) for _, text in docs)
+
+    mismatched = [
+        doc.src_rel
+        for doc, text in docs
+        if sync.transform_markdown(text, src_rel=doc.src_rel, dst_rel=doc.dst_rel, occt_tag="V7_9_3")
+        != transform_reference(text, src_rel=doc.src_rel, dst_rel=doc.dst_rel, occt_tag="V7_9_3")
+    ]
+    if mismatched:
+        raise SystemExit(f"output differs for: {', '.join(mismatched)}")
+
+    ref = best_of(transform_reference, docs, args.repeat)
+    new = best_of(sync.transform_markdown, docs, args.repeat)
+    print(f"[bench] {len(docs)} docs, {n_bytes / 1024:.0f} KiB, outputs identical")
+    print(f"[bench] reference: {ref * 1000:8.2f} ms  ({ref / len(docs) * 1e6:7.1f} us/doc)")
+    print(f"[bench] pipeline:  {new * 1000:8.2f} ms  ({new / len(docs) * 1e6:7.1f} us/doc)  x{ref / new:.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
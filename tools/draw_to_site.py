@@ -2,14 +2,25 @@
 from __future__ import annotations
 
 import argparse
+import hashlib
 import json
 import os
+import queue
 import shutil
 import subprocess
 import sys
+import tempfile
+import threading
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
 from dataclasses import dataclass
 from pathlib import Path
+from typing import Callable
+
+from fs_watch import DirWatcher
+from occt_mesh import bin_path_for
+from sync_starlight_site import mirror_file, write_text_atomic
 
 
 def _die(msg: str, code: int = 2) -> "None":
@@ -48,12 +59,10 @@ def _load_json(path: Path) -> dict:
     return json.loads(path.read_text(encoding="utf-8"))
 
 
-def _write_json(path: Path, data: object) -> None:
-    path.write_text(json.dumps(data, indent=2, sort_keys=False) + "\n", encoding="utf-8")
-
-
 def _build_mesh_exporter(root: Path, bin_path: Path) -> None:
-    if bin_path.exists():
+    src = root / "tools" / "mesh_brep_to_json.cpp"
+    # Rebuild when the exporter source changed (e.g. new output formats).
+    if bin_path.exists() and (not src.exists() or bin_path.stat().st_mtime >= src.stat().st_mtime):
         return
 
     if not _have_occt_env():
@@ -66,7 +75,6 @@ def _build_mesh_exporter(root: Path, bin_path: Path) -> None:
     include = os.environ["CSF_OCCTIncludePath"]
     lib = os.environ["CSF_OCCTLibPath"]
 
-    src = root / "tools" / "mesh_brep_to_json.cpp"
     if not src.exists():
         _die(f"missing source: {src}")
 
@@ -102,6 +110,19 @@ class Step:
     mesh: str
 
 
+@dataclass(frozen=True)
+class SessionJob:
+    session: str
+    tcl: Path
+    capture_dir: Path
+
+
+class PublishError(Exception):
+    def __init__(self, msg: str, code: int = 2):
+        super().__init__(msg)
+        self.code = code
+
+
 def _collect_steps(out_dir: Path) -> list[Step]:
     steps: list[Step] = []
     for brep_path in sorted(out_dir.glob("*.brep")):
@@ -116,30 +137,582 @@ def _collect_steps(out_dir: Path) -> list[Step]:
     return steps
 
 
+def _parse_lod_factors(spec: str) -> list[float]:
+    factors = sorted({float(x) for x in spec.split(",") if x.strip()}, reverse=True)
+    if any(f <= 1 for f in factors):
+        _die(f"--lod-factors must all be > 1 (got {spec!r})")
+    return factors
+
+
+def _lod_levels(step: Step, deflection: float, factors: list[float]) -> list[dict]:
+    """Coarse → fine; the last level is the step's full-resolution mesh."""
+    levels = [
+        {"deflection": deflection * f, "mesh": f"{step.id}.lod{i}.mesh.json"} for i, f in enumerate(factors)
+    ]
+    levels.append({"deflection": deflection, "mesh": step.mesh})
+    return levels
+
+
+class ExporterPool:
+    """
+    Persistent `mesh_brep_to_json --batch -` processes, each owned by a worker
+    thread, started on demand (at most `workers`) and kept until close(). OCCT thus
+    loads once per worker rather than once per step or per batch. run() is
+    thread-safe: concurrent sessions (see --sessions-from) share the workers.
+    A job that errors or runs past `timeout` seconds (0: no limit) fails, and its
+    process is killed; the worker starts a fresh one for the next job.
+    """
+
+    def __init__(self, mesh_bin: Path, mesh_format: str, workers: int, *, timeout: float = 0):
+        self.cmd = [str(mesh_bin), "--format", mesh_format, "--batch", "-"]
+        self.workers = max(1, workers)
+        self.timeout = timeout
+        self.jobs: "queue.SimpleQueue[tuple[str, Future] | None]" = queue.SimpleQueue()
+        self.threads: list[threading.Thread] = []
+        self.lock = threading.Lock()
+
+    def _spawn(self) -> subprocess.Popen:
+        # errors="replace": stray non-UTF-8 messenger output must not break the reply reader.
+        return subprocess.Popen(self.cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True, errors="replace")
+
+    @staticmethod
+    def _reply(proc: subprocess.Popen, job_input: str) -> bool:
+        """
+        Read the exporter's `ok|fail<TAB><input>` answer for `job_input`. Other stdout
+        lines (e.g. OCCT's default messenger) are skipped. An answer for a different input
+        means the stream is out of step: the process is killed so the next job respawns it.
+        """
+        while True:
+            line = proc.stdout.readline()
+            if not line:
+                return False
+            status, sep, echoed = line.rstrip("\r\n").partition("\t")
+            if not sep or status not in ("ok", "fail"):
+                continue
+            if echoed != job_input:
+                print(f"[mesh] exporter answered for {echoed!r} while meshing {job_input!r}; restarting it", file=sys.stderr)
+                proc.kill()
+                proc.wait()
+                return False
+            return status == "ok"
+
+    def _worker(self) -> None:
+        proc = None
+        try:
+            while True:
+                item = self.jobs.get()
+                if item is None:
+                    return
+                job, done = item
+                job_input = job.split("\t", 1)[0]
+                timer = None
+                expired = threading.Event()
+                try:
+                    if proc is None or proc.poll() is not None:  # first job, or died on the last one
+                        proc = self._spawn()
+                    if self.timeout:
+                        # Killing a hung exporter closes its stdout, which ends _reply().
+                        timer = threading.Timer(self.timeout, lambda p=proc: (expired.set(), p.kill()))
+                        timer.start()
+                    proc.stdin.write(job + "\n")
+                    proc.stdin.flush()
+                    ok = self._reply(proc, job_input)
+                    if expired.is_set():
+                        print(f"[mesh] exporter timed out after {self.timeout:g}s on {job_input}", file=sys.stderr)
+                        ok = False
+                except Exception as e:  # noqa: BLE001
+                    # Includes a failed spawn (missing/unexecutable binary).
+                    print(f"[mesh] exporter error on {job_input}: {e}", file=sys.stderr)
+                    ok = False
+                    expired.set()
+                finally:
+                    if timer is not None:
+                        timer.cancel()
+                if expired.is_set() and proc is not None:
+                    proc.kill()
+                    proc.wait()
+                    proc = None
+                done.set_result(ok)
+        finally:
+            if proc is not None:
+                try:
+                    proc.stdin.close()
+                except OSError:
+                    pass
+                proc.wait()
+
+    def run(self, jobs: list[str]) -> list[str]:
+        """Run job lines (see mesh_brep_to_json --batch); returns the inputs that failed."""
+        if not jobs:
+            return []
+        with self.lock:
+            while len(self.threads) < min(self.workers, len(jobs)):
+                t = threading.Thread(target=self._worker, daemon=True)
+                t.start()
+                self.threads.append(t)
+        pending = []
+        for job in jobs:
+            done: Future = Future()
+            self.jobs.put((job, done))
+            pending.append((job, done))
+        return [job.split("\t", 1)[0] for job, done in pending if not done.result()]
+
+    def close(self) -> None:
+        with self.lock:
+            for _ in self.threads:
+                self.jobs.put(None)
+            for t in self.threads:
+                t.join()
+            self.threads = []
+
+    def __enter__(self) -> "ExporterPool":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def _sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+class MeshCache:
+    """
+    Content-addressed exporter outputs under `.cache/draw/meshes/`, keyed on
+    (BREP bytes sha256, deflection, mesh format, exporter binary sha256).
+
+    The exporter writes new entries into a staging dir (one per publish, see
+    new_staging()); `commit()` moves them in (buffer first, header last, each an
+    atomic rename), so an entry whose header exists is complete. `link()` publishes
+    an entry under a session file name: v1 meshes and v2 buffers are reflinked or
+    copied, never hardlinked, so tools that rewrite published files in place cannot
+    corrupt the cache; v2 headers are rewritten so `buffer.uri` names the published
+    buffer.
+    """
+
+    def __init__(self, root: Path, exporter: Path, mesh_format: str, *, tmp_root: Path):
+        self.root = root
+        self.format = mesh_format
+        self.build = _sha256(exporter)
+        self.tmp_root = tmp_root
+
+    def key(self, brep_sha: str, deflection: float) -> str:
+        payload = json.dumps([brep_sha, repr(deflection), self.format, self.build])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def header(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.mesh.json"
+
+    def has(self, key: str) -> bool:
+        return self.header(key).is_file()
+
+    def new_staging(self) -> Path:
+        (self.root / ".staging").mkdir(parents=True, exist_ok=True)
+        return Path(tempfile.mkdtemp(dir=self.root / ".staging", prefix=f"{os.getpid()}-"))
+
+    def staged(self, staging: Path, key: str) -> Path:
+        return staging / f"{key}.mesh.json"
+
+    def commit(self, staging: Path, key: str) -> bool:
+        src = self.staged(staging, key)
+        if not src.is_file():
+            return False
+        dst = self.header(key)
+        dst.parent.mkdir(parents=True, exist_ok=True)
+        if self.format == "v2":
+            os.replace(bin_path_for(src), bin_path_for(dst))
+        os.replace(src, dst)
+        return True
+
+    def link(self, key: str, dst: Path) -> None:
+        src = self.header(key)
+        if self.format != "v2":
+            mirror_file(src, dst, tmp_root=self.tmp_root, mode="reflink")
+            return
+        mirror_file(bin_path_for(src), bin_path_for(dst), tmp_root=self.tmp_root, mode="reflink")
+        header = json.loads(src.read_text(encoding="utf-8"))
+        header["buffer"]["uri"] = bin_path_for(dst).name
+        write_text_atomic(dst, json.dumps(header, indent=2) + "\n", tmp_root=self.tmp_root)
+
+
+class SessionPublisher:
+    """
+    Publish captured steps of one session into `site/public/occt/draw/<session>/`:
+    mirror the `.brep`, mesh every LOD level missing from the mesh cache (over the
+    exporter pool), link the meshes in, and (re)write the session `index.json`.
+    publish() can be called repeatedly as steps appear (see --stream).
+    """
+
+    def __init__(
+        self,
+        *,
+        session: str,
+        session_dir: Path,
+        capture_dir: Path,
+        tcl_path: Path,
+        deflection: float,
+        lod_factors: list[float],
+        mesh_format: str,
+        cache: MeshCache,
+        pool: ExporterPool,
+        tmp_root: Path,
+    ):
+        self.session = session
+        self.session_dir = session_dir
+        self.capture_dir = capture_dir
+        self.tcl_path = tcl_path
+        self.deflection = deflection
+        self.lod_factors = lod_factors
+        self.mesh_format = mesh_format
+        self.cache = cache
+        self.pool = pool
+        self.tmp_root = tmp_root
+        self.created_at = int(time.time())
+        self.steps: dict[str, Step] = {}
+        self.lods: dict[str, list[dict]] = {}
+
+    def publish(self, steps: list[Step]) -> list[str]:
+        """Publish `steps`; returns the BREPs whose meshing failed (those steps are not listed)."""
+        cache = self.cache
+        # Raw captures are useful for download / re-meshing; unchanged files are left alone.
+        for step in steps:
+            mirror_file(self.capture_dir / step.brep, self.session_dir / step.brep, tmp_root=self.tmp_root)
+
+        # Only levels missing from the cache are meshed. One job per step writes all of its
+        # missing LOD levels (the BREP is read once).
+        step_lods = {step.id: _lod_levels(step, self.deflection, self.lod_factors) for step in steps}
+        step_keys: dict[str, list[str]] = {}
+        staging = cache.new_staging()
+        jobs: list[str] = []
+        job_keys: dict[str, list[str]] = {}  # input BREP -> cache keys its job writes
+        queued: set[str] = set()
+        n_cached = 0
+        for step in steps:
+            brep_sha = _sha256(self.capture_dir / step.brep)
+            keys = [cache.key(brep_sha, level["deflection"]) for level in step_lods[step.id]]
+            step_keys[step.id] = keys
+            n_cached += sum(1 for key in keys if cache.has(key))
+            todo = [
+                (level, key)
+                for level, key in zip(step_lods[step.id], keys)
+                if not cache.has(key) and key not in queued
+            ]
+            if todo:
+                queued.update(key for _, key in todo)
+                job_keys[str(self.capture_dir / step.brep)] = [key for _, key in todo]
+                fields = [str(self.capture_dir / step.brep)]
+                for level, key in todo:
+                    fields += [repr(level["deflection"]), str(cache.staged(staging, key))]
+                jobs.append("\t".join(fields))
+
+        try:
+            failed_jobs = set(self.pool.run(jobs))
+            # A failed job may have left partial outputs; only successful jobs enter the cache.
+            for brep, keys in job_keys.items():
+                if brep not in failed_jobs:
+                    for key in keys:
+                        cache.commit(staging, key)
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+
+        # A step fails when any of its levels is missing from the cache, including levels
+        # queued by another step with the same BREP bytes whose job failed.
+        failed: list[str] = []
+        for step in steps:
+            if not all(cache.has(key) for key in step_keys[step.id]):
+                failed.append(str(self.capture_dir / step.brep))
+                continue
+            for level, key in zip(step_lods[step.id], step_keys[step.id]):
+                cache.link(key, self.session_dir / level["mesh"])
+            self.steps[step.id] = step
+            self.lods[step.id] = step_lods[step.id]
+        print(f"[mesh] {self.session}: {n_cached} cached, {len(queued)} meshed ({len(jobs)} jobs)")
+        return failed
+
+    def publish_log(self, log_path: Path) -> None:
+        if log_path.exists():
+            mirror_file(log_path, self.session_dir / "draw.log.txt", tmp_root=self.tmp_root)
+
+    def write_index(self, status: str = "complete") -> Path:
+        """`status`: "running" while a --stream capture is in progress, else "complete" or "failed"."""
+        steps = [self.steps[k] for k in sorted(self.steps)]
+        session_index = {
+            "session": self.session,
+            "created_at": self.created_at,
+            "updated_at": int(time.time()),
+            "status": status,
+            "script": str(self.tcl_path),
+            "deflection": self.deflection,
+            "mesh_format": self.mesh_format,
+            "lod_factors": self.lod_factors,
+            "steps": [{"id": s.id, "brep": s.brep, "mesh": s.mesh, "lods": self.lods[s.id]} for s in steps],
+            "log": "draw.log.txt" if (self.session_dir / "draw.log.txt").exists() else None,
+        }
+        path = self.session_dir / "index.json"
+        write_text_atomic(path, json.dumps(session_index, indent=2) + "\n", tmp_root=self.tmp_root)
+        return path
+
+
+@contextmanager
+def _locked(lock_path: Path):
+    """Exclusive advisory lock (fcntl.flock) on `lock_path`; a no-op where fcntl is unavailable."""
+    try:
+        import fcntl
+    except ImportError:
+        fcntl = None
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(lock_path, "a+") as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def _register_sessions(draw_root: Path, sessions: list[str], *, lock_path: Path, tmp_root: Path) -> Path:
+    """
+    Upsert `sessions` into the draw registry (`<draw_root>/index.json`), newest first.
+    The read-modify-write holds `lock_path` and replaces the file atomically, so
+    concurrent draw_to_site runs don't drop each other's entries.
+    """
+    registry_path = draw_root / "index.json"
+    with _locked(lock_path):
+        registry = _load_json(registry_path) or {}
+        entries = registry.get("sessions")
+        if not isinstance(entries, list):
+            entries = []
+
+        now = int(time.time())
+        entries = [s for s in entries if isinstance(s, dict) and s.get("session") not in sessions]
+        entries.extend({"session": session, "updated_at": now} for session in sessions)
+        entries = sorted(entries, key=lambda x: int(x.get("updated_at", 0)), reverse=True)
+        registry["sessions"] = entries
+        write_text_atomic(registry_path, json.dumps(registry, indent=2) + "\n", tmp_root=tmp_root)
+    return registry_path
+
+
+def _stream_capture(
+    cmd: list[str], env: dict, capture_dir: Path, log_path: Path, publisher: SessionPublisher, *, poll: bool
+) -> int:
+    """
+    Run DRAWEXE and publish each `.brep` snapshot as it is written. Snapshots left
+    over from earlier runs are ignored unless rewritten. A snapshot caught mid-write
+    fails to mesh and is retried once it changes again. Returns DRAWEXE's exit code.
+    """
+
+    def signature(p: Path) -> tuple[int, int] | None:
+        try:
+            st = p.stat()
+        except OSError:
+            return None
+        return st.st_size, st.st_mtime_ns
+
+    seen = {step.id: signature(capture_dir / step.brep) for step in _collect_steps(capture_dir)}
+    failed: set[str] = set()
+    with open(log_path, "w", encoding="utf-8") as log, DirWatcher([capture_dir], poll=poll) as watcher:
+        proc = subprocess.Popen(cmd, stdout=log, stderr=subprocess.STDOUT, env=env, text=True)
+        try:
+            print(f"[stream] DRAWEXE pid {proc.pid}; watching {capture_dir} ({watcher.kind})")
+            while True:
+                done = proc.poll() is not None
+                fresh = []
+                for step in _collect_steps(capture_dir):
+                    sig = signature(capture_dir / step.brep)
+                    if sig is not None and seen.get(step.id) != sig:
+                        seen[step.id] = sig
+                        fresh.append(step)
+                if fresh:
+                    bad = set(publisher.publish(fresh))
+                    failed = (failed - {str(capture_dir / s.brep) for s in fresh}) | bad
+                    print(f"[stream] {publisher.session}: {len(publisher.steps)} steps published")
+                publisher.publish_log(log_path)
+                if done:
+                    break
+                publisher.write_index("running")
+                watcher.wait(timeout=1.0)
+        finally:
+            # Don't leave DRAWEXE running when publishing fails or is interrupted.
+            if proc.poll() is None:
+                proc.kill()
+            proc.wait()
+    if failed:
+        raise PublishError("meshing failed for:\n  " + "\n  ".join(sorted(failed)), code=1)
+    return proc.returncode
+
+
+def _read_sessions_list(path: Path, root: Path) -> list[SessionJob]:
+    """`<script.tcl> [session]` per line (`#` comments); paths are relative to the list file."""
+    jobs: list[SessionJob] = []
+    for n, line in enumerate(path.read_text(encoding="utf-8").splitlines(), 1):
+        fields = line.split("#", 1)[0].split()
+        if not fields:
+            continue
+        if len(fields) > 2:
+            _die(f"{path}:{n}: expected '<script.tcl> [session]'")
+        tcl = (path.parent / fields[0]).resolve()
+        session = fields[1] if len(fields) == 2 else tcl.stem
+        jobs.append(SessionJob(session, tcl, (root / ".cache" / "draw" / session).resolve()))
+    seen: set[str] = set()
+    for job in jobs:
+        if job.session in seen:
+            _die(f"{path}: session {job.session!r} listed twice")
+        seen.add(job.session)
+    return jobs
+
+
+def _run_session(
+    job: SessionJob,
+    args: argparse.Namespace,
+    *,
+    drawexe: str | None,
+    draw_root: Path,
+    cache: MeshCache,
+    pool: ExporterPool,
+    tmp_root: Path,
+    lod_factors: list[float],
+    register_early: Callable[[], object],
+) -> SessionPublisher:
+    """Run (optionally) and publish one session; raises PublishError. Only --stream touches the registry."""
+    _ensure_dir(job.capture_dir)
+    log_path = job.capture_dir / "draw.log.txt"
+
+    # Publish into site/public so Astro can serve without sync/restart.
+    session_dir = draw_root / job.session
+    _ensure_dir(session_dir)
+
+    publisher = SessionPublisher(
+        session=job.session,
+        session_dir=session_dir,
+        capture_dir=job.capture_dir,
+        tcl_path=job.tcl,
+        deflection=args.deflection,
+        lod_factors=lod_factors,
+        mesh_format=args.mesh_format,
+        cache=cache,
+        pool=pool,
+        tmp_root=tmp_root,
+    )
+
+    if drawexe:
+        env = os.environ.copy()
+        env["OCCT_RESEARCH_OUT"] = str(job.capture_dir)
+        env["OCCT_RESEARCH_SESSION"] = str(job.session)
+
+        # Note: DRAW uses Tcl; a failing command should exit non-zero in batch mode.
+        cmd = [drawexe, "-b", "-f", str(job.tcl)]
+        if args.stream:
+            publisher.write_index("running")
+            register_early()
+            # The session is already listed as "running"; whatever goes wrong (DRAWEXE exit
+            # status, meshing, Ctrl-C), mark it failed so the explorer stops polling it.
+            try:
+                returncode = _stream_capture(cmd, env, job.capture_dir, log_path, publisher, poll=args.poll)
+                if returncode != 0:
+                    raise PublishError(f"DRAWEXE failed (exit={returncode}). See: {log_path}", code=returncode)
+            except BaseException:
+                publisher.write_index("failed")
+                raise
+        else:
+            proc = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, env=env, text=True)
+            log_path.write_text(proc.stdout, encoding="utf-8")
+            if proc.returncode != 0:
+                raise PublishError(f"DRAWEXE failed (exit={proc.returncode}). See: {log_path}", code=proc.returncode)
+
+    if not (drawexe and args.stream):
+        steps = _collect_steps(job.capture_dir)
+        if not steps:
+            raise PublishError(
+                f"No *.brep files found in capture dir: {job.capture_dir}\n"
+                "In your .tcl script, write snapshots like:\n"
+                "  set out $env(OCCT_RESEARCH_OUT)\n"
+                "  writebrep myShape $out/010_after_step.brep\n"
+            )
+        publisher.publish_log(log_path)
+        failed = publisher.publish(steps)
+        if failed:
+            raise PublishError("meshing failed for:\n  " + "\n  ".join(failed), code=1)
+
+    publisher.write_index("complete")
+    return publisher
+
+
 def main() -> int:
     ap = argparse.ArgumentParser(description="Run a DRAW .tcl script and publish captured BREP steps to the site as mesh.json.")
-    ap.add_argument("--tcl", required=True, help="Path to DRAW .tcl script")
-    ap.add_argument("--session", required=True, help="Session id (folder name under site/public/occt/draw/)")
+    ap.add_argument("--tcl", help="Path to DRAW .tcl script")
+    ap.add_argument("--session", help="Session id (folder name under site/public/occt/draw/)")
+    ap.add_argument(
+        "--sessions-from",
+        default="",
+        help="publish many sessions concurrently: file with '<script.tcl> [session]' per line "
+        "(paths relative to the file; session defaults to the script name); the registry is updated once",
+    )
     ap.add_argument("--deflection", type=float, default=0.05, help="Meshing deflection (default: 0.05)")
+    ap.add_argument(
+        "--lod-factors",
+        default="16,4",
+        help="coarser preview levels, as multiples of --deflection (default: 16,4; empty disables)",
+    )
+    ap.add_argument(
+        "--mesh-format",
+        choices=("v1", "v2"),
+        default="v2",
+        help="v2: JSON header + binary .mesh.bin (default); v1: all-JSON mesh",
+    )
+    ap.add_argument(
+        "--jobs",
+        type=int,
+        default=0,
+        help="parallel exporter processes, and sessions with --sessions-from (default: CPU count)",
+    )
+    ap.add_argument(
+        "--mesh-timeout",
+        type=float,
+        default=600,
+        help="seconds one step may take to mesh before its exporter is killed (default: 600; 0 disables)",
+    )
     ap.add_argument("--site-public", default="site/public", help="Site public dir (default: site/public)")
     ap.add_argument("--run", action="store_true", help="Actually run DRAWEXE (otherwise just convert existing BREP in out dir)")
+    ap.add_argument(
+        "--stream",
+        action="store_true",
+        help="with --run: publish each .brep snapshot while DRAWEXE is still running",
+    )
+    ap.add_argument("--poll", action="store_true", help="with --stream: poll the capture dir instead of inotify")
     ap.add_argument("--out", default="", help="Override capture output dir (default: .cache/draw/<session>)")
     args = ap.parse_args()
 
-    root = _repo_root()
-    tcl_path = (Path(args.tcl).resolve())
-    if not tcl_path.exists():
-        _die(f"missing script: {tcl_path}")
+    if args.sessions_from:
+        if args.tcl or args.session or args.out or args.stream:
+            ap.error("--sessions-from cannot be combined with --tcl/--session/--out/--stream")
+    elif not (args.tcl and args.session):
+        ap.error("--tcl and --session are required (or use --sessions-from)")
 
+    root = _repo_root()
     site_public = (root / args.site_public).resolve()
     if not site_public.exists():
         _die(f"missing site public dir: {site_public}")
 
-    capture_dir = Path(args.out).resolve() if args.out else (root / ".cache" / "draw" / args.session).resolve()
-    _ensure_dir(capture_dir)
-
-    log_path = capture_dir / "draw.log.txt"
-
+    if args.sessions_from:
+        sessions_list = Path(args.sessions_from).resolve()
+        if not sessions_list.is_file():
+            _die(f"missing sessions list: {sessions_list}")
+        jobs = _read_sessions_list(sessions_list, root)
+        if not jobs:
+            _die(f"no sessions listed in {sessions_list}")
+    else:
+        capture_dir = Path(args.out).resolve() if args.out else (root / ".cache" / "draw" / args.session).resolve()
+        jobs = [SessionJob(args.session, Path(args.tcl).resolve(), capture_dir)]
+    for job in jobs:
+        if not job.tcl.exists():
+            _die(f"missing script: {job.tcl}")
+
+    drawexe = None
     if args.run:
         drawexe = _find_drawexe(root)
         if not drawexe:
@@ -152,76 +725,69 @@ def main() -> int:
                 "  source build-occt/env.sh i\n"
             )
 
-        env = os.environ.copy()
-        env["OCCT_RESEARCH_OUT"] = str(capture_dir)
-        env["OCCT_RESEARCH_SESSION"] = str(args.session)
-
-        # Note: DRAW uses Tcl; a failing command should exit non-zero in batch mode.
-        cmd = [drawexe, "-b", "-f", str(tcl_path)]
-        proc = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, env=env, text=True)
-        log_path.write_text(proc.stdout, encoding="utf-8")
-        if proc.returncode != 0:
-            _die(f"DRAWEXE failed (exit={proc.returncode}). See: {log_path}", code=proc.returncode)
-
-    steps = _collect_steps(capture_dir)
-    if not steps:
-        _die(
-            f"No *.brep files found in capture dir: {capture_dir}\n"
-            "In your .tcl script, write snapshots like:\n"
-            "  set out $env(OCCT_RESEARCH_OUT)\n"
-            "  writebrep myShape $out/010_after_step.brep\n"
-        )
-
-    # Publish into site/public so Astro can serve without sync/restart.
     draw_root = site_public / "occt" / "draw"
-    session_dir = draw_root / args.session
-    _ensure_dir(session_dir)
-
-    # Copy raw captures (useful for download / re-meshing).
-    for step in steps:
-        shutil.copy2(capture_dir / step.brep, session_dir / step.brep)
-    if log_path.exists():
-        shutil.copy2(log_path, session_dir / "draw.log.txt")
-
-    # Convert BREP → mesh.json
+    tmp_root = root / ".cache" / "draw" / ".tmp"
+    lock_path = root / ".cache" / "draw" / "registry.lock"
+    lod_factors = _parse_lod_factors(args.lod_factors)
     mesh_bin = root / ".cache" / "bin" / "mesh_brep_to_json"
     _build_mesh_exporter(root, mesh_bin)
+    cache = MeshCache(root / ".cache" / "draw" / "meshes", mesh_bin, args.mesh_format, tmp_root=tmp_root)
+    workers = args.jobs or os.cpu_count() or 1
+
+    def register(sessions: list[str]) -> Path:
+        return _register_sessions(draw_root, sessions, lock_path=lock_path, tmp_root=tmp_root)
+
+    published: list[SessionPublisher] = []
+    errors: list[tuple[str, Exception]] = []
+    with ExporterPool(mesh_bin, args.mesh_format, workers, timeout=args.mesh_timeout) as pool:
+
+        def run(job: SessionJob) -> SessionPublisher:
+            return _run_session(
+                job,
+                args,
+                drawexe=drawexe,
+                draw_root=draw_root,
+                cache=cache,
+                pool=pool,
+                tmp_root=tmp_root,
+                lod_factors=lod_factors,
+                register_early=lambda: register([job.session]),
+            )
 
-    for step in steps:
-        in_brep = session_dir / step.brep
-        out_mesh = session_dir / step.mesh
-        subprocess.check_call([str(mesh_bin), str(in_brep), str(out_mesh), str(args.deflection)])
-
-    session_index = {
-        "session": args.session,
-        "created_at": int(time.time()),
-        "script": str(tcl_path),
-        "deflection": args.deflection,
-        "steps": [{"id": s.id, "brep": s.brep, "mesh": s.mesh} for s in steps],
-        "log": "draw.log.txt" if (session_dir / "draw.log.txt").exists() else None,
-    }
-    _write_json(session_dir / "index.json", session_index)
-
-    registry_path = draw_root / "index.json"
-    registry = _load_json(registry_path) or {}
-    sessions = registry.get("sessions")
-    if not isinstance(sessions, list):
-        sessions = []
-
-    # Update / upsert entry
-    now = int(time.time())
-    sessions = [s for s in sessions if isinstance(s, dict) and s.get("session") != args.session]
-    sessions.append({"session": args.session, "updated_at": now})
-    sessions = sorted(sessions, key=lambda x: int(x.get("updated_at", 0)), reverse=True)
-    registry["sessions"] = sessions
-    _write_json(registry_path, registry)
-
-    print(f"[ok] published session: {args.session}")
-    print(f"     session index: {session_dir / 'index.json'}")
+        if len(jobs) == 1:
+            # In the main thread, so Ctrl-C reaches a --stream capture (which then marks
+            # the session failed and stops DRAWEXE).
+            try:
+                published.append(run(jobs[0]))
+            except PublishError as e:
+                errors.append((jobs[0].session, e))
+        else:
+            # Sessions run concurrently (DRAWEXE processes in parallel); their meshing
+            # shares the exporter pool.
+            with ThreadPoolExecutor(max(1, min(workers, len(jobs)))) as ex:
+                futures = [(job, ex.submit(run, job)) for job in jobs]
+                for job, fut in futures:
+                    # One session's failure (of any kind) must not abort the others or
+                    # skip the registry update for those that succeeded.
+                    try:
+                        published.append(fut.result())
+                    except Exception as e:  # noqa: BLE001
+                        errors.append((job.session, e))
+
+    if len(jobs) == 1 and errors:
+        _, e = errors[0]
+        _die(str(e), code=e.code)
+    registry_path = register([p.session for p in published]) if published else draw_root / "index.json"
+
+    for p in published:
+        print(f"[ok] published session: {p.session}")
+        print(f"     session index: {p.session_dir / 'index.json'}")
     print(f"     registry:      {registry_path}")
-    return 0
+    for session, e in errors:
+        what = str(e) if isinstance(e, PublishError) else f"{type(e).__name__}: {e}"
+        print(f"[FAIL] {session}: {what}", file=sys.stderr)
+    return 1 if errors else 0
 
 
 if __name__ == "__main__":
     raise SystemExit(main())
-
@@ -1,37 +1,37 @@
 #!/usr/bin/env python3
+"""
+Filtered views of the package include graph, all written from one load.
+
+Views come from a JSON config (default: tools/map_views.json): named package
+`sets` (prefix/name rules) and `views` that include or exclude a set. With
+`--lanes`, every lane in lanes.md adds a `lane-<slug>` view. Set and lane
+membership comes from one classifier pass (occt_package_classes.py), cached next
+to packages.idx.
+
+Each view writes `include_graph.<view>.{dot,json,md}` and `packages.<view>.md`.
+"""
 import argparse
 import json
 from pathlib import Path
 
+from occt_graph import Graph, graph_json_path, load_graph
+from occt_lanes import entry_packages, load_lanes
+from occt_package_classes import DEFAULT_VIEWS, build_classifier, by_label, classify
+from occt_packages_index import open_packages_index
+
 def load_packages(packages_json: Path):
+    idx = open_packages_index(packages_json.parent)
+    if idx is not None:
+        with idx:
+            return idx.names()
     data = json.loads(packages_json.read_text())
     return data["packages"].keys()
 
-def load_edges(include_dot: Path):
-    edges = []
-    for line in include_dot.read_text().splitlines():
-        line = line.strip()
-        if not line.startswith('"'):
-            continue
-        # "A" -> "B" [label="123"];
-        try:
-            left, rest = line.split("->", 1)
-            a = left.strip().strip('"')
-            b = rest.split("[", 1)[0].strip().strip('"')
-            label = rest.split('label="', 1)[1].split('"', 1)[0]
-            edges.append((a, b, int(label)))
-        except Exception:
-            continue
-    return edges
+def write_include_graph(graph: Graph, out_dot: Path, out_md: Path):
+    graph.write_json(graph_json_path(out_dot), "occt_includes")
+    out_dot.write_text(graph.to_dot("occt_includes"))
 
-def write_include_graph(edges, out_dot: Path, out_md: Path):
-    dot = ["digraph occt_includes {", "  rankdir=LR;"]
-    for a, b, w in edges:
-        dot.append(f'  "{a}" -> "{b}" [label="{w}"];')
-    dot.append("}")
-    out_dot.write_text("\n".join(dot) + "\n")
-
-    heavy = sorted(edges, key=lambda e: e[2], reverse=True)[:120]
+    heavy = sorted(graph.edges(), key=lambda e: e[2], reverse=True)[:120]
     lines = ["# Heaviest package -> package include edges", ""]
     for w in heavy:
         lines.append(f"- `{w[0]}` -> `{w[1]}`: **{w[2]}**")
@@ -43,60 +43,71 @@ def write_packages_md(pkgs, out_md: Path, title: str):
         lines.append(f"- `{pkg}`")
     out_md.write_text("\n".join(lines) + "\n")
 
+def config_views(config: dict, packages: set[str], groups: dict[str, set[str]]) -> list[tuple[str, str, set[str]]]:
+    """(name, title, packages) per configured view."""
+    views = []
+    for v in config.get("views", []):
+        if "include" in v:
+            keep = set(groups.get(f"set:{v['include']}", ()))
+        else:
+            keep = set(packages)
+        if "exclude" in v:
+            keep -= groups.get(f"set:{v['exclude']}", set())
+        views.append((v["name"], v.get("title", v["name"]), keep))
+    return views
+
+def lane_views(lanes: dict, groups: dict[str, set[str]], graph: Graph, with_deps: bool) -> list[tuple[str, str, set[str]]]:
+    views = []
+    for slug in lanes:
+        keep = set(groups.get(f"lane:{slug}", ()))
+        title = f"Lane `{slug}`: entry packages"
+        if with_deps:
+            for pkg in list(keep):
+                keep.update(dst for dst, _ in graph.out_edges(pkg))
+            title += " + their direct include dependencies"
+        views.append((f"lane-{slug}", title, keep))
+    return views
+
 def main():
-    ap = argparse.ArgumentParser()
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
     ap.add_argument("--packages_json", required=True)
-    ap.add_argument("--include_dot", required=True)
+    ap.add_argument("--include_json", required=True, help="include_graph.json written by the include graph stage")
     ap.add_argument("--out", required=True)
-    ap.add_argument("--mode", choices=["core", "exchange_vis"], required=True)
+    ap.add_argument("--views", default=str(DEFAULT_VIEWS), help="view definitions (JSON)")
+    ap.add_argument("--lanes", default="", help="lanes.md; adds one lane-<slug> view per lane")
+    ap.add_argument("--only", action="append", default=[], help="write only these views (repeatable)")
+    ap.add_argument("--mode", action="append", default=[], help="alias of --only (older gen_maps.sh calls)")
     args = ap.parse_args()
 
-    packages = set(load_packages(Path(args.packages_json)))
-    edges = load_edges(Path(args.include_dot))
+    packages_json = Path(args.packages_json)
+    packages = set(load_packages(packages_json))
+    graph = load_graph(Path(args.include_json))
+    config = json.loads(Path(args.views).read_text())
+    lanes = entry_packages(load_lanes(Path(args.lanes))) if args.lanes else {}
     out_dir = Path(args.out)
     out_dir.mkdir(parents=True, exist_ok=True)
 
-    # Heuristic filters: grouped by common OCCT naming conventions.
-    exchange_prefixes = [
-        "Step", "RWStep", "IGES", "RWIGES", "IFSelect", "Interface", "Transfer",
-        "Vrml", "XCAF", "DE", "RW", "XS", "TObj",
-        "Xml", "XmlM", "XmlObj", "Bin", "BinM", "BinObj",
-    ]
-    vis_prefixes = [
-        "AIS", "Prs3d", "Graphic3d", "OpenGl", "V3d", "MeshVS", "DsgPrs",
-        "StdPrs", "Select3D", "Aspect", "Image", "Font", "Media",
-    ]
-    exchange_names = {
-        "BRepToIGES",
-        "BRepToIGESBRep",
-        "IGESToBRep",
-        "StepToGeom",
-        "StepToTopoDS",
-        "TopoDSToStep",
-        "XSControl",
-        "XSAlgo",
-    }
-    exchange_vis = set()
-    for p in packages:
-        if p in exchange_names or any(p.startswith(pref) for pref in exchange_prefixes + vis_prefixes):
-            exchange_vis.add(p)
+    groups = by_label(classify(packages, build_classifier(config, lanes), packages_json.parent))
+    views = config_views(config, packages, groups)
+    if args.lanes:
+        with_deps = config.get("lane_views", {}).get("include_dependencies", True)
+        views += lane_views(lanes, groups, graph, with_deps)
 
-    if args.mode == "core":
-        keep = packages - exchange_vis
-        suffix = "core"
-        title = "OCCT core packages (heuristic)"
-    else:
-        keep = exchange_vis
-        suffix = "exchange_vis"
-        title = "OCCT data exchange + visualization packages (heuristic)"
+    only = set(args.only + args.mode)
+    unknown = only - {name for name, _, _ in views}
+    if unknown:
+        raise SystemExit(f"unknown view(s): {', '.join(sorted(unknown))}")
 
-    filtered_edges = [(a, b, w) for (a, b, w) in edges if a in keep and b in keep]
-    write_include_graph(
-        filtered_edges,
-        out_dir / f"include_graph.{suffix}.dot",
-        out_dir / f"include_graph.{suffix}.md",
-    )
-    write_packages_md(keep, out_dir / f"packages.{suffix}.md", title)
+    for name, title, keep in views:
+        if only and name not in only:
+            continue
+        write_include_graph(
+            graph.subgraph(keep),
+            out_dir / f"include_graph.{name}.dot",
+            out_dir / f"include_graph.{name}.md",
+        )
+        write_packages_md(keep, out_dir / f"packages.{name}.md", title)
+    print(f"[maps] views: {', '.join(name for name, _, _ in views if not only or name in only)}")
 
 if __name__ == "__main__":
     main()
@@ -2,27 +2,28 @@
 import re, sys
 from pathlib import Path
 
+from occt_graph import Graph, graph_json_path
+
 TK_NODE = re.compile(r'"(TK[A-Za-z0-9_]+)"')
 
-def main(inp: str, out: str):
-    text = Path(inp).read_text(errors="ignore").splitlines()
+def toolkit_graph(cmake_dot: str) -> Graph:
+    # CMake only emits DOT, so this is the one place it gets parsed; everything
+    # downstream reads the JSON written next to toolkits.dot.
     keep = set()
     edges = []
-    for line in text:
+    for line in cmake_dot.splitlines():
         ms = TK_NODE.findall(line)
         if ms:
             for m in ms:
                 keep.add(m)
         if "->" in line and len(ms) >= 2:
-            edges.append((ms[0], ms[1]))
-    out_lines = ["digraph toolkits {", "  rankdir=LR;"]
-    for tk in sorted(keep):
-        out_lines.append(f'  "{tk}";')
-    for a,b in edges:
-        if a in keep and b in keep:
-            out_lines.append(f'  "{a}" -> "{b}";')
-    out_lines.append("}")
-    Path(out).write_text("\n".join(out_lines) + "\n")
+            edges.append((ms[0], ms[1], 1))
+    return Graph.from_edges(((a, b, w) for a, b, w in edges if a in keep and b in keep), keep)
+
+def main(inp: str, out: str):
+    graph = toolkit_graph(Path(inp).read_text(errors="ignore"))
+    graph.write_json(graph_json_path(Path(out)), "toolkits")
+    Path(out).write_text(graph.to_dot("toolkits", weighted=False, list_nodes=True))
 
 if __name__ == "__main__":
     if len(sys.argv) != 3:
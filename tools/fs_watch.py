@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Recursive file-change watcher: inotify via ctypes on Linux, stat polling elsewhere.
+
+    with DirWatcher([Path("notes"), Path("repros")]) as w:
+        while True:
+            changed = w.wait()   # set of paths (files created/modified/moved/deleted)
+
+`wait()` blocks until something changes, then keeps collecting for `settle`
+seconds so an editor's write-rename-chmod sequence arrives as one batch.
+"""
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+
+IGNORED_DIRS = {".git", ".cache", ".local", ".venv", "build", "build-occt", "node_modules", "__pycache__"}
+
+IN_MODIFY = 0x002
+IN_ATTRIB = 0x004
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_FROM = 0x040
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+IN_DELETE_SELF = 0x400
+IN_ISDIR = 0x40000000
+IN_IGNORED = 0x8000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_ATTRIB
+_EVENT = struct.Struct("iIII")
+
+
+def _walk_dirs(root: Path):
+    if not root.is_dir():
+        return
+    yield root
+    for dirpath, dirnames, _ in os.walk(root):
+        dirnames[:] = [d for d in dirnames if d not in IGNORED_DIRS]
+        for d in dirnames:
+            yield Path(dirpath) / d
+
+
+class _Inotify:
+    def __init__(self, roots: list[Path]):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or None, use_errno=True)
+        self._add = libc.inotify_add_watch
+        self._add.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.wds: dict[int, Path] = {}
+        for root in roots:
+            self.add_tree(root)
+
+    def add_tree(self, root: Path) -> None:
+        for d in _walk_dirs(root):
+            wd = self._add(self.fd, os.fsencode(d), _MASK)
+            if wd >= 0:
+                self.wds[wd] = d
+
+    def read(self, timeout: float | None) -> set[Path]:
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return set()
+        changed: set[Path] = set()
+        try:
+            buf = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return changed
+        pos = 0
+        while pos < len(buf):
+            wd, mask, _, length = _EVENT.unpack_from(buf, pos)
+            name = buf[pos + _EVENT.size : pos + _EVENT.size + length].rstrip(b"\0")
+            pos += _EVENT.size + length
+            parent = self.wds.get(wd)
+            if mask & IN_IGNORED:
+                self.wds.pop(wd, None)
+                continue
+            if parent is None or not name:
+                continue
+            path = parent / os.fsdecode(name)
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO) and path.name not in IGNORED_DIRS:
+                    # Files written before the watch lands would be missed; report them too.
+                    self.add_tree(path)
+                    changed.update(p for p in path.rglob("*") if p.is_file())
+                continue
+            changed.add(path)
+        return changed
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class _Poller:
+    def __init__(self, roots: list[Path], interval: float = 0.25):
+        self.roots = roots
+        self.interval = interval
+        self.snapshot = self._scan()
+
+    def _scan(self) -> dict[Path, tuple[int, int]]:
+        out = {}
+        for root in self.roots:
+            for d in _walk_dirs(root):
+                try:
+                    entries = list(os.scandir(d))
+                except OSError:
+                    continue
+                for e in entries:
+                    if e.is_file():
+                        st = e.stat()
+                        out[Path(e.path)] = (st.st_mtime_ns, st.st_size)
+        return out
+
+    def read(self, timeout: float | None) -> set[Path]:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            time.sleep(self.interval if deadline is None else max(0.0, min(self.interval, deadline - time.monotonic())))
+            snap = self._scan()
+            changed = {p for p in snap.keys() | self.snapshot.keys() if snap.get(p) != self.snapshot.get(p)}
+            self.snapshot = snap
+            if changed or (deadline is not None and time.monotonic() >= deadline):
+                return changed
+
+    def close(self) -> None:
+        pass
+
+
+class DirWatcher:
+    def __init__(self, roots: list[Path], *, settle: float = 0.03, poll: bool = False):
+        self.settle = settle
+        self.backend = None
+        if not poll and sys.platform.startswith("linux"):
+            try:
+                self.backend = _Inotify(roots)
+            except (OSError, AttributeError):
+                self.backend = None
+        if self.backend is None:
+            self.backend = _Poller(roots)
+
+    @property
+    def kind(self) -> str:
+        return "inotify" if isinstance(self.backend, _Inotify) else "poll"
+
+    def wait(self, timeout: float | None = None) -> set[Path]:
+        """Changed paths; with `timeout`, an empty set if nothing changed in that time."""
+        changed: set[Path] = set()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not changed:
+            left = None if deadline is None else deadline - time.monotonic()
+            if left is not None and left <= 0:
+                return changed
+            changed = self.backend.read(left)
+        while True:
+            more = self.backend.read(self.settle)
+            if not more:
+                return changed
+            changed |= more
+
+    def close(self) -> None:
+        self.backend.close()
+
+    def __enter__(self) -> "DirWatcher":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -2,98 +2,60 @@
 import argparse
 import json
 import re
-from dataclasses import dataclass
 from pathlib import Path
 
-
-LANE_HEADER_RE = re.compile(r"^##\s+lane:([a-z0-9-]+)\s*$")
-FOCUS_RE = re.compile(r"^Focus:\s*(.+?)\s*$")
-BACKTICK_TOKEN_RE = re.compile(r"`([^`]+)`")
-DOT_EDGE_RE = re.compile(r'^\s*"([^"]+)"\s*->\s*"([^"]+)"\s*\[label="(\d+)"\];\s*$')
-
-
-@dataclass(frozen=True)
-class LaneDef:
-    slug: str
-    focus: str
-    entry_packages: list[str]
-    anchor_symbols: list[tuple[str, str]]
+from occt_graph import load_graph
+from occt_lanes import LaneDef, entry_packages, parse_lanes
+from occt_package_classes import package_classes
+from occt_packages_index import open_packages_index
 
 
 def read_text(path: Path) -> str:
     return path.read_text(encoding="utf-8", errors="replace")
 
 
-def parse_lane(lanes_md: str, lane_slug: str) -> LaneDef:
-    lines = lanes_md.splitlines()
-    in_lane = False
-    focus = ""
-    entry_packages: list[str] = []
-    anchor_symbols: list[tuple[str, str]] = []
-    mode: str | None = None
-
-    for line in lines:
-        header = LANE_HEADER_RE.match(line)
-        if header:
-            in_lane = header.group(1) == lane_slug
-            mode = None
-            continue
-        if not in_lane:
-            continue
-
-        m = FOCUS_RE.match(line)
-        if m:
-            focus = m.group(1).strip()
-            continue
-
-        if line.strip() == "Entry packages:":
-            mode = "entry"
-            continue
-        if line.strip() == "Anchor symbols (examples):":
-            mode = "anchor"
-            continue
-        if line.startswith("## "):
-            mode = None
-            continue
-
-        if mode == "entry":
-            if not line.lstrip().startswith("-"):
-                continue
-            entry_packages.extend(BACKTICK_TOKEN_RE.findall(line))
-            continue
-
-        if mode == "anchor":
-            if not line.lstrip().startswith("-"):
-                continue
-            tokens = BACKTICK_TOKEN_RE.findall(line)
-            if len(tokens) >= 2:
-                anchor_symbols.append((tokens[0], tokens[1]))
-            elif len(tokens) == 1:
-                anchor_symbols.append((tokens[0], ""))
-            continue
-
-    if not focus and not entry_packages and not anchor_symbols:
-        raise SystemExit(f"Lane not found or empty: {lane_slug!r}")
-    return LaneDef(slug=lane_slug, focus=focus, entry_packages=entry_packages, anchor_symbols=anchor_symbols)
+def lane_packages(repo: Path, lanes: dict[str, LaneDef], lane: LaneDef) -> set[str]:
+    """
+    Scanned packages in `lane`, via the shared package classifier (cached next to
+    packages.idx); falls back to the raw entry list without a package scan.
+    """
+    maps_dir = repo / "notes" / "maps"
+    idx = open_packages_index(maps_dir)
+    if idx is not None:
+        with idx:
+            names = idx.names()
+    elif (maps_dir / "packages.json").is_file():
+        names = list(json.loads(read_text(maps_dir / "packages.json"))["packages"])
+    else:
+        return set(lane.entry_packages)
+    return package_classes(maps_dir, names, entry_packages(lanes)).get(f"lane:{lane.slug}", set())
 
 
-def load_packages(repo: Path) -> dict:
-    data = json.loads(read_text(repo / "notes" / "maps" / "packages.json"))
-    return data["packages"]
+def load_package_counts(repo: Path, names: list[str]) -> dict[str, dict[str, int]]:
+    """
+    Per-package counts for `names` only; packages missing from the scan are omitted.
+    Uses `packages.idx` when present to avoid parsing the full packages.json.
+    """
+    maps_dir = repo / "notes" / "maps"
+    keys = ("n_sources", "n_headers", "n_classes")
+    idx = open_packages_index(maps_dir)
+    if idx is not None:
+        with idx:
+            counts = {}
+            for name in names:
+                entry = idx.package(name)
+                if entry is not None:
+                    counts[name] = {k: getattr(entry, k) for k in keys}
+            return counts
+    pkgs = json.loads(read_text(maps_dir / "packages.json"))["packages"]
+    return {name: {k: pkgs[name].get(k, 0) for k in keys} for name in names if name in pkgs}
 
 
 def load_include_graph_edges(repo: Path) -> list[tuple[str, str, int]]:
-    dot_path = repo / "notes" / "maps" / "include_graph.core.dot"
-    if not dot_path.is_file():
+    graph_path = repo / "notes" / "maps" / "include_graph.core.json"
+    if not graph_path.is_file():
         return []
-    edges: list[tuple[str, str, int]] = []
-    for line in read_text(dot_path).splitlines():
-        m = DOT_EDGE_RE.match(line)
-        if not m:
-            continue
-        src, dst, w = m.group(1), m.group(2), int(m.group(3))
-        edges.append((src, dst, w))
-    return edges
+    return list(load_graph(graph_path).edges())
 
 
 def guess_repro_json(repo: Path, lane_slug: str) -> Path | None:
@@ -171,8 +133,11 @@ def main() -> int:
     if not lanes_path.is_file():
         raise SystemExit(f"Missing lane definitions: {lanes_path}")
 
-    lane = parse_lane(read_text(lanes_path), args.lane)
-    pkgs = load_packages(repo)
+    lanes = parse_lanes(read_text(lanes_path))
+    lane = lanes.get(args.lane)
+    if lane is None or lane.is_empty:
+        raise SystemExit(f"Lane not found or empty: {args.lane!r}")
+    pkgs = load_package_counts(repo, lane.entry_packages)
     edges = load_include_graph_edges(repo)
 
     repro_json = guess_repro_json(repo, lane.slug)
@@ -190,7 +155,7 @@ def main() -> int:
     enum_values = extract_enum_values(repo, enum_header) if enum_header else []
 
     # include graph summaries
-    lane_pkgs = set(lane.entry_packages)
+    lane_pkgs = lane_packages(repo, lanes, lane)
     inbound = [(w, src, dst) for (src, dst, w) in edges if dst in lane_pkgs and src not in lane_pkgs]
     outbound = [(w, src, dst) for (src, dst, w) in edges if src in lane_pkgs and dst not in lane_pkgs]
     internal = [(w, src, dst) for (src, dst, w) in edges if src in lane_pkgs and dst in lane_pkgs and src != dst]
@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""
+Map pipeline orchestrator (what `tools/gen_maps.sh` runs).
+
+Stages declare their inputs and outputs; a stage depends on every stage that
+produces one of its inputs (plus explicit `after` edges), and stages whose
+dependencies are done run concurrently on a thread pool (each stage is still its
+own process, so they don't share the GIL).
+
+A stage is skipped when the fingerprint of its command and inputs matches the
+last successful run (stored in `.cache/maps/stages.json`) and its outputs still
+exist. Files are fingerprinted by content, directories (the OCCT `src/` tree) by
+(path, size, mtime) of every file, so regenerated-but-identical outputs don't
+invalidate downstream stages.
+
+Per-stage timings are appended to `<out>/provenance.md`.
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from occt_lanes import load_lanes
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+TOOLS = REPO_ROOT / "tools"
+STATE_VERSION = 1
+
+
+@dataclass
+class Stage:
+    name: str
+    cmd: list[str]
+    inputs: list[Path]
+    outputs: list[Path]
+    # Ordering-only dependencies (e.g. wait for a shared cache to be warm).
+    after: list[str] = field(default_factory=list)
+    # Failure doesn't fail the pipeline, and dependents still run (as `|| true` did).
+    optional: bool = False
+    # Never skipped (e.g. provenance records the time of the run).
+    always: bool = False
+
+
+def py(script: str, *args: str) -> list[str]:
+    return [sys.executable, str(TOOLS / script), *args]
+
+
+def lib(*names: str) -> list[Path]:
+    return [TOOLS / n for n in names]
+
+
+def build_stages(occt: Path, build: Path, out: Path, preprocess: bool) -> list[Stage]:
+    src = occt / "src"
+    ccdb = build / "compile_commands.json"
+    scan_libs = lib("occt_source_scan.py", "occt_preprocess.py")
+    graph_libs = lib("occt_graph.py")
+    pp_args = ["--preprocess", "--compile_commands", str(ccdb)] if preprocess else []
+    pp_inputs = [ccdb] if preprocess else []
+
+    def o(*names: str) -> list[Path]:
+        return [out / n for n in names]
+
+    # One filter_maps run writes every configured view plus one per lane in lanes.md.
+    lanes_md = out / "lanes.md"
+    lane_args, lane_inputs, views = [], [], ["core", "exchange_vis"]
+    if lanes_md.is_file():
+        lane_args, lane_inputs = ["--lanes", str(lanes_md)], [lanes_md]
+        views += [f"lane-{slug}" for slug in load_lanes(lanes_md)]
+    view_outputs = [
+        out / f"{kind}.{v}.{ext}"
+        for v in views
+        for kind, ext in (("include_graph", "dot"), ("include_graph", "json"), ("include_graph", "md"), ("packages", "md"))
+    ] + o("packages.classes.json")  # classifier cache (occt_package_classes.py)
+
+    return [
+        Stage(
+            "provenance",
+            ["bash", str(TOOLS / "write_provenance.sh"), str(occt), str(build), str(out)],
+            [TOOLS / "write_provenance.sh"],
+            o("provenance.md"),
+            always=True,
+        ),
+        Stage(
+            "scan",
+            py("occt_scan_packages.py", "--occt", str(occt), "--out", str(out), "--include_graph", *pp_args),
+            [src, *lib("occt_scan_packages.py", "occt_include_graph.py", "occt_packages_index.py"),
+             *scan_libs, *graph_libs, *pp_inputs],
+            o("packages.json", "packages.idx", "packages.md", "include_headers.json",
+              "include_graph.json", "include_graph.dot", "include_graph.md"),
+        ),
+        # The next two reuse the scan cache, so they wait for `scan` to warm it.
+        Stage(
+            "include_cost",
+            py("occt_include_cost.py", "--occt", str(occt), "--compile_commands", str(ccdb), "--out", str(out),
+               *(["--preprocess"] if preprocess else [])),
+            [src, ccdb, *lib("occt_include_cost.py"), *scan_libs, *graph_libs],
+            o("include_cost.md", "include_cost.json"),
+            after=["scan"],
+        ),
+        Stage(
+            "symbols",
+            py("occt_symbols.py", "build", "--occt", str(occt)),
+            [src, *lib("occt_symbols.py"), *scan_libs],
+            [REPO_ROOT / ".cache" / "maps" / "symbols.sqlite"],
+            after=["scan"],
+        ),
+        Stage(
+            "cmake_graphviz",
+            ["cmake", f"--graphviz={out / 'cmake-targets.dot'}", str(build)],
+            [build / "CMakeCache.txt"],
+            o("cmake-targets.dot"),
+            optional=True,
+        ),
+        Stage(
+            "toolkits",
+            py("filter_toolkits_dot.py", str(out / "cmake-targets.dot"), str(out / "toolkits.dot")),
+            [*lib("filter_toolkits_dot.py"), *graph_libs, *o("cmake-targets.dot")],
+            o("toolkits.dot", "toolkits.json"),
+            optional=True,
+        ),
+        Stage(
+            "layers",
+            py("occt_layers.py", "--include_json", str(out / "include_graph.json"),
+               "--toolkits_json", str(out / "toolkits.json"), "--out", str(out)),
+            # toolkits.json is optional for occt_layers.py (skipped when missing).
+            [*lib("occt_layers.py"), *graph_libs, *o("include_graph.json", "toolkits.json")],
+            o("layers.md", "layers.json"),
+        ),
+        Stage(
+            "views",
+            py("filter_maps.py", "--packages_json", str(out / "packages.json"),
+               "--include_json", str(out / "include_graph.json"), "--out", str(out), *lane_args),
+            [*lib("filter_maps.py", "map_views.json", "occt_lanes.py", "occt_package_classes.py",
+                 "occt_packages_index.py"),
+             *graph_libs, *o("packages.json", "packages.idx", "include_graph.json"), *lane_inputs],
+            view_outputs,
+        ),
+    ]
+
+
+def _hash_path(h, path: Path) -> None:
+    h.update(str(path).encode("utf-8") + b"\0")
+    if path.is_file():
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+    elif path.is_dir():
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for name in sorted(files):
+                st = os.stat(os.path.join(root, name))
+                h.update(f"{root}/{name}\0{st.st_size}\0{st.st_mtime_ns}\n".encode("utf-8"))
+    else:
+        h.update(b"<missing>")
+
+
+def fingerprint(stage: Stage) -> str:
+    h = hashlib.sha1(json.dumps(stage.cmd).encode("utf-8"))
+    for path in stage.inputs:
+        _hash_path(h, path)
+    return h.hexdigest()
+
+
+def load_state(path: Path) -> dict:
+    try:
+        data = json.loads(path.read_text())
+    except Exception:
+        return {}
+    return data.get("stages", {}) if data.get("version") == STATE_VERSION else {}
+
+
+def save_state(path: Path, stages: dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps({"version": STATE_VERSION, "stages": stages}, indent=2) + "\n")
+    os.replace(tmp, path)
+
+
+def dependencies(stages: list[Stage]) -> dict[str, set[str]]:
+    producer = {p: s.name for s in stages for p in s.outputs}
+    names = {s.name for s in stages}
+    deps = {}
+    for s in stages:
+        d = {producer[p] for p in s.inputs if p in producer} | {a for a in s.after if a in names}
+        d.discard(s.name)
+        deps[s.name] = d
+    return deps
+
+
+def run(stages: list[Stage], state_path: Path, jobs: int, force: bool) -> list[dict]:
+    """Run the DAG; returns one timing row per stage in declaration order."""
+    deps = dependencies(stages)
+    by_name = {s.name: s for s in stages}
+    state = {} if force else load_state(state_path)
+    new_state = dict(state)
+    results: dict[str, dict] = {}
+    print_lock = threading.Lock()
+
+    def execute(stage: Stage) -> dict:
+        fp = fingerprint(stage)
+        if not stage.always and state.get(stage.name) == fp and all(p.exists() for p in stage.outputs):
+            return {"status": "skipped", "seconds": 0.0, "fingerprint": fp}
+        with print_lock:
+            print(f"[maps] {stage.name}: start")
+        t0 = time.perf_counter()
+        proc = subprocess.run(stage.cmd, cwd=REPO_ROOT, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+        elapsed = time.perf_counter() - t0
+        with print_lock:
+            sys.stdout.write(proc.stdout)
+        if proc.returncode != 0:
+            return {"status": f"failed ({proc.returncode})", "seconds": elapsed, "fingerprint": None}
+        return {"status": "ran", "seconds": elapsed, "fingerprint": fp}
+
+    pending = {s.name for s in stages}
+    running = {}
+    t_start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        while pending or running:
+            for name in sorted(pending):
+                if deps[name] & (pending | set(running.values())):
+                    continue
+                failed = [
+                    d for d in deps[name]
+                    if results[d]["status"] not in ("ran", "skipped")
+                    and not by_name[d].optional and d not in by_name[name].after
+                ]
+                pending.discard(name)
+                if failed:
+                    results[name] = {"status": f"blocked by {', '.join(sorted(failed))}", "seconds": 0.0}
+                    print(f"[maps] {name}: blocked by {', '.join(sorted(failed))}")
+                    continue
+                running[pool.submit(execute, by_name[name])] = name
+            if not running:
+                continue
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for fut in done:
+                name = running.pop(fut)
+                res = fut.result()
+                results[name] = res
+                if res.get("fingerprint"):
+                    new_state[name] = res["fingerprint"]
+                else:
+                    new_state.pop(name, None)
+                with print_lock:
+                    print(f"[maps] {name}: {res['status']}" + (f" in {res['seconds']:.2f}s" if res["status"] == "ran" else ""))
+    save_state(state_path, new_state)
+
+    total = time.perf_counter() - t_start
+    rows = [{"stage": s.name, **results[s.name]} for s in stages]
+    rows.append({"stage": "total (wall)", "status": "", "seconds": total})
+    return rows
+
+
+def append_timings(provenance: Path, rows: list[dict], jobs: int) -> None:
+    lines = ["", "## Map pipeline timings", "", f"- parallel stages: {jobs}", ""]
+    lines += ["| stage | status | seconds |", "|---|---|---:|"]
+    for r in rows:
+        lines.append(f"| {r['stage']} | {r['status']} | {r['seconds']:.2f} |")
+    with open(provenance, "a") as f:
+        f.write("\n".join(lines) + "\n")
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("occt_dir")
+    ap.add_argument("build_dir")
+    ap.add_argument("out_dir")
+    ap.add_argument("--jobs", type=int, default=4, help="stages run at once (each may use its own process pool)")
+    ap.add_argument("--force", action="store_true", help="ignore recorded fingerprints and rerun every stage")
+    ap.add_argument(
+        "--preprocess",
+        action="store_true",
+        default=os.environ.get("MAPS_PREPROCESS") == "1",
+        help="preprocessor-aware include extraction (default: MAPS_PREPROCESS=1)",
+    )
+    ap.add_argument("--state", default=str(REPO_ROOT / ".cache" / "maps" / "stages.json"))
+    args = ap.parse_args()
+
+    occt = Path(args.occt_dir).resolve()
+    build = Path(args.build_dir).resolve()
+    out = Path(args.out_dir).resolve()
+    out.mkdir(parents=True, exist_ok=True)
+
+    stages = build_stages(occt, build, out, args.preprocess)
+    rows = run(stages, Path(args.state), args.jobs, args.force)
+    if (out / "provenance.md").is_file():
+        append_timings(out / "provenance.md", rows, args.jobs)
+
+    by_stage = {s.name: s for s in stages}
+    hard_failures = [
+        r["stage"] for r in rows
+        if r["stage"] in by_stage and r["status"] not in ("ran", "skipped") and not by_stage[r["stage"]].optional
+        and not r["status"].startswith("blocked")
+    ]
+    print(f"[maps] Done: {out}" + (f" (failed: {', '.join(hard_failures)})" if hard_failures else ""))
+    return 1 if hard_failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
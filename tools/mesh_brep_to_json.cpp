@@ -12,6 +12,8 @@
 
 #include <algorithm>
 #include <cfloat>
+#include <cstdint>
+#include <cstring>
 #include <fstream>
 #include <iomanip>
 #include <iostream>
@@ -72,6 +74,8 @@ struct Mesh
 {
   std::vector<double> positions;
   std::vector<unsigned int> indices;
+  // Per B-rep face: first triangle, triangle count (in TopExp_Explorer order).
+  std::vector<unsigned int> faceRanges;
   double minX = DBL_MAX, minY = DBL_MAX, minZ = DBL_MAX;
   double maxX = -DBL_MAX, maxY = -DBL_MAX, maxZ = -DBL_MAX;
 
@@ -122,6 +126,8 @@ Mesh MakeMesh(TopoDS_Shape shape, const double deflection)
     }
 
     const gp_Trsf tr = loc.Transformation();
+    mesh.faceRanges.push_back(static_cast<unsigned int>(mesh.indices.size() / 3));
+    mesh.faceRanges.push_back(static_cast<unsigned int>(tri->NbTriangles()));
     const unsigned int baseIndex = static_cast<unsigned int>(mesh.positions.size() / 3);
     for (Standard_Integer i = 1; i <= tri->NbNodes(); ++i)
     {
@@ -141,47 +147,29 @@ Mesh MakeMesh(TopoDS_Shape shape, const double deflection)
 
   return mesh;
 }
-} // namespace
-
-int main(int argc, char** argv)
+void WriteBBox(std::ostream& out, const Mesh& mesh)
 {
-  std::cout.imbue(std::locale::classic());
-
-  if (argc < 3)
-  {
-    std::cerr << "usage: mesh_brep_to_json <input.brep> <output.mesh.json> [deflection]\n";
-    return 2;
-  }
-
-  const std::string inputPath = argv[1];
-  const std::string outputPath = argv[2];
-  const double deflection = argc >= 4 ? std::stod(argv[3]) : 0.05;
-
-  TopoDS_Shape shape;
-  if (!ReadBRep(inputPath, shape) || shape.IsNull())
-  {
-    std::cerr << "failed to read BREP: " << inputPath << "\n";
-    return 1;
-  }
-
-  const Mesh mesh = MakeMesh(shape, deflection);
+  out << "  \"counts\": { \"vertices\": " << (mesh.positions.size() / 3) << ", \"triangles\": " << (mesh.indices.size() / 3) << " },\n";
+  out << "  \"bbox\": { \"is_void\": " << (mesh.isVoid() ? "true" : "false") << ", \"min\": ["
+      << std::setprecision(17) << (mesh.isVoid() ? 0.0 : mesh.minX) << ", "
+      << (mesh.isVoid() ? 0.0 : mesh.minY) << ", " << (mesh.isVoid() ? 0.0 : mesh.minZ) << "], \"max\": ["
+      << (mesh.isVoid() ? 0.0 : mesh.maxX) << ", " << (mesh.isVoid() ? 0.0 : mesh.maxY) << ", "
+      << (mesh.isVoid() ? 0.0 : mesh.maxZ) << "] },\n";
+}
 
+bool WriteMeshV1(const Mesh& mesh, const std::string& outputPath)
+{
   std::ofstream out(outputPath);
   if (!out)
   {
     std::cerr << "failed to open output: " << outputPath << "\n";
-    return 1;
+    return false;
   }
 
   out.imbue(std::locale::classic());
   out << "{\n";
   out << "  \"format\": \"occt-research-mesh-v1\",\n";
-  out << "  \"counts\": { \"vertices\": " << (mesh.positions.size() / 3) << ", \"triangles\": " << (mesh.indices.size() / 3) << " },\n";
-  out << "  \"bbox\": { \"is_void\": " << (mesh.isVoid() ? "true" : "false") << ", \"min\": ["
-      << std::setprecision(17) << (mesh.isVoid() ? 0.0 : mesh.minX) << ", "
-      << (mesh.isVoid() ? 0.0 : mesh.minY) << ", " << (mesh.isVoid() ? 0.0 : mesh.minZ) << "], \"max\": ["
-      << (mesh.isVoid() ? 0.0 : mesh.maxX) << ", " << (mesh.isVoid() ? 0.0 : mesh.maxY) << ", "
-      << (mesh.isVoid() ? 0.0 : mesh.maxZ) << "] },\n";
+  WriteBBox(out, mesh);
 
   out << "  \"positions\": [";
   for (size_t i = 0; i < mesh.positions.size(); ++i)
@@ -199,6 +187,261 @@ int main(int argc, char** argv)
   }
   out << "]\n";
   out << "}\n";
+  out.close();
+  if (!out.good())
+  {
+    std::cerr << "failed to write output: " << outputPath << "\n";
+    return false;
+  }
+  return true;
+}
+
+// Little-endian encoders (independent of host byte order).
+void PutU16(std::string& buf, const std::uint16_t v)
+{
+  buf.push_back(static_cast<char>(v & 0xff));
+  buf.push_back(static_cast<char>((v >> 8) & 0xff));
+}
+
+void PutU32(std::string& buf, const std::uint32_t v)
+{
+  for (int shift = 0; shift < 32; shift += 8)
+  {
+    buf.push_back(static_cast<char>((v >> shift) & 0xff));
+  }
+}
+
+void PutF32(std::string& buf, const double v)
+{
+  const float f = static_cast<float>(v);
+  std::uint32_t bits = 0;
+  std::memcpy(&bits, &f, sizeof(bits));
+  PutU32(buf, bits);
+}
+
+std::string BinPathFor(const std::string& outputPath)
+{
+  const std::string suffix = ".json";
+  if (outputPath.size() > suffix.size()
+      && outputPath.compare(outputPath.size() - suffix.size(), suffix.size(), suffix) == 0)
+  {
+    return outputPath.substr(0, outputPath.size() - suffix.size()) + ".bin";
+  }
+  return outputPath + ".bin";
+}
+
+// mesh-v2: JSON header at outputPath + one little-endian buffer next to it.
+// Layout (each view 4-byte aligned): float32 positions, uint16/uint32 indices, uint32 face ranges.
+bool WriteMeshV2(const Mesh& mesh, const std::string& outputPath)
+{
+  const std::string binPath = BinPathFor(outputPath);
+  const size_t slash = binPath.find_last_of("/\\");
+  const std::string binName = slash == std::string::npos ? binPath : binPath.substr(slash + 1);
+  const size_t nVerts = mesh.positions.size() / 3;
+  const bool wide = nVerts > 0xffff;
+
+  std::string buf;
+  buf.reserve(mesh.positions.size() * 4 + mesh.indices.size() * (wide ? 4 : 2) + mesh.faceRanges.size() * 4 + 4);
+  for (const double v : mesh.positions)
+  {
+    PutF32(buf, v);
+  }
+  const size_t indicesOffset = buf.size();
+  for (const unsigned int i : mesh.indices)
+  {
+    if (wide)
+      PutU32(buf, i);
+    else
+      PutU16(buf, static_cast<std::uint16_t>(i));
+  }
+  while (buf.size() % 4)
+  {
+    buf.push_back('\0');
+  }
+  const size_t facesOffset = buf.size();
+  for (const unsigned int r : mesh.faceRanges)
+  {
+    PutU32(buf, r);
+  }
+
+  std::ofstream bin(binPath, std::ios::binary);
+  if (!bin)
+  {
+    std::cerr << "failed to open output: " << binPath << "\n";
+    return false;
+  }
+  bin.write(buf.data(), static_cast<std::streamsize>(buf.size()));
+  bin.close();
+  if (!bin.good())
+  {
+    // Don't emit a header whose counts the (short) buffer can't back.
+    std::cerr << "failed to write output: " << binPath << "\n";
+    return false;
+  }
+
+  std::ofstream out(outputPath);
+  if (!out)
+  {
+    std::cerr << "failed to open output: " << outputPath << "\n";
+    return false;
+  }
+  out.imbue(std::locale::classic());
+  out << "{\n";
+  out << "  \"format\": \"occt-research-mesh-v2\",\n";
+  WriteBBox(out, mesh);
+  out << "  \"buffer\": { \"uri\": " << JsonEscape(binName) << ", \"byteLength\": " << buf.size()
+      << ", \"endian\": \"little\" },\n";
+  out << "  \"positions\": { \"byteOffset\": 0, \"type\": \"float32\", \"count\": " << mesh.positions.size() << " },\n";
+  out << "  \"indices\": { \"byteOffset\": " << indicesOffset << ", \"type\": \"" << (wide ? "uint32" : "uint16")
+      << "\", \"count\": " << mesh.indices.size() << " },\n";
+  out << "  \"faces\": { \"byteOffset\": " << facesOffset << ", \"type\": \"uint32\", \"count\": "
+      << (mesh.faceRanges.size() / 2) << ", \"layout\": [\"first_triangle\", \"triangle_count\"] }\n";
+  out << "}\n";
+  out.close();
+  if (!out.good())
+  {
+    std::cerr << "failed to write output: " << outputPath << "\n";
+    return false;
+  }
+  return true;
+}
+struct Output
+{
+  double deflection;
+  std::string path;
+};
+
+// Read `inputPath` once and write one mesh per output (e.g. an LOD pyramid).
+bool ExportShape(const std::string& inputPath, const std::vector<Output>& outputs, const std::string& format)
+{
+  TopoDS_Shape shape;
+  if (!ReadBRep(inputPath, shape) || shape.IsNull())
+  {
+    std::cerr << "failed to read BREP: " << inputPath << "\n";
+    return false;
+  }
+
+  for (const Output& o : outputs)
+  {
+    const Mesh mesh = MakeMesh(shape, o.deflection);
+    if (!(format == "v2" ? WriteMeshV2(mesh, o.path) : WriteMeshV1(mesh, o.path)))
+    {
+      return false;
+    }
+  }
+  return true;
+}
+
+// Batch/worker mode: one job per line, `<input.brep>\t<deflection>\t<output>[\t<deflection>\t<output>]...`.
+// Each job is answered with `ok\t<input>` or `fail\t<input>` on stdout (flushed), so a
+// driver can keep the process alive and feed it jobs as workers free up.
+int RunBatch(std::istream& in, const std::string& format)
+{
+  bool allOk = true;
+  std::string line;
+  while (std::getline(in, line))
+  {
+    if (!line.empty() && line.back() == '\r')
+    {
+      line.pop_back();
+    }
+    if (line.empty())
+    {
+      continue;
+    }
+
+    std::vector<std::string> fields;
+    std::istringstream ss(line);
+    for (std::string f; std::getline(ss, f, '\t');)
+    {
+      fields.push_back(f);
+    }
+
+    bool ok = fields.size() >= 3 && fields.size() % 2 == 1;
+    if (ok)
+    {
+      try
+      {
+        std::vector<Output> outputs;
+        for (size_t i = 1; i + 1 < fields.size(); i += 2)
+        {
+          outputs.push_back({std::stod(fields[i]), fields[i + 1]});
+        }
+        ok = ExportShape(fields[0], outputs, format);
+      }
+      catch (...)
+      {
+        std::cerr << "failed to mesh: " << fields[0] << "\n";
+        ok = false;
+      }
+    }
+    else
+    {
+      std::cerr << "bad job line: " << line << "\n";
+    }
+    allOk = allOk && ok;
+    std::cout << (ok ? "ok\t" : "fail\t") << (fields.empty() ? line : fields[0]) << "\n" << std::flush;
+  }
+  return allOk ? 0 : 1;
+}
+} // namespace
+
+int main(int argc, char** argv)
+{
+  std::cout.imbue(std::locale::classic());
+
+  std::vector<std::string> positional;
+  std::vector<Output> lods;
+  std::string format = "v1";
+  std::string batch;
+  for (int i = 1; i < argc; ++i)
+  {
+    const std::string arg = argv[i];
+    if (arg == "--format" && i + 1 < argc)
+    {
+      format = argv[++i];
+    }
+    else if (arg == "--batch" && i + 1 < argc)
+    {
+      batch = argv[++i];
+    }
+    else if (arg == "--lod" && i + 2 < argc)
+    {
+      const double d = std::stod(argv[i + 1]);
+      lods.push_back({d, argv[i + 2]});
+      i += 2;
+    }
+    else
+    {
+      positional.push_back(arg);
+    }
+  }
+
+  if ((batch.empty() && positional.size() < 2) || (format != "v1" && format != "v2"))
+  {
+    std::cerr << "usage: mesh_brep_to_json [--format v1|v2] [--lod <deflection> <output>]... "
+                 "<input.brep> <output.mesh.json> [deflection]\n"
+                 "       mesh_brep_to_json [--format v1|v2] --batch <jobs.txt|->\n";
+    return 2;
+  }
+
+  if (!batch.empty())
+  {
+    if (batch == "-")
+    {
+      return RunBatch(std::cin, format);
+    }
+    std::ifstream jobs(batch);
+    if (!jobs)
+    {
+      std::cerr << "failed to open job list: " << batch << "\n";
+      return 1;
+    }
+    return RunBatch(jobs, format);
+  }
 
-  return 0;
+  const double deflection = positional.size() >= 3 ? std::stod(positional[2]) : 0.05;
+  std::vector<Output> outputs = lods;
+  outputs.push_back({deflection, positional[1]});
+  return ExportShape(positional[0], outputs, format) ? 0 : 1;
 }
@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+Shared directed-graph model for the map pipeline.
+
+Generators build a `Graph` once and write it as JSON (`*.json` next to the
+rendered `*.dot`); consumers load the JSON instead of scraping DOT text.
+
+Adjacency is stored CSR-style in flat `array("I")` columns:
+- `nodes[i]` is the name of node i (sorted, so ids are stable across runs)
+- out-edges of node i are `indices[indptr[i]:indptr[i + 1]]` with the matching
+  `weights` slice, in the order the edges were added
+
+tools/requirements.txt has no numpy, so columns are stdlib arrays; queries work
+on whole columns (masks, slices, counting sorts) rather than per-edge objects.
+"""
+from __future__ import annotations
+
+import json
+from array import array
+from pathlib import Path
+from typing import Iterable, Iterator
+
+GRAPH_FORMAT = "occt-research-graph-v1"
+
+
+class Graph:
+    def __init__(self, nodes: list[str], indptr: array, indices: array, weights: array):
+        self.nodes = nodes
+        self.indptr = indptr
+        self.indices = indices
+        self.weights = weights
+        self.meta: dict = {}
+        self._ids: dict[str, int] | None = None
+
+    # -- construction --------------------------------------------------------
+
+    @classmethod
+    def from_edges(cls, edges: Iterable[tuple[str, str, int]], nodes: Iterable[str] = ()) -> "Graph":
+        """
+        Build from (src, dst, weight) triples. Extra `nodes` are kept even if isolated.
+        Within each source row, edges keep their input order (stable counting sort).
+        """
+        edges = list(edges)
+        names = set(nodes)
+        for a, b, _ in edges:
+            names.add(a)
+            names.add(b)
+        node_list = sorted(names)
+        ids = {n: i for i, n in enumerate(node_list)}
+
+        counts = array("I", [0]) * (len(node_list) + 1)
+        for a, _, _ in edges:
+            counts[ids[a] + 1] += 1
+        for i in range(len(node_list)):
+            counts[i + 1] += counts[i]
+        indptr = array("I", counts)
+
+        fill = array("I", counts[:-1]) if node_list else array("I")
+        indices = array("I", [0]) * len(edges)
+        weights = array("I", [0]) * len(edges)
+        for a, b, w in edges:
+            i = ids[a]
+            pos = fill[i]
+            indices[pos] = ids[b]
+            weights[pos] = int(w)
+            fill[i] = pos + 1
+
+        g = cls(node_list, indptr, indices, weights)
+        g._ids = ids
+        return g
+
+    # -- basic queries -------------------------------------------------------
+
+    @property
+    def n_nodes(self) -> int:
+        return len(self.nodes)
+
+    @property
+    def n_edges(self) -> int:
+        return len(self.indices)
+
+    def node_id(self, name: str) -> int | None:
+        if self._ids is None:
+            self._ids = {n: i for i, n in enumerate(self.nodes)}
+        return self._ids.get(name)
+
+    def edge_sources(self) -> array:
+        """Source node id of every edge, aligned with `indices`/`weights`."""
+        src = array("I", [0]) * self.n_edges
+        for i in range(self.n_nodes):
+            lo, hi = self.indptr[i], self.indptr[i + 1]
+            if hi > lo:
+                src[lo:hi] = array("I", [i]) * (hi - lo)
+        return src
+
+    def edges(self) -> Iterator[tuple[str, str, int]]:
+        nodes = self.nodes
+        for s, d, w in zip(self.edge_sources(), self.indices, self.weights):
+            yield nodes[s], nodes[d], w
+
+    def out_edges(self, name: str) -> list[tuple[str, int]]:
+        i = self.node_id(name)
+        if i is None:
+            return []
+        lo, hi = self.indptr[i], self.indptr[i + 1]
+        return [(self.nodes[d], w) for d, w in zip(self.indices[lo:hi], self.weights[lo:hi])]
+
+    def out_degree(self) -> array:
+        return array("I", (self.indptr[i + 1] - self.indptr[i] for i in range(self.n_nodes)))
+
+    def in_degree(self) -> array:
+        deg = array("I", [0]) * self.n_nodes
+        for d in self.indices:
+            deg[d] += 1
+        return deg
+
+    def scc(self) -> tuple[array, int]:
+        """
+        Strongly connected components (iterative Tarjan, O(V + E)).
+
+        Returns (component id per node, number of components). Ids are in reverse
+        topological order of the condensation: an edge between different
+        components always goes from a higher id to a lower one, so iterating ids
+        upward visits dependencies before their dependents.
+        """
+        n = self.n_nodes
+        indptr, indices = self.indptr, self.indices
+        index = [-1] * n
+        low = [0] * n
+        on_stack = bytearray(n)
+        stack: list[int] = []
+        comp = array("I", [0]) * n
+        n_comps = 0
+        counter = 0
+        for root in range(n):
+            if index[root] != -1:
+                continue
+            index[root] = low[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack[root] = 1
+            work = [[root, indptr[root]]]
+            while work:
+                frame = work[-1]
+                v, pos = frame
+                if pos < indptr[v + 1]:
+                    frame[1] = pos + 1
+                    w = indices[pos]
+                    if index[w] == -1:
+                        index[w] = low[w] = counter
+                        counter += 1
+                        stack.append(w)
+                        on_stack[w] = 1
+                        work.append([w, indptr[w]])
+                    elif on_stack[w] and index[w] < low[v]:
+                        low[v] = index[w]
+                    continue
+                work.pop()
+                if work:
+                    u = work[-1][0]
+                    if low[v] < low[u]:
+                        low[u] = low[v]
+                if low[v] == index[v]:
+                    while True:
+                        w = stack.pop()
+                        on_stack[w] = 0
+                        comp[w] = n_comps
+                        if w == v:
+                            break
+                    n_comps += 1
+        return comp, n_comps
+
+    def layers(self) -> tuple[array, int, array]:
+        """
+        Topological layering of the SCC condensation, reading edges as
+        "source depends on target": layer 0 has no outgoing edges and every other
+        component sits one above its highest dependency. Linear in V + E.
+
+        Returns (component id per node, number of components, layer per component).
+        """
+        comp, n_comps = self.scc()
+        members: list[list[int]] = [[] for _ in range(n_comps)]
+        for v, c in enumerate(comp):
+            members[c].append(v)
+        layer = array("I", [0]) * n_comps
+        indptr, indices = self.indptr, self.indices
+        for c in range(n_comps):  # ascending component id == dependencies first
+            for v in members[c]:
+                for w in indices[indptr[v] : indptr[v + 1]]:
+                    cw = comp[w]
+                    if cw != c and layer[cw] + 1 > layer[c]:
+                        layer[c] = layer[cw] + 1
+        return comp, n_comps, layer
+
+    # -- derived graphs ------------------------------------------------------
+
+    def reverse(self) -> "Graph":
+        """Transpose (CSR of in-edges); row order follows the original edge order."""
+        src = self.edge_sources()
+        return Graph.from_edges(
+            ((self.nodes[d], self.nodes[s], w) for s, d, w in zip(src, self.indices, self.weights)),
+            self.nodes,
+        )
+
+    def subgraph(self, keep: Iterable[str], *, keep_isolated: bool = False) -> "Graph":
+        """Edges with both endpoints in `keep`, in original order."""
+        mask = bytearray(self.n_nodes)
+        for name in keep:
+            i = self.node_id(name)
+            if i is not None:
+                mask[i] = 1
+        src = self.edge_sources()
+        nodes = self.nodes
+        edges = [
+            (nodes[s], nodes[d], w)
+            for s, d, w in zip(src, self.indices, self.weights)
+            if mask[s] and mask[d]
+        ]
+        extra = [n for n, m in zip(nodes, mask) if m] if keep_isolated else ()
+        return Graph.from_edges(edges, extra)
+
+    def rollup(self, group_of, *, drop_self: bool = True, order: Iterable[str] | None = None) -> "Graph":
+        """
+        Collapse nodes into groups (`group_of(name)` -> group or None) and sum weights.
+        Edges whose endpoints have no group are dropped, as are intra-group edges
+        unless `drop_self` is False. Within each source group, edges follow first
+        occurrence, visiting source nodes in `order` (default: node order); pass the
+        scan order to reproduce the scanner's package -> package edge order.
+        """
+        groups = [group_of(n) for n in self.nodes]
+        rows = range(self.n_nodes) if order is None else [i for i in map(self.node_id, order) if i is not None]
+        acc: dict[tuple[str, str], int] = {}
+        for s in rows:
+            ga = groups[s]
+            if ga is None:
+                continue
+            lo, hi = self.indptr[s], self.indptr[s + 1]
+            for d, w in zip(self.indices[lo:hi], self.weights[lo:hi]):
+                gb = groups[d]
+                if gb is None or (drop_self and ga == gb):
+                    continue
+                acc[(ga, gb)] = acc.get((ga, gb), 0) + w
+        return Graph.from_edges((a, b, w) for (a, b), w in acc.items())
+
+    # -- serialization -------------------------------------------------------
+
+    def to_json(self, name: str = "") -> dict:
+        data = {
+            "format": GRAPH_FORMAT,
+            "name": name,
+            "nodes": self.nodes,
+            "indptr": self.indptr.tolist(),
+            "indices": self.indices.tolist(),
+            "weights": self.weights.tolist(),
+        }
+        if self.meta:
+            data["meta"] = self.meta
+        return data
+
+    def write_json(self, path: Path, name: str = "") -> None:
+        path.write_text(json.dumps(self.to_json(name), separators=(",", ":")) + "\n")
+
+    def to_dot(self, name: str, *, weighted: bool = True, list_nodes: bool = False) -> str:
+        """Render for Graphviz; DOT is an output format only, never parsed back."""
+        out = [f"digraph {name} {{", "  rankdir=LR;"]
+        if list_nodes:
+            for n in self.nodes:
+                out.append(f'  "{n}";')
+        for a, b, w in self.edges():
+            out.append(f'  "{a}" -> "{b}" [label="{w}"];' if weighted else f'  "{a}" -> "{b}";')
+        out.append("}")
+        return "\n".join(out) + "\n"
+
+
+def load_graph(path: Path) -> Graph:
+    data = json.loads(path.read_text())
+    if data.get("format") != GRAPH_FORMAT:
+        raise ValueError(f"{path}: not a {GRAPH_FORMAT} file")
+    graph = Graph(
+        list(data["nodes"]),
+        array("I", data["indptr"]),
+        array("I", data["indices"]),
+        array("I", data["weights"]),
+    )
+    graph.meta = data.get("meta") or {}
+    return graph
+
+
+def graph_json_path(dot_path: Path) -> Path:
+    """Machine-format sibling of a rendered DOT file (`foo.dot` -> `foo.json`)."""
+    return dot_path.with_suffix(".json")
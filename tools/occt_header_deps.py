@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Query the header-level include graph (`notes/maps/include_headers.json`).
+
+Package, toolkit and lane graphs are rollups of the same header edges, so questions
+like "which ChFi3d files pull in BOPAlgo?" need no rescan of the OCCT tree:
+
+    tools/occt_header_deps.py why --from ChFi3d --to BOPAlgo
+    tools/occt_header_deps.py why --level lane --from fillets --to booleans
+    tools/occt_header_deps.py rollup --level toolkit --out_dot /tmp/toolkits.dot
+"""
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+
+from occt_graph import Graph, load_graph
+from occt_lanes import load_lanes
+
+LEVELS = ("package", "toolkit", "lane")
+
+
+def lane_of_package(lanes_md: Path) -> dict[str, str]:
+    """{package: lane slug}; a package listed by several lanes belongs to the first."""
+    out: dict[str, str] = {}
+    for slug, lane in load_lanes(lanes_md).items():
+        for pkg in lane.entry_packages:
+            out.setdefault(pkg, slug)
+    return out
+
+
+def group_fn(graph: Graph, level: str, lanes_md: Path):
+    package_of = graph.meta.get("package_of", {})
+    if level == "package":
+        return package_of.get
+    if level == "toolkit":
+        toolkit_of = graph.meta.get("toolkit_of", {})
+        return lambda rel: toolkit_of.get(package_of.get(rel))
+    lanes = lane_of_package(lanes_md)
+    return lambda rel: lanes.get(package_of.get(rel))
+
+
+def cmd_rollup(graph: Graph, args) -> int:
+    # package_of lists files in scan order, which fixes the edge order the scanner uses.
+    rolled = graph.rollup(group_fn(graph, args.level, Path(args.lanes)), order=graph.meta.get("package_of"))
+    if args.out_json:
+        rolled.write_json(Path(args.out_json), f"occt_{args.level}_includes")
+    if args.out_dot:
+        Path(args.out_dot).write_text(rolled.to_dot(f"occt_{args.level}_includes"))
+    heavy = sorted(((w, a, b) for a, b, w in rolled.edges()), reverse=True)
+    for w, a, b in heavy[: args.top]:
+        print(f"{a} -> {b}: {w}")
+    return 0
+
+
+def cmd_why(graph: Graph, args) -> int:
+    group_of = group_fn(graph, args.level, Path(args.lanes))
+    groups = [group_of(n) for n in graph.nodes]
+    rows = []
+    for s, d, w in zip(graph.edge_sources(), graph.indices, graph.weights):
+        if groups[s] != args.src or groups[d] != args.dst:
+            continue
+        if args.headers_only and not graph.nodes[s].endswith((".hxx", ".hpp", ".h")):
+            continue
+        rows.append((graph.nodes[s], graph.nodes[d], w))
+    if not rows:
+        print(f"no {args.level}-level includes from {args.src!r} to {args.dst!r}")
+        return 1
+    for a, b, w in rows:
+        print(f"{a} -> {b}" + (f" ({w}x)" if w > 1 else ""))
+    return 0
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--graph", default="notes/maps/include_headers.json", help="header-level include graph")
+    ap.add_argument("--lanes", default="notes/maps/lanes.md", help="lane definitions (for --level lane)")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+
+    rollup = sub.add_parser("rollup", help="print (and optionally write) a rolled-up graph")
+    rollup.add_argument("--level", choices=LEVELS, default="package")
+    rollup.add_argument("--top", type=int, default=40)
+    rollup.add_argument("--out_json", default="")
+    rollup.add_argument("--out_dot", default="")
+
+    why = sub.add_parser("why", help="list the file -> header edges behind a rolled-up edge")
+    why.add_argument("--level", choices=LEVELS, default="package")
+    why.add_argument("--from", dest="src", required=True)
+    why.add_argument("--to", dest="dst", required=True)
+    why.add_argument("--headers_only", action="store_true", help="skip edges from source files")
+
+    args = ap.parse_args()
+    graph = load_graph(Path(args.graph))
+    return cmd_rollup(graph, args) if args.cmd == "rollup" else cmd_why(graph, args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Header-level transitive include closure and compile-cost estimate per translation unit.
+
+For every TU in compile_commands.json (or every scanned source when it is missing),
+estimate how many bytes/lines of OCCT headers the preprocessor pulls in, and rank
+the headers that dominate those costs.
+
+Includes are resolved by basename against the scanned OCCT headers (the same rule as
+`header_to_pkg`); system/third-party includes are ignored. Closures are computed on
+the SCC condensation of the file graph (include cycles are common thanks to include
+guards), one bitset per component, so the whole pass is linear in the graph size.
+Byte/line totals use weighted popcounts: one mask per bit of the file size, so a
+closure's total is sum(2**k * (closure & mask_k).bit_count()).
+"""
+import argparse, json, time
+from pathlib import Path
+
+from occt_graph import Graph
+from occt_preprocess import define_set
+from occt_source_scan import cache_dir_for, scan_tree
+
+def load_tus(compile_commands: Path, occt: Path, known: set[str]) -> list[str] | None:
+    """OCCT-relative paths of TUs in compile_commands.json that the scan knows about."""
+    if not compile_commands.is_file():
+        return None
+    tus = []
+    seen = set()
+    for entry in json.loads(compile_commands.read_text()):
+        f = Path(entry["file"])
+        if not f.is_absolute():
+            f = Path(entry.get("directory", ".")) / f
+        try:
+            rel = str(f.resolve().relative_to(occt))
+        except ValueError:
+            continue
+        if rel in known and rel not in seen:
+            seen.add(rel)
+            tus.append(rel)
+    return tus
+
+def weight_masks(bit_of: dict[int, int], values: list[int]) -> list[int]:
+    """masks[k] has bit `bit_of[node]` set when bit k of values[node] is set."""
+    masks: list[int] = []
+    for node, bit in bit_of.items():
+        v = values[node]
+        k = 0
+        while v:
+            if v & 1:
+                while len(masks) <= k:
+                    masks.append(0)
+                masks[k] |= 1 << bit
+            v >>= 1
+            k += 1
+    return masks
+
+def weighted_count(bits: int, masks: list[int]) -> int:
+    return sum((bits & m).bit_count() << k for k, m in enumerate(masks))
+
+def fmt_bytes(n: float) -> str:
+    if n < 1024:
+        return f"{int(n)} B"
+    for unit in ("KiB", "MiB", "GiB"):
+        n /= 1024
+        if n < 1024 or unit == "GiB":
+            return f"{n:.1f} {unit}"
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--occt", required=True)
+    ap.add_argument("--compile_commands", default="", help="compile_commands.json (default: every scanned source is a TU)")
+    ap.add_argument("--out", required=True)
+    ap.add_argument("--top", type=int, default=60, help="rows per ranking in include_cost.md")
+    ap.add_argument("--jobs", type=int, default=0)
+    ap.add_argument("--cache_dir", default="", help="scan cache root (default: <repo>/.cache/maps)")
+    ap.add_argument("--no_cache", action="store_true")
+    ap.add_argument("--preprocess", action="store_true", help="only count includes live under the compile_commands defines")
+    args = ap.parse_args()
+
+    t0 = time.perf_counter()
+    repo_root = Path(__file__).resolve().parents[1]
+    occt = Path(args.occt).resolve()
+    out_dir = Path(args.out).resolve()
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    try:
+        occt_label = str(occt.relative_to(repo_root))
+    except ValueError:
+        occt_label = str(occt)
+
+    cache_dir = None
+    if not args.no_cache:
+        cache_root = Path(args.cache_dir).resolve() if args.cache_dir else repo_root / ".cache" / "maps"
+        cache_dir = cache_dir_for(cache_root, occt)
+
+    includes, stats, header_path = {}, {}, {}
+    sources = []
+    pp = define_set(args.compile_commands) if args.preprocess else None
+    for scanned in scan_tree(occt, args.jobs, cache_dir, pp):
+        for rel in scanned["headers"]:
+            header_path[Path(rel).name] = rel
+        sources.extend(rel for rel in scanned["sources"] if rel in scanned["stats"])
+        includes.update(scanned["includes"])
+        stats.update(scanned["stats"])
+
+    tus = None
+    if args.compile_commands:
+        tus = load_tus(Path(args.compile_commands), occt, set(stats))
+    tu_source = "compile_commands.json" if tus is not None else "all scanned sources"
+    if tus is None:
+        tus = sources
+
+    # File graph: every readable file -> the OCCT headers it includes (deduplicated).
+    edges = []
+    for rel, incs in includes.items():
+        targets = []
+        for inc in incs:
+            target = header_path.get(Path(inc).name)
+            if target and target != rel and target in stats and target not in targets:
+                targets.append(target)
+        edges.extend((rel, t, 1) for t in targets)
+    graph = Graph.from_edges(edges, stats)
+    nodes = graph.nodes
+    sizes = [stats[n][0] for n in nodes]
+    lines = [stats[n][1] for n in nodes]
+    headers = set(header_path.values())
+    bit_of = {i: b for b, i in enumerate(i for i, n in enumerate(nodes) if n in headers)}
+    header_nodes = sorted(bit_of, key=bit_of.get)
+
+    comp, n_comps = graph.scc()
+    members: list[list[int]] = [[] for _ in range(n_comps)]
+    for v in range(graph.n_nodes):
+        members[comp[v]].append(v)
+
+    # Forward closure: component ids ascend from sinks, so successors are ready.
+    closure = [0] * n_comps
+    indptr, indices = graph.indptr, graph.indices
+    for c in range(n_comps):
+        acc = 0
+        for v in members[c]:
+            if v in bit_of:
+                acc |= 1 << bit_of[v]
+            for w in indices[indptr[v] : indptr[v + 1]]:
+                cw = comp[w]
+                if cw != c:
+                    acc |= closure[cw]
+        closure[c] = acc
+
+    # Reverse reach: which TUs pull each component in (pushed from dependents down).
+    tu_ids = [graph.node_id(t) for t in tus]
+    reach = [0] * n_comps
+    for t, v in enumerate(tu_ids):
+        reach[comp[v]] |= 1 << t
+    for c in range(n_comps - 1, -1, -1):
+        r = reach[c]
+        if not r:
+            continue
+        for v in members[c]:
+            for w in indices[indptr[v] : indptr[v + 1]]:
+                cw = comp[w]
+                if cw != c:
+                    reach[cw] |= r
+
+    size_masks = weight_masks(bit_of, sizes)
+    line_masks = weight_masks(bit_of, lines)
+
+    tu_rows = []
+    for rel, v in zip(tus, tu_ids):
+        bits = closure[comp[v]]
+        own = 0 if v in bit_of else 1  # sources are not in the header bitsets
+        direct = [nodes[w] for w in indices[indptr[v] : indptr[v + 1]]]
+        tu_rows.append({
+            "tu": rel,
+            "bytes": weighted_count(bits, size_masks) + own * sizes[v],
+            "lines": weighted_count(bits, line_masks) + own * lines[v],
+            "headers": bits.bit_count(),
+            "direct": direct,
+        })
+    tu_rows.sort(key=lambda r: (-r["bytes"], r["tu"]))
+
+    closure_bytes = {}
+    header_rows = []
+    for v in header_nodes:
+        bits = closure[comp[v]]
+        closure_bytes[v] = weighted_count(bits, size_masks)
+        n_tus = reach[comp[v]].bit_count()
+        header_rows.append({
+            "header": nodes[v],
+            "bytes": sizes[v],
+            "lines": lines[v],
+            "closure_bytes": closure_bytes[v],
+            "closure_headers": bits.bit_count(),
+            "tus": n_tus,
+            "total_bytes": n_tus * sizes[v],
+        })
+
+    cycles = [sorted(nodes[v] for v in m) for m in members if len(m) > 1]
+    elapsed = time.perf_counter() - t0
+
+    data = {
+        "occt_root": occt_label,
+        "tu_source": tu_source,
+        "preprocessed": bool(pp),
+        "n_tus": len(tu_rows),
+        "n_headers": len(header_rows),
+        "include_cycles": cycles,
+        "tus": tu_rows,
+        "headers": sorted(header_rows, key=lambda r: (-r["closure_bytes"], r["header"])),
+    }
+    (out_dir / "include_cost.json").write_text(json.dumps(data, indent=2) + "\n")
+
+    top = args.top
+    md = [
+        "# Include cost (transitive header closure)",
+        "",
+        f"- translation units: **{len(tu_rows)}** (from {tu_source})",
+        f"- OCCT headers: **{len(header_rows)}**",
+        f"- include cycles (SCCs with >1 file): **{len(cycles)}**",
+        "- bytes/lines count OCCT headers only (system headers are not resolved)",
+        "- includes: " + ("preprocessor-aware (inactive `#if` branches skipped)" if pp else "every `#include` line"),
+        "",
+        "## Heaviest translation units",
+        "",
+    ]
+    for r in tu_rows[:top]:
+        worst = sorted(
+            (w for w in r["direct"] if graph.node_id(w) in closure_bytes),
+            key=lambda w: -closure_bytes[graph.node_id(w)],
+        )[:3]
+        via = ", ".join(f"`{Path(w).name}`" for w in worst)
+        md.append(
+            f"- `{r['tu']}`: **{fmt_bytes(r['bytes'])}**, {r['lines']} lines, {r['headers']} headers"
+            + (f" (via {via})" if via else "")
+        )
+    md += ["", "## Headers with the largest transitive closure", ""]
+    for r in data["headers"][:top]:
+        md.append(
+            f"- `{r['header']}`: **{fmt_bytes(r['closure_bytes'])}** over {r['closure_headers']} headers, pulled into {r['tus']} TUs"
+        )
+    md += ["", "## Headers parsed the most across the build (size × TUs)", ""]
+    for r in sorted(header_rows, key=lambda r: (-r["total_bytes"], r["header"]))[:top]:
+        md.append(f"- `{r['header']}`: **{fmt_bytes(r['total_bytes'])}** ({fmt_bytes(r['bytes'])} × {r['tus']} TUs)")
+    (out_dir / "include_cost.md").write_text("\n".join(md) + "\n")
+
+    print(f"[maps] include cost: {len(tu_rows)} TUs, {len(header_rows)} headers in {elapsed:.2f}s")
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,76 @@
 #!/usr/bin/env python3
-import argparse, json, re
-from collections import defaultdict
+import argparse, json
 from pathlib import Path
 
-INC_RE = re.compile(r'^\s*#\s*include\s*[<"]([^">]+)[">]')
+from occt_graph import Graph
+from occt_preprocess import define_set
+from occt_source_scan import cache_dir_for, parse_files, read_toolkit_packages, record_includes
+
+def header_graph(pkgs: dict, includes_of) -> Graph:
+    """
+    File -> header include graph over OCCT-relative paths (weights = #include lines).
+
+    Include targets resolve by basename like `header_to_pkg` (last package wins);
+    includes that match no scanned header (system/third-party) are dropped.
+    `includes_of(rel)` returns a file's include targets, or None if it was unreadable.
+    """
+    header_path = {}
+    for info in pkgs.values():
+        for rel in info["headers"]:
+            header_path[Path(rel).name] = rel
+
+    edges = []
+    files = []
+    for info in pkgs.values():
+        for rel in info["headers"] + info["sources"]:
+            files.append(rel)
+            incs = includes_of(rel)
+            if incs is None:
+                continue
+            counts = {}
+            for inc in incs:
+                target = header_path.get(Path(inc).name)
+                if target:
+                    counts[target] = counts.get(target, 0) + 1
+            edges.extend((rel, t, w) for t, w in counts.items())
+    return Graph.from_edges(edges, files)
+
+def package_of_file(pkgs: dict) -> dict:
+    return {rel: pkg for pkg, info in pkgs.items() for rel in info["headers"] + info["sources"]}
+
+def write_header_graph(graph: Graph, pkgs: dict, toolkit_of: dict, out_dir: Path) -> None:
+    # Rollup keys travel with the graph so consumers never need packages.json.
+    graph.meta = {"package_of": package_of_file(pkgs), "toolkit_of": toolkit_of}
+    graph.write_json(out_dir / "include_headers.json", "occt_header_includes")
+
+def write_include_graph(graph: Graph, out_dir: Path) -> None:
+    graph.write_json(out_dir / "include_graph.json", "occt_includes")
+    (out_dir / "include_graph.dot").write_text(graph.to_dot("occt_includes"))
+
+    heavy = [(w, a, b) for a, b, w in graph.edges()]
+    heavy.sort(reverse=True)
+    lines = ["# Heaviest package → package include edges", ""]
+    for w, a, b in heavy[:120]:
+        lines.append(f"- `{a}` → `{b}`: **{w}**")
+    (out_dir / "include_graph.md").write_text("\n".join(lines) + "\n")
+
+def write_include_graphs(occt: Path, pkgs: dict, includes_of, out_dir: Path) -> None:
+    """Header-level graph plus its package rollup (include_graph.dot/.md/.json)."""
+    headers = header_graph(pkgs, includes_of)
+    write_header_graph(headers, pkgs, read_toolkit_packages(occt), out_dir)
+    # Files in scan order (packages, then headers + sources) keep the DOT edge order byte-identical.
+    file_pkg = package_of_file(pkgs)
+    write_include_graph(headers.rollup(file_pkg.get, order=file_pkg), out_dir)
 
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("--occt", required=True)
     ap.add_argument("--packages_json", required=True)
     ap.add_argument("--out", required=True)
+    ap.add_argument("--cache_dir", default="", help="scan cache root (default: <repo>/.cache/maps)")
+    ap.add_argument("--no_cache", action="store_true", help="re-parse every file; don't read or write the scan cache")
+    ap.add_argument("--preprocess", action="store_true", help="evaluate #if/#ifdef blocks and skip comments")
+    ap.add_argument("--compile_commands", default="", help="defines for --preprocess (default: Linux/GCC predefines only)")
     args = ap.parse_args()
 
     occt = Path(args.occt).resolve()
@@ -17,47 +78,23 @@ def main():
     out_dir.mkdir(parents=True, exist_ok=True)
 
     data = json.loads(Path(args.packages_json).read_text())
-    pkgs = data["packages"]
-    header_to_pkg = data["header_to_pkg"]
 
-    edges = defaultdict(lambda: defaultdict(int))
+    cache_dir = None
+    if not args.no_cache:
+        repo_root = Path(__file__).resolve().parents[1]
+        cache_root = Path(args.cache_dir).resolve() if args.cache_dir else repo_root / ".cache" / "maps"
+        cache_dir = cache_dir_for(cache_root, occt)
 
-    def pkg_of_header(header_name: str):
-        return header_to_pkg.get(Path(header_name).name)
+    # Shards are per package, so this shares (and refreshes) the scanner's cache.
+    pp = define_set(args.compile_commands) if args.preprocess else None
+    includes = {}
+    for pkg, info in data["packages"].items():
+        files = [occt / rel for rel in info["headers"] + info["sources"]]
+        shard = cache_dir / f"{pkg}.json" if cache_dir else None
+        for rel, rec in parse_files(occt, files, shard, pp).items():
+            includes[rel] = record_includes(rec, pp)
 
-    for pkg, info in pkgs.items():
-        files = info["headers"] + info["sources"]
-        for rel in files:
-            p = occt / rel
-            try:
-                txt = p.read_text(errors="ignore").splitlines()
-            except Exception:
-                continue
-            for line in txt:
-                m = INC_RE.match(line)
-                if not m:
-                    continue
-                inc = m.group(1)
-                target = pkg_of_header(inc)
-                if target and target != pkg:
-                    edges[pkg][target] += 1
-
-    dot = ["digraph occt_includes {", "  rankdir=LR;"]
-    for a, outs in edges.items():
-        for b, w in outs.items():
-            dot.append(f'  "{a}" -> "{b}" [label="{w}"];')
-    dot.append("}")
-    (out_dir / "include_graph.dot").write_text("\n".join(dot) + "\n")
-
-    heavy = []
-    for a, outs in edges.items():
-        for b, w in outs.items():
-            heavy.append((w, a, b))
-    heavy.sort(reverse=True)
-    lines = ["# Heaviest package → package include edges", ""]
-    for w, a, b in heavy[:120]:
-        lines.append(f"- `{a}` → `{b}`: **{w}**")
-    (out_dir / "include_graph.md").write_text("\n".join(lines) + "\n")
+    write_include_graphs(occt, data["packages"], includes.get, out_dir)
 
 if __name__ == "__main__":
     main()
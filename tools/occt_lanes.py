@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Lane definitions from `notes/maps/lanes.md`, parsed in one pass.
+
+Each `## lane:<slug>` section may carry a `Focus:` line, an `Entry packages:`
+list and an `Anchor symbols (examples):` list of backticked tokens. Shared by
+the map tools (filter_maps, gen_maps, occt_header_deps) and the lane report.
+"""
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from pathlib import Path
+
+LANE_HEADER_RE = re.compile(r"^##\s+lane:([a-z0-9-]+)\s*$")
+FOCUS_RE = re.compile(r"^Focus:\s*(.+?)\s*$")
+BACKTICK_TOKEN_RE = re.compile(r"`([^`]+)`")
+
+
+@dataclass(frozen=True)
+class LaneDef:
+    slug: str
+    focus: str
+    entry_packages: list[str]
+    anchor_symbols: list[tuple[str, str]]
+
+    @property
+    def is_empty(self) -> bool:
+        return not self.focus and not self.entry_packages and not self.anchor_symbols
+
+
+def parse_lanes(lanes_md: str) -> dict[str, LaneDef]:
+    """
+    {slug: LaneDef} for every lane header, in file order. A slug with several
+    sections merges them; a lane with no content is returned empty, never dropped.
+    """
+    focus: dict[str, str] = {}
+    entry: dict[str, list[str]] = {}
+    anchors: dict[str, list[tuple[str, str]]] = {}
+    slug: str | None = None
+    mode: str | None = None
+
+    for line in lanes_md.splitlines():
+        header = LANE_HEADER_RE.match(line)
+        if header:
+            slug = header.group(1)
+            focus.setdefault(slug, "")
+            entry.setdefault(slug, [])
+            anchors.setdefault(slug, [])
+            mode = None
+            continue
+        if slug is None:
+            continue
+
+        m = FOCUS_RE.match(line)
+        if m:
+            focus[slug] = m.group(1).strip()
+            continue
+
+        if line.strip() == "Entry packages:":
+            mode = "entry"
+            continue
+        if line.strip() == "Anchor symbols (examples):":
+            mode = "anchor"
+            continue
+        if line.startswith("## "):
+            mode = None
+            continue
+
+        if mode is None or not line.lstrip().startswith("-"):
+            continue
+        tokens = BACKTICK_TOKEN_RE.findall(line)
+        if mode == "entry":
+            entry[slug].extend(tokens)
+        elif tokens:
+            anchors[slug].append((tokens[0], tokens[1] if len(tokens) >= 2 else ""))
+
+    return {s: LaneDef(slug=s, focus=focus[s], entry_packages=entry[s], anchor_symbols=anchors[s]) for s in focus}
+
+
+def load_lanes(path: Path) -> dict[str, LaneDef]:
+    return parse_lanes(path.read_text(encoding="utf-8", errors="replace"))
+
+
+def entry_packages(lanes: dict[str, LaneDef]) -> dict[str, list[str]]:
+    """{slug: entry packages}, the shape the package classifier takes."""
+    return {slug: lane.entry_packages for slug, lane in lanes.items()}
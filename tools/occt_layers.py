@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Cycle (SCC) detection and topological layering for the package and toolkit graphs.
+
+Layer 0 holds packages/toolkits with no OCCT dependencies; each other entry sits one
+layer above its highest dependency, and include cycles are collapsed into a single
+entry first. Lanes can be read bottom-up in layer order.
+"""
+import argparse, json
+from pathlib import Path
+
+from occt_graph import Graph, load_graph
+
+def analyze(graph: Graph) -> dict:
+    comp, n_comps, layer = graph.layers()
+    members: list[list[str]] = [[] for _ in range(n_comps)]
+    for v, c in enumerate(comp):
+        members[c].append(graph.nodes[v])
+    n_layers = (max(layer) + 1) if n_comps else 0
+    by_layer: list[list[str]] = [[] for _ in range(n_layers)]
+    for c in range(n_comps):
+        by_layer[layer[c]].extend(members[c])
+    cycles = sorted((sorted(m) for m in members if len(m) > 1), key=lambda m: (-len(m), m))
+    return {
+        "n_nodes": graph.n_nodes,
+        "n_edges": graph.n_edges,
+        "n_components": n_comps,
+        "cycles": cycles,
+        "layers": [sorted(names) for names in by_layer],
+        "layer_of": {graph.nodes[v]: layer[comp[v]] for v in range(graph.n_nodes)},
+    }
+
+def render(title: str, noun: str, res: dict) -> list[str]:
+    cycles = res["cycles"]
+    lines = [
+        f"## {title}",
+        "",
+        f"- {noun}: **{res['n_nodes']}**, edges: **{res['n_edges']}**",
+        f"- components after collapsing cycles: **{res['n_components']}**",
+        f"- dependency cycles: **{len(cycles)}**"
+        + (f" (largest: {len(cycles[0])} {noun})" if cycles else ""),
+        f"- layers: **{len(res['layers'])}**",
+        "",
+    ]
+    if cycles:
+        lines += ["### Cycles", ""]
+        for i, names in enumerate(cycles, 1):
+            lines.append(f"- cycle {i} ({len(names)}): " + ", ".join(f"`{n}`" for n in names))
+        lines.append("")
+    lines += ["### Layers (0 = no OCCT dependencies)", ""]
+    for i, names in enumerate(res["layers"]):
+        lines.append(f"- L{i} ({len(names)}): " + ", ".join(f"`{n}`" for n in names))
+    lines.append("")
+    return lines
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--include_json", required=True, help="package include graph (include_graph.json)")
+    ap.add_argument("--toolkits_json", default="", help="toolkit graph (toolkits.json); skipped when missing")
+    ap.add_argument("--out", required=True)
+    args = ap.parse_args()
+
+    out_dir = Path(args.out)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    graphs = [("packages", "Packages", "packages", Path(args.include_json))]
+    if args.toolkits_json:
+        graphs.append(("toolkits", "Toolkits", "toolkits", Path(args.toolkits_json)))
+
+    results = {}
+    md = [
+        "# OCCT layering (SCC condensation)",
+        "",
+        "Derived from `include_graph.json` / `toolkits.json`: cycles are collapsed, then each",
+        "entry is placed one layer above its highest dependency. Read lanes bottom-up.",
+        "",
+    ]
+    for key, title, noun, path in graphs:
+        if not path.is_file():
+            continue
+        results[key] = analyze(load_graph(path))
+        md += render(title, noun, results[key])
+
+    (out_dir / "layers.json").write_text(json.dumps(results, indent=2) + "\n")
+    (out_dir / "layers.md").write_text("\n".join(md).rstrip("\n") + "\n")
+
+if __name__ == "__main__":
+    main()
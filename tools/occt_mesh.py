@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Read/write the mesh files published for the site viewers.
+
+- `occt-research-mesh-v1`: one JSON document with `positions` (xyz doubles) and
+  `indices` (triangle vertex indices) as plain arrays.
+- `occt-research-mesh-v2`: a small JSON header (`<name>.mesh.json`) plus one
+  little-endian buffer next to it (`<name>.mesh.bin`, named by `buffer.uri`):
+  float32 positions, uint16 (<= 65535 vertices) or uint32 indices, and optional
+  uint32 per-face ranges (first triangle, triangle count). Every view starts on a
+  4-byte boundary so browsers can map it straight into typed arrays.
+
+Both are written by tools/mesh_brep_to_json.cpp (`--format v1|v2`). Converting
+existing v1 files:
+
+    tools/occt_mesh.py --to-v2 site/public/occt/draw/<session>/*.mesh.json
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import os
+import sys
+import tempfile
+from array import array
+from dataclasses import dataclass
+from pathlib import Path
+
+MESH_V1 = "occt-research-mesh-v1"
+MESH_V2 = "occt-research-mesh-v2"
+
+_TYPECODES = {"float32": "f", "uint16": "H", "uint32": "I"}
+_ITEMSIZE = {"float32": 4, "uint16": 2, "uint32": 4}
+
+
+@dataclass
+class Mesh:
+    header: dict
+    positions: array | list
+    indices: array | list
+    faces: array | None = None  # flat (first_triangle, triangle_count) pairs
+
+
+def bin_path_for(header_path: Path) -> Path:
+    name = header_path.name
+    return header_path.with_name(name[: -len(".json")] + ".bin" if name.endswith(".json") else name + ".bin")
+
+
+def _view(buf: bytes, spec: dict, what: str) -> array:
+    kind = spec.get("type")
+    if kind not in _TYPECODES:
+        raise ValueError(f"{what}: unsupported type {kind!r}")
+    offset, count = int(spec.get("byteOffset", 0)), int(spec.get("count", 0))
+    end = offset + count * _ITEMSIZE[kind]
+    if offset % 4 or end > len(buf):
+        raise ValueError(f"{what}: view [{offset}, {end}) misaligned or outside buffer ({len(buf)} bytes)")
+    out = array(_TYPECODES[kind])
+    out.frombytes(buf[offset:end])
+    if sys.byteorder != "little":
+        out.byteswap()
+    return out
+
+
+def load_mesh(path: Path) -> Mesh:
+    """Load a v1 or v2 mesh; raises ValueError/OSError on malformed input."""
+    header = json.loads(path.read_text(encoding="utf-8"))
+    if not isinstance(header, dict):
+        raise ValueError("expected a JSON object")
+    if header.get("format") != MESH_V2:
+        return Mesh(header, header.get("positions"), header.get("indices"))
+
+    buffer = header.get("buffer") or {}
+    buf = (path.parent / str(buffer.get("uri", ""))).read_bytes()
+    if "byteLength" in buffer and int(buffer["byteLength"]) != len(buf):
+        raise ValueError(f"buffer is {len(buf)} bytes, header says {buffer['byteLength']}")
+    faces = _view(buf, header["faces"], "faces") if header.get("faces") else None
+    return Mesh(header, _view(buf, header["positions"], "positions"), _view(buf, header["indices"], "indices"), faces)
+
+
+def _bbox(positions) -> dict:
+    if not positions:
+        return {"is_void": True, "min": [0, 0, 0], "max": [0, 0, 0]}
+    axes = [positions[i::3] for i in range(3)]
+    return {"is_void": False, "min": [min(a) for a in axes], "max": [max(a) for a in axes]}
+
+
+def _replace_bytes(path: Path, data: bytes) -> None:
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+
+
+def write_mesh_v2(path: Path, positions, indices, *, faces=None, bbox: dict | None = None) -> tuple[Path, Path]:
+    """Write `path` (header) and its `.bin` buffer; returns both paths."""
+    nverts = len(positions) // 3
+    index_type = "uint32" if nverts > 0xFFFF else "uint16"
+    views = [("positions", array("f", positions), "float32"), ("indices", array(_TYPECODES[index_type], indices), index_type)]
+    if faces is not None:
+        views.append(("faces", array("I", faces), "uint32"))
+
+    header: dict = {
+        "format": MESH_V2,
+        "counts": {"vertices": nverts, "triangles": len(indices) // 3},
+        "bbox": bbox or _bbox(positions),
+    }
+    chunks: list[bytes] = []
+    offset = 0
+    specs = {}
+    for name, data, kind in views:
+        if sys.byteorder != "little":
+            data.byteswap()
+        raw = data.tobytes()
+        raw += b"\0" * (-len(raw) % 4)
+        specs[name] = {"byteOffset": offset, "type": kind, "count": len(data)}
+        chunks.append(raw)
+        offset += len(raw)
+    if "faces" in specs:
+        specs["faces"]["count"] //= 2
+        specs["faces"]["layout"] = ["first_triangle", "triangle_count"]
+
+    bin_path = bin_path_for(path)
+    header["buffer"] = {"uri": bin_path.name, "byteLength": offset, "endian": "little"}
+    header.update(specs)
+    # Replace (never rewrite in place): published files may share an inode with other copies.
+    _replace_bytes(bin_path, b"".join(chunks))
+    _replace_bytes(path, (json.dumps(header, indent=2) + "\n").encode("utf-8"))
+    return path, bin_path
+
+
+def validate_mesh(path: Path) -> list[str]:
+    """Structural checks shared by the artifact validators (v1 and v2)."""
+    try:
+        mesh = load_mesh(path)
+    except Exception as e:  # noqa: BLE001
+        return [f"{path}: failed to load mesh: {e}"]
+
+    pos, ind = mesh.positions, mesh.indices
+    if not isinstance(pos, (list, array)) or not isinstance(ind, (list, array)):
+        return [f"{path}: expected 'positions' and 'indices' arrays"]
+    if len(pos) < 9 or len(pos) % 3 != 0:
+        return [f"{path}: positions length {len(pos)} must be >= 9 and divisible by 3"]
+    if len(ind) < 3 or len(ind) % 3 != 0:
+        return [f"{path}: indices length {len(ind)} must be >= 3 and divisible by 3"]
+    if any(isinstance(x, bool) or not isinstance(x, (int, float)) or not math.isfinite(x) for x in pos):
+        return [f"{path}: positions contain non-finite values"]
+    bad = next((x for x in ind if not (isinstance(x, int) or (isinstance(x, float) and x.is_integer()))), None)
+    if bad is not None:
+        return [f"{path}: indices contain non-integer value {bad!r}"]
+
+    errs: list[str] = []
+    nverts = len(pos) // 3
+    lo, hi = min(ind), max(ind)
+    if lo < 0 or hi >= nverts:
+        errs.append(f"{path}: index out of range (nverts={nverts}, min={lo}, max={hi})")
+    counts = mesh.header.get("counts")
+    if isinstance(counts, dict) and (counts.get("vertices"), counts.get("triangles")) != (nverts, len(ind) // 3):
+        errs.append(f"{path}: counts {counts} do not match data ({nverts} vertices, {len(ind) // 3} triangles)")
+    if mesh.faces is not None:
+        ntri = len(ind) // 3
+        if any(first + n > ntri for first, n in zip(mesh.faces[::2], mesh.faces[1::2])):
+            errs.append(f"{path}: face range past the last triangle ({ntri})")
+    return errs
+
+
+def convert_to_v2(path: Path) -> tuple[int, int]:
+    """Rewrite a v1 mesh as v2 in place; returns (bytes before, bytes after)."""
+    mesh = load_mesh(path)
+    if mesh.header.get("format") == MESH_V2:
+        size = path.stat().st_size + bin_path_for(path).stat().st_size
+        return size, size
+    before = path.stat().st_size
+    _, bin_path = write_mesh_v2(path, mesh.positions, mesh.indices, bbox=mesh.header.get("bbox"))
+    return before, path.stat().st_size + bin_path.stat().st_size
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--to-v2", action="store_true", help="convert v1 meshes to v2 in place")
+    ap.add_argument("meshes", nargs="+", help="*.mesh.json files")
+    args = ap.parse_args()
+
+    rc = 0
+    total_before = total_after = 0
+    for p in map(Path, args.meshes):
+        errs = validate_mesh(p)
+        if errs:
+            for e in errs:
+                print(f"[FAIL] {e}")
+            rc = 1
+            continue
+        if args.to_v2:
+            before, after = convert_to_v2(p)
+            total_before += before
+            total_after += after
+            print(f"[v2] {p}: {before} -> {after} bytes")
+        else:
+            print(f"[OK] {p}")
+    if args.to_v2 and total_after:
+        print(f"[v2] total: {total_before} -> {total_after} bytes (x{total_before / total_after:.1f})")
+    return rc
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
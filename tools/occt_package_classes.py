@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Package -> view/lane membership in one pass.
+
+Rules are exact names or name prefixes, each tagged with a label (`set:<name>` for
+the package sets in tools/map_views.json, `lane:<slug>` for lane entry packages in
+lanes.md). All prefixes live in one character trie, so classifying a package costs
+one walk down its name no matter how many rules there are.
+
+The resulting {package: [labels]} table is cached in `packages.classes.json` next
+to `packages.idx`: one entry per ruleset digest (the most recent few are kept),
+valid while the package list is unchanged. filter_maps and the lane report use
+different rulesets, so each keeps its own entry. Consumers then answer "which
+packages are in view/lane X" with a table lookup.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+
+CLASSES_FILE = "packages.classes.json"
+DEFAULT_VIEWS = Path(__file__).resolve().parent / "map_views.json"
+_LABELS = ""  # trie key holding the labels of prefixes ending at a node
+_CACHED_RULESETS = 8
+
+
+class PrefixClassifier:
+    def __init__(self):
+        self._trie: dict = {}
+        self._exact: dict[str, list[str]] = {}
+        self.rules: list[tuple[str, str, str]] = []  # (kind, pattern, label), for cache keys
+
+    def add_prefix(self, prefix: str, label: str) -> None:
+        node = self._trie
+        for ch in prefix:
+            node = node.setdefault(ch, {})
+        node.setdefault(_LABELS, []).append(label)
+        self.rules.append(("prefix", prefix, label))
+
+    def add_name(self, name: str, label: str) -> None:
+        self._exact.setdefault(name, []).append(label)
+        self.rules.append(("name", name, label))
+
+    def labels(self, name: str) -> list[str]:
+        """Every label whose rule matches `name`, sorted."""
+        found = set(self._exact.get(name, ()))
+        node = self._trie
+        found.update(node.get(_LABELS, ()))
+        for ch in name:
+            node = node.get(ch)
+            if node is None:
+                break
+            found.update(node.get(_LABELS, ()))
+        return sorted(found)
+
+
+def build_classifier(config: dict, lanes: dict[str, list[str]] | None = None) -> PrefixClassifier:
+    """Rules from a map_views.json config (`sets`) and, optionally, {lane slug: entry packages}."""
+    clf = PrefixClassifier()
+    for name, rule in config.get("sets", {}).items():
+        for prefix in rule.get("prefixes", ()):
+            clf.add_prefix(prefix, f"set:{name}")
+        for pkg in rule.get("names", ()):
+            clf.add_name(pkg, f"set:{name}")
+    for slug, entry_packages in (lanes or {}).items():
+        for pkg in entry_packages:
+            clf.add_name(pkg, f"lane:{slug}")
+    return clf
+
+
+def _digest(value) -> str:
+    return hashlib.sha1(json.dumps(value, separators=(",", ":")).encode("utf-8")).hexdigest()
+
+
+def _read_cache(path: Path) -> dict[str, dict]:
+    try:
+        rulesets = json.loads(path.read_text()).get("rulesets")
+    except (OSError, ValueError, AttributeError):
+        return {}
+    return rulesets if isinstance(rulesets, dict) else {}
+
+
+def _write_cache(path: Path, rulesets: dict[str, dict]) -> None:
+    # Temp file + rename: a concurrent reader (another gen_maps stage) never sees a torn file.
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"rulesets": rulesets}, separators=(",", ":")) + "\n")
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+
+
+def classify(packages, clf: PrefixClassifier, maps_dir: Path | None = None) -> dict[str, list[str]]:
+    """
+    {package: labels} for every package (unlabelled packages map to []).
+    With `maps_dir`, the table is read from / written to this ruleset's entry in
+    `<maps_dir>/packages.classes.json`.
+    """
+    packages = list(packages)
+    if not maps_dir:
+        return {pkg: clf.labels(pkg) for pkg in packages}
+    cache = maps_dir / CLASSES_FILE
+    rules_key, packages_key = _digest(clf.rules), _digest(sorted(packages))
+    rulesets = _read_cache(cache)
+    hit = rulesets.get(rules_key)
+    if isinstance(hit, dict) and hit.get("packages") == packages_key and isinstance(hit.get("classes"), dict):
+        return hit["classes"]
+    table = {pkg: clf.labels(pkg) for pkg in packages}
+    rulesets.pop(rules_key, None)
+    rulesets[rules_key] = {"packages": packages_key, "classes": table}
+    _write_cache(cache, dict(list(rulesets.items())[-_CACHED_RULESETS:]))
+    return table
+
+
+def by_label(table: dict[str, list[str]]) -> dict[str, set[str]]:
+    """Invert a classification table: {label: packages}."""
+    out: dict[str, set[str]] = {}
+    for pkg, labels in table.items():
+        for label in labels:
+            out.setdefault(label, set()).add(pkg)
+    return out
+
+
+def package_classes(
+    maps_dir: Path, packages, lanes: dict[str, list[str]] | None = None, views_json: Path = DEFAULT_VIEWS
+) -> dict[str, set[str]]:
+    """{label: packages} for the default view sets (+ lanes), through the maps-dir cache."""
+    clf = build_classifier(json.loads(views_json.read_text()), lanes)
+    return by_label(classify(packages, clf, maps_dir))
@@ -0,0 +1,348 @@
+#!/usr/bin/env python3
+"""
+Compact, memory-mappable index of `packages.json` (written as `packages.idx`).
+
+Layout (little-endian, all integers uint32):
+
+    header   magic "OCCTPKX3", then the size (uint64), mtime_ns (uint64) and SHA-1
+             of the packages.json it was built from, then the counts/offsets in
+             HEADER_FIELDS
+    strings  offsets[n_strings + 1] + UTF-8 blob; package names, paths, class
+             names and header basenames are interned once
+    packages records of (name, headers_start, n_headers, sources_start,
+             n_sources, classes_start, n_classes); *_start index into `ids`
+    ids      per package: (dir, basename) string-id pairs for every header and
+             source path, then one string id per class name
+    pkg_hash open-addressing table (FNV-1a, linear probing) of package index + 1
+    hdr      (basename, package name) string-id pairs + their own hash table
+
+Lookups hash the query, probe the table and compare raw bytes, so a consumer that
+only needs a few package counts never decodes (or even pages in) the rest.
+open_packages_index() ignores an index that no longer matches the packages.json
+next to it, so a stale or foreign index can never shadow the scan. Matching size
+and mtime are trusted (one stat); otherwise the JSON is hashed and compared.
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import mmap
+import struct
+from pathlib import Path
+
+MAGIC = b"OCCTPKX3"
+HEADER_FIELDS = (
+    "occt_root",
+    "n_strings",
+    "n_packages",
+    "n_ids",
+    "pkg_hash_cap",
+    "n_hdr",
+    "hdr_hash_cap",
+    "str_offsets_off",
+    "str_blob_off",
+    "packages_off",
+    "ids_off",
+    "pkg_hash_off",
+    "hdr_off",
+    "hdr_hash_off",
+)
+_HEADER = struct.Struct("<8sQQ20s" + "I" * len(HEADER_FIELDS))
+_PKG = struct.Struct("<7I")
+_U32 = struct.Struct("<I")
+
+
+def fnv1a(data: bytes) -> int:
+    h = 0x811C9DC5
+    for b in data:
+        h = ((h ^ b) * 0x01000193) & 0xFFFFFFFF
+    return h
+
+
+def _table_cap(n: int) -> int:
+    cap = 8
+    while cap < 2 * n:
+        cap *= 2
+    return cap
+
+
+def _hash_table(keys: list[bytes]) -> list[int]:
+    cap = _table_cap(len(keys))
+    slots = [0] * cap
+    for i, key in enumerate(keys):
+        j = fnv1a(key) & (cap - 1)
+        while slots[j]:
+            j = (j + 1) & (cap - 1)
+        slots[j] = i + 1
+    return slots
+
+
+def _pack_u32(values: list[int]) -> bytes:
+    return struct.pack(f"<{len(values)}I", *values)
+
+
+def source_digest(raw: bytes) -> bytes:
+    return hashlib.sha1(raw).digest()
+
+
+def build_index(data: dict, source: tuple[int, int, bytes] = (0, 0, b"")) -> bytes:
+    """
+    Serialize a parsed `packages.json` dict into the index format; `source` is the
+    JSON's (size, mtime_ns, digest) stamp.
+    """
+    strings: list[bytes] = []
+    sid: dict[str, int] = {}
+
+    def intern(s: str) -> int:
+        i = sid.get(s)
+        if i is None:
+            i = sid[s] = len(strings)
+            strings.append(s.encode("utf-8"))
+        return i
+
+    occt_root = intern(str(data.get("occt_root", "")))
+    records: list[int] = []
+    ids: list[int] = []
+    pkg_keys: list[bytes] = []
+    for name, info in data["packages"].items():
+        rec = [intern(name)]
+        for key in ("headers", "sources"):
+            rec.extend((len(ids), len(info[key])))
+            for path in info[key]:
+                # Split paths so basenames are shared with header_to_pkg and
+                # package directories are stored once.
+                head, _, base = path.rpartition("/")
+                ids.extend((intern(head), intern(base)))
+        rec.extend((len(ids), len(info["class_names"])))
+        ids.extend(intern(s) for s in info["class_names"])
+        records.extend(rec)
+        pkg_keys.append(name.encode("utf-8"))
+
+    hdr: list[int] = []
+    hdr_keys: list[bytes] = []
+    for header, pkg in data["header_to_pkg"].items():
+        hdr.extend((intern(header), intern(pkg)))
+        hdr_keys.append(header.encode("utf-8"))
+
+    offsets = [0]
+    for s in strings:
+        offsets.append(offsets[-1] + len(s))
+    blob = b"".join(strings)
+    pkg_hash = _hash_table(pkg_keys)
+    hdr_hash = _hash_table(hdr_keys)
+
+    sections = [
+        _pack_u32(offsets),
+        blob + b"\0" * (-len(blob) % 4),
+        _pack_u32(records),
+        _pack_u32(ids),
+        _pack_u32(pkg_hash),
+        _pack_u32(hdr),
+        _pack_u32(hdr_hash),
+    ]
+    pos = _HEADER.size
+    section_offs = []
+    for sec in sections:
+        section_offs.append(pos)
+        pos += len(sec)
+
+    header = _HEADER.pack(
+        MAGIC,
+        *source,
+        occt_root,
+        len(strings),
+        len(pkg_keys),
+        len(ids),
+        len(pkg_hash),
+        len(hdr_keys),
+        len(hdr_hash),
+        *section_offs,
+    )
+    return header + b"".join(sections)
+
+
+def write_index(path: Path, packages_json: Path) -> None:
+    """Index `packages_json` into `path`, stamped with the JSON's size, mtime and digest."""
+    raw = packages_json.read_bytes()
+    st = packages_json.stat()
+    # A JSON rewritten between the read and the stat just fails the cheap check later.
+    path.write_bytes(build_index(json.loads(raw), (st.st_size, st.st_mtime_ns, source_digest(raw))))
+
+
+class PackageEntry:
+    """One package record; path/class lists are decoded only when asked for."""
+
+    __slots__ = ("_idx", "name", "n_headers", "n_sources", "n_classes", "_ranges")
+
+    def __init__(self, idx: "PackagesIndex", rec: tuple[int, ...]):
+        self._idx = idx
+        self.name = idx._str(rec[0])
+        self.n_headers, self.n_sources, self.n_classes = rec[2], rec[4], rec[6]
+        self._ranges = ((rec[1], rec[2]), (rec[3], rec[4]), (rec[5], rec[6]))
+
+    def headers(self) -> list[str]:
+        return self._idx._id_paths(*self._ranges[0])
+
+    def sources(self) -> list[str]:
+        return self._idx._id_paths(*self._ranges[1])
+
+    def class_names(self) -> list[str]:
+        return self._idx._id_strs(*self._ranges[2])
+
+
+class PackagesIndex:
+    """
+    Read-only view over a `packages.idx` file.
+
+        with PackagesIndex.open(maps_dir / "packages.idx") as idx:
+            entry = idx.package("ChFi3d")
+            entry.n_sources, entry.headers()
+            idx.pkg_of_header("gp_Pnt.hxx")
+    """
+
+    def __init__(self, buf):
+        self._buf = buf
+        magic, self.source_size, self.source_mtime_ns, self.digest, *fields = _HEADER.unpack_from(buf, 0)
+        if magic != MAGIC:
+            raise ValueError("not a packages index (bad magic)")
+        self._h = dict(zip(HEADER_FIELDS, fields))
+        self._mmap = None
+
+    @classmethod
+    def open(cls, path: Path) -> "PackagesIndex":
+        with open(path, "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        idx = cls(mm)
+        idx._mmap = mm
+        return idx
+
+    def close(self) -> None:
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def __enter__(self) -> "PackagesIndex":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # -- low level -----------------------------------------------------------
+
+    def _u32(self, off: int, i: int) -> int:
+        return _U32.unpack_from(self._buf, off + 4 * i)[0]
+
+    def _str_bytes(self, i: int) -> bytes:
+        start = self._u32(self._h["str_offsets_off"], i)
+        end = self._u32(self._h["str_offsets_off"], i + 1)
+        base = self._h["str_blob_off"]
+        return bytes(self._buf[base + start : base + end])
+
+    def _str(self, i: int) -> str:
+        return self._str_bytes(i).decode("utf-8")
+
+    def _id_strs(self, start: int, n: int) -> list[str]:
+        off = self._h["ids_off"] + 4 * start
+        return [self._str(i) for i in struct.unpack_from(f"<{n}I", self._buf, off)]
+
+    def _id_paths(self, start: int, n: int) -> list[str]:
+        parts = self._id_strs(start, 2 * n)
+        return [f"{d}/{b}" if d else b for d, b in zip(parts[::2], parts[1::2])]
+
+    def _record(self, i: int) -> tuple[int, ...]:
+        return _PKG.unpack_from(self._buf, self._h["packages_off"] + _PKG.size * i)
+
+    def _probe(self, key: str, cap: int, table_off: int, key_sid):
+        raw = key.encode("utf-8")
+        mask = cap - 1
+        j = fnv1a(raw) & mask
+        while True:
+            slot = self._u32(table_off, j)
+            if not slot:
+                return None
+            if self._str_bytes(key_sid(slot - 1)) == raw:
+                return slot - 1
+            j = (j + 1) & mask
+
+    # -- public API ----------------------------------------------------------
+
+    @property
+    def occt_root(self) -> str:
+        return self._str(self._h["occt_root"])
+
+    def __len__(self) -> int:
+        return self._h["n_packages"]
+
+    def __contains__(self, name: str) -> bool:
+        return self._find_package(name) is not None
+
+    def names(self) -> list[str]:
+        return [self._str(self._record(i)[0]) for i in range(len(self))]
+
+    def _find_package(self, name: str) -> int | None:
+        return self._probe(name, self._h["pkg_hash_cap"], self._h["pkg_hash_off"], lambda i: self._record(i)[0])
+
+    def package(self, name: str) -> PackageEntry | None:
+        i = self._find_package(name)
+        return None if i is None else PackageEntry(self, self._record(i))
+
+    def pkg_of_header(self, header_name: str) -> str | None:
+        hdr_off = self._h["hdr_off"]
+        i = self._probe(header_name, self._h["hdr_hash_cap"], self._h["hdr_hash_off"], lambda k: self._u32(hdr_off, 2 * k))
+        return None if i is None else self._str(self._u32(hdr_off, 2 * i + 1))
+
+
+def open_packages_index(maps_dir: Path) -> PackagesIndex | None:
+    """
+    Open `<maps_dir>/packages.idx` if present, valid and built from the current
+    `<maps_dir>/packages.json`, else None (callers fall back to JSON).
+    """
+    path = maps_dir / "packages.idx"
+    if not path.is_file():
+        return None
+    try:
+        idx = PackagesIndex.open(path)
+    except (OSError, ValueError, struct.error):
+        return None
+    source = maps_dir / "packages.json"
+    try:
+        st = source.stat()
+        if (st.st_size, st.st_mtime_ns) == (idx.source_size, idx.source_mtime_ns):
+            return idx
+        # Touched but maybe unchanged (checkout, copy): fall back to the content hash.
+        if st.st_size == idx.source_size and source_digest(source.read_bytes()) == idx.digest:
+            return idx
+    except FileNotFoundError:
+        return idx  # the index is all there is
+    except OSError:
+        pass
+    idx.close()
+    return None
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Build or query the compact packages index.")
+    ap.add_argument("--packages_json", help="build the index from this packages.json")
+    ap.add_argument("--index", required=True, help="packages.idx path")
+    ap.add_argument("--package", action="append", default=[], help="print counts for a package (repeatable)")
+    args = ap.parse_args()
+
+    idx_path = Path(args.index)
+    if args.packages_json:
+        write_index(idx_path, Path(args.packages_json))
+        print(f"[ok] Wrote {idx_path}")
+
+    if args.package:
+        with PackagesIndex.open(idx_path) as idx:
+            for name in args.package:
+                entry = idx.package(name)
+                if entry is None:
+                    print(f"{name}: (missing)")
+                    continue
+                print(f"{name}: {entry.n_sources} sources, {entry.n_headers} headers, {entry.n_classes} classes")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""
+Lightweight preprocessor-aware `#include` extraction.
+
+Evaluates `#if/#ifdef/#ifndef/#elif/#else/#endif` against a define set (taken from
+compile_commands.json plus Linux/GCC predefines) and drops comments, so includes in
+`#if 0`, `#ifdef _WIN32` or commented-out lines no longer count. Object-like
+`#define`/`#undef` inside the file are tracked; other files' macros are not.
+
+Conditions that cannot be evaluated (function-like macros, unsupported syntax, or an
+identifier that is neither in the define set nor defined earlier in the file) are
+treated as unknown: that branch *and* its alternatives stay active, which matches the
+plain regex scan for those blocks. Unknown operands still fold where the result is
+forced, e.g. `defined(_MSC_VER) && _MSC_VER < 1800` is false.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+import shlex
+from pathlib import Path
+
+# Enough of `g++ -dM -E` on x86_64 Linux for the conditions OCCT headers use.
+LINUX_PREDEFINES = {
+    "__linux__": "1",
+    "__linux": "1",
+    "__unix__": "1",
+    "__unix": "1",
+    "__ELF__": "1",
+    "__GNUC__": "12",
+    "__GNUC_MINOR__": "0",
+    "__cplusplus": "201703L",
+    "__x86_64__": "1",
+    "__LP64__": "1",
+    "__STDC__": "1",
+    "__CHAR_BIT__": "8",
+}
+
+COMMENT_OR_STRING_RE = re.compile(
+    r"""//[^\n]*|/\*.*?\*/|"(?:\\.|[^"\\\n])*"|'(?:\\.|[^'\\\n])*'""",
+    re.DOTALL,
+)
+DIRECTIVE_RE = re.compile(r"^\s*#\s*([A-Za-z_]\w*)(.*)$")
+INCLUDE_TARGET_RE = re.compile(r'\s*[<"]([^">]+)[">]')
+DEFINE_RE = re.compile(r"^\s*([A-Za-z_]\w*)(\()?\s*(.*)$")
+TOKEN_RE = re.compile(
+    r"\s*(?:(?P<num>0[xX][0-9a-fA-F]+|\d+)[uUlL]*|(?P<id>[A-Za-z_]\w*)"
+    r"|(?P<op>&&|\|\||<<|>>|<=|>=|==|!=|[-+*/%<>!~&|^()?:,]))"
+)
+
+
+def defines_from_compile_commands(path: Path) -> dict[str, str]:
+    """
+    Defines shared by every compile command (what a header sees in any TU),
+    layered over LINUX_PREDEFINES.
+    """
+    common: dict[str, str] | None = None
+    for entry in json.loads(path.read_text()):
+        args = entry.get("arguments") or shlex.split(entry.get("command", ""))
+        defs: dict[str, str] = {}
+        it = iter(args)
+        for arg in it:
+            if arg in ("-D", "-U"):
+                arg = arg + next(it, "")
+            if arg.startswith("-D"):
+                name, _, value = arg[2:].partition("=")
+                defs[name] = value if "=" in arg else "1"
+            elif arg.startswith("-U"):
+                defs.pop(arg[2:], None)
+        if common is None:
+            common = defs
+        else:
+            common = {k: v for k, v in common.items() if defs.get(k) == v}
+    merged = dict(LINUX_PREDEFINES)
+    merged.update(common or {})
+    return merged
+
+
+def define_set_key(defines: dict[str, str]) -> str:
+    return hashlib.sha1(json.dumps(sorted(defines.items())).encode("utf-8")).hexdigest()[:16]
+
+
+def define_set(compile_commands: str = "") -> tuple[str, dict[str, str]]:
+    """(cache key, defines) for `scan_tree(..., pp=...)`; predefines only without a compile DB."""
+    path = Path(compile_commands) if compile_commands else None
+    if path is not None and path.is_file():
+        defines = defines_from_compile_commands(path)
+    else:
+        defines = dict(LINUX_PREDEFINES)
+    return define_set_key(defines), defines
+
+
+class _Unknown(Exception):
+    pass
+
+
+# Value of an identifier we have no definition for; propagates through operators.
+_UNDEF = object()
+
+
+def _tokens(expr: str) -> list[str]:
+    out = []
+    pos = 0
+    expr = expr.rstrip()
+    while pos < len(expr):
+        m = TOKEN_RE.match(expr, pos)
+        if not m or m.end() == pos:
+            raise _Unknown(expr)
+        pos = m.end()
+        out.append(m.group("num") or m.group("id") or m.group("op"))
+    return out
+
+
+_BINARY = [
+    ("||",), ("&&",), ("|",), ("^",), ("&",), ("==", "!="),
+    ("<", "<=", ">", ">="), ("<<", ">>"), ("+", "-"), ("*", "/", "%"),
+]
+
+
+def _eval_tokens(toks: list[str], macros: dict[str, str], depth: int = 0):
+    """
+    Evaluate a `#if` expression to an int, or _UNDEF when it depends on an
+    undefined identifier; raises _Unknown when it can't be parsed.
+    """
+    if depth > 8:
+        raise _Unknown("macro recursion")
+
+    # Resolve `defined X` / `defined(X)` before macro expansion.
+    resolved: list = []
+    i = 0
+    while i < len(toks):
+        t = toks[i]
+        if t == "defined":
+            if i + 1 < len(toks) and toks[i + 1] == "(":
+                if i + 3 >= len(toks) or toks[i + 3] != ")":
+                    raise _Unknown("defined(")
+                name, i = toks[i + 2], i + 4
+            elif i + 1 < len(toks):
+                name, i = toks[i + 1], i + 2
+            else:
+                raise _Unknown("defined")
+            resolved.append(1 if name in macros else 0)
+            continue
+        if t[0].isdigit():
+            octal = len(t) > 1 and t[0] == "0" and t[1] not in "xX"
+            resolved.append(int(t, 8) if octal else int(t, 0))
+        elif t[0].isalpha() or t[0] == "_":
+            if i + 1 < len(toks) and toks[i + 1] == "(":
+                raise _Unknown(f"function-like macro {t}")
+            if t in macros:
+                value = macros[t].strip()
+                resolved.append(_eval_tokens(_tokens(value), macros, depth + 1) if value else 0)
+            else:
+                resolved.append(_UNDEF)
+        else:
+            resolved.append(t)
+        i += 1
+
+    pos = 0
+
+    def peek():
+        return resolved[pos] if pos < len(resolved) else None
+
+    def take():
+        nonlocal pos
+        pos += 1
+        return resolved[pos - 1]
+
+    def unary():
+        t = take() if pos < len(resolved) else None
+        if t is _UNDEF or isinstance(t, int):
+            return t
+        if t == "(":
+            v = ternary()
+            if take() != ")":
+                raise _Unknown(")")
+            return v
+        if t in ("!", "-", "+", "~"):
+            v = unary()
+            if v is _UNDEF:
+                return v
+            return {"!": lambda: int(not v), "-": lambda: -v, "+": lambda: v, "~": lambda: ~v}[t]()
+        raise _Unknown(str(t))
+
+    def binary(level: int):
+        if level == len(_BINARY):
+            return unary()
+        v = binary(level + 1)
+        while peek() in _BINARY[level]:
+            op = take()
+            rhs = binary(level + 1)
+            if op in ("&&", "||"):
+                # A known operand can still force the result: 0 && ?, 1 || ?.
+                forced = 0 if op == "&&" else 1
+                if any(x is not _UNDEF and bool(x) == bool(forced) for x in (v, rhs)):
+                    v = forced
+                elif v is _UNDEF or rhs is _UNDEF:
+                    v = _UNDEF
+                else:
+                    v = 1 - forced
+            elif v is _UNDEF or rhs is _UNDEF:
+                v = _UNDEF
+            else:
+                if op in ("/", "%") and rhs == 0:
+                    raise _Unknown("division by zero")
+                v = {
+                    "|": lambda: v | rhs, "^": lambda: v ^ rhs, "&": lambda: v & rhs,
+                    "==": lambda: int(v == rhs), "!=": lambda: int(v != rhs),
+                    "<": lambda: int(v < rhs), "<=": lambda: int(v <= rhs),
+                    ">": lambda: int(v > rhs), ">=": lambda: int(v >= rhs),
+                    "<<": lambda: v << rhs, ">>": lambda: v >> rhs,
+                    "+": lambda: v + rhs, "-": lambda: v - rhs, "*": lambda: v * rhs,
+                    "/": lambda: int(v / rhs), "%": lambda: v % rhs,
+                }[op]()
+        return v
+
+    def ternary():
+        cond = binary(0)
+        if peek() == "?":
+            take()
+            a = ternary()
+            if take() != ":":
+                raise _Unknown(":")
+            b = ternary()
+            if cond is _UNDEF:
+                return a if a is not _UNDEF and a == b else _UNDEF
+            return a if cond else b
+        return cond
+
+    value = ternary()
+    if pos != len(resolved):
+        raise _Unknown("trailing tokens")
+    return value
+
+
+def eval_condition(expr: str, macros: dict[str, str]) -> bool | None:
+    """True/False for a `#if` expression, or None when it can't be decided."""
+    try:
+        value = _eval_tokens(_tokens(expr), macros)
+    except (_Unknown, RecursionError, ValueError, IndexError, TypeError):
+        return None
+    return None if value is _UNDEF else bool(value)
+
+
+def strip_comments(txt: str) -> str:
+    def repl(m: re.Match[str]) -> str:
+        s = m.group(0)
+        if s.startswith("/*"):
+            return " " + "\n" * s.count("\n")
+        if s.startswith("//"):
+            return ""
+        return s
+
+    return COMMENT_OR_STRING_RE.sub(repl, txt)
+
+
+def active_includes(txt: str, defines: dict[str, str]) -> list[str]:
+    """Include targets on lines that are live under `defines`, in file order."""
+    macros = dict(defines)
+    txt = strip_comments(txt).replace("\\\n", "")
+    # Stack of [parent_active, branch_taken, active]; branch_taken stays False
+    # after an undecidable condition so the alternatives remain live too.
+    stack: list[list[bool]] = []
+    active = True
+    includes: list[str] = []
+    for line in txt.splitlines():
+        m = DIRECTIVE_RE.match(line)
+        if not m:
+            continue
+        kind, rest = m.group(1), m.group(2)
+        if kind in ("if", "ifdef", "ifndef"):
+            if not active:
+                stack.append([False, True, False])
+                continue
+            if kind == "if":
+                cond = eval_condition(rest, macros)
+            else:
+                name = rest.split()[0] if rest.split() else ""
+                cond = (name in macros) == (kind == "ifdef")
+            stack.append([True, cond is True, cond is not False])
+        elif kind == "elif":
+            if not stack:
+                continue
+            parent, taken, _ = stack[-1]
+            if not parent or taken:
+                stack[-1][2] = False
+            else:
+                cond = eval_condition(rest, macros)
+                stack[-1][1] = cond is True
+                stack[-1][2] = cond is not False
+        elif kind == "else":
+            if not stack:
+                continue
+            parent, taken, _ = stack[-1]
+            stack[-1][2] = parent and not taken
+            stack[-1][1] = True
+        elif kind == "endif":
+            if stack:
+                stack.pop()
+        elif not active:
+            continue
+        elif kind == "include":
+            inc = INCLUDE_TARGET_RE.match(rest)
+            if inc:
+                includes.append(inc.group(1))
+        elif kind == "define":
+            d = DEFINE_RE.match(rest)
+            if d:
+                macros[d.group(1)] = "" if d.group(2) else d.group(3).strip()
+        elif kind == "undef":
+            name = rest.split()[0] if rest.split() else ""
+            macros.pop(name, None)
+        active = stack[-1][2] if stack else True
+    return includes
@@ -1,23 +1,42 @@
 #!/usr/bin/env python3
-import argparse, json, re
+import argparse, json
 from pathlib import Path
 
-CLASS_RE = re.compile(r"^\s*(class|struct)\s+([A-Za-z_]\w*)\b", re.MULTILINE)
-HEADER_EXTS = {".hxx", ".hpp", ".h"}
-SOURCE_EXTS = {".cxx", ".cpp", ".cc", ".c"}
+from occt_include_graph import write_include_graphs
+from occt_packages_index import write_index
+from occt_preprocess import define_set
+from occt_source_scan import cache_dir_for, scan_tree
 
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("--occt", required=True)
     ap.add_argument("--out", required=True)
+    ap.add_argument("--jobs", type=int, default=0, help="scan worker processes (default: one per CPU; 1 = serial)")
+    ap.add_argument(
+        "--include_graph",
+        action="store_true",
+        help="also write include_graph.dot/.md from the same scan (replaces a separate occt_include_graph.py run)",
+    )
+    ap.add_argument("--cache_dir", default="", help="scan cache root (default: <repo>/.cache/maps)")
+    ap.add_argument("--no_cache", action="store_true", help="re-parse every file; don't read or write the scan cache")
+    ap.add_argument(
+        "--preprocess",
+        action="store_true",
+        help="evaluate #if/#ifdef blocks and skip comments when extracting includes",
+    )
+    ap.add_argument("--compile_commands", default="", help="defines for --preprocess (default: Linux/GCC predefines only)")
     args = ap.parse_args()
 
     repo_root = Path(__file__).resolve().parents[1]
     occt = Path(args.occt).resolve()
-    src = occt / "src"
     out_dir = Path(args.out).resolve()
     out_dir.mkdir(parents=True, exist_ok=True)
 
+    cache_dir = None
+    if not args.no_cache:
+        cache_root = Path(args.cache_dir).resolve() if args.cache_dir else repo_root / ".cache" / "maps"
+        cache_dir = cache_dir_for(cache_root, occt)
+
     try:
         occt_label = str(occt.relative_to(repo_root))
     except ValueError:
@@ -25,26 +44,15 @@ def main():
 
     packages = {}
     header_to_pkg = {}
+    includes = {}
 
-    for pkg_dir in sorted(p for p in src.iterdir() if p.is_dir()):
-        pkg = pkg_dir.name
-        headers, sources, classes = [], [], []
-        for f in pkg_dir.rglob("*"):
-            if not f.is_file():
-                continue
-            ext = f.suffix.lower()
-            rel = str(f.relative_to(occt))
-            if ext in HEADER_EXTS:
-                headers.append(rel)
-                header_to_pkg[f.name] = pkg
-                try:
-                    txt = f.read_text(errors="ignore")
-                    for m in CLASS_RE.finditer(txt):
-                        classes.append(m.group(2))
-                except Exception:
-                    pass
-            elif ext in SOURCE_EXTS:
-                sources.append(rel)
+    pp = define_set(args.compile_commands) if args.preprocess else None
+    for scanned in scan_tree(occt, args.jobs, cache_dir, pp):
+        pkg = scanned["pkg"]
+        headers, sources, classes = scanned["headers"], scanned["sources"], scanned["classes"]
+        for rel in headers:
+            header_to_pkg[Path(rel).name] = pkg
+        includes.update(scanned["includes"])
 
         if headers or sources:
             packages[pkg] = {
@@ -64,6 +72,8 @@ def main():
     }
 
     (out_dir / "packages.json").write_text(json.dumps(data, indent=2) + "\n")
+    # Compact mmap-able twin for consumers that only need a few lookups.
+    write_index(out_dir / "packages.idx", out_dir / "packages.json")
 
     # human summary
     lines = ["# OCCT package scan", f"- root: `{occt_label}`", f"- packages: **{len(packages)}**", ""]
@@ -73,5 +83,8 @@ def main():
         lines.append(f"- `{pkg}`: {info['n_sources']} sources, {info['n_headers']} headers, {info['n_classes']} class/struct decls")
     (out_dir / "packages.md").write_text("\n".join(lines) + "\n")
 
+    if args.include_graph:
+        write_include_graphs(occt, packages, includes.get, out_dir)
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""
+Single-pass scan of an OCCT `src/` tree.
+
+Each package directory is walked once and every header/source file is read once;
+class/struct declarations and `#include` targets are extracted from the same text.
+`occt_scan_packages.py` and `occt_include_graph.py` both build on these results.
+
+With a cache dir, per-file fingerprints (mtime, size, content hash) and parse
+results are persisted as one JSON shard per package, so reruns only re-parse
+files that actually changed.
+
+Optionally (`pp=(key, defines)`, see occt_preprocess.define_set) include targets
+are also extracted preprocessor-aware; those lists are cached in the same records
+under `pp[key]`, so one shard serves any number of define sets. Likewise
+`symbols=True` adds the `parse_symbols` output (used by occt_symbols.py).
+"""
+import hashlib, io, json, os, re, tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from occt_preprocess import active_includes, strip_comments
+
+CLASS_RE = re.compile(r"^\s*(class|struct)\s+([A-Za-z_]\w*)\b", re.MULTILINE)
+INC_RE = re.compile(r'^\s*#\s*include\s*[<"]([^">]+)[">]')
+DECL_RE = re.compile(r"^\s*(?:template\s*<[^>]*>\s*)?(class|struct|enum(?:\s+class|\s+struct)?|namespace)\s+(?:\w+_EXPORT\s+)?([A-Za-z_]\w*)")
+CALL_RE = re.compile(r"(~?[A-Za-z_]\w*)\s*\(")
+QUALIFIED_DEF_RE = re.compile(r"(?:^|[\s*&])([A-Za-z_]\w*)::(~?[A-Za-z_]\w*)\s*\(")
+LEADING_IDENT_RE = re.compile(r"\s*([A-Za-z_]\w*)")
+# Names followed by "(" that are not the declared function (types, macros, statements).
+NOT_FUNCTION_NAMES = {
+    "Handle", "operator", "if", "for", "while", "switch", "return", "sizeof", "decltype",
+    "alignas", "static_assert", "noexcept", "throw", "catch", "new", "delete",
+}
+HEADER_EXTS = {".hxx", ".hpp", ".h"}
+SOURCE_EXTS = {".cxx", ".cpp", ".cc", ".c"}
+
+# Bump whenever parse_text() output changes so stale cache shards are discarded.
+SCAN_CACHE_VERSION = 3
+# Preprocessed include lists kept per record (oldest define set is dropped first).
+PP_CACHE_SETS = 4
+
+
+def parse_text(txt: str) -> tuple[list[str], list[str]]:
+    """Return (class/struct names, include targets) in file order."""
+    classes = [m.group(2) for m in CLASS_RE.finditer(txt)]
+    includes = []
+    for line in txt.splitlines():
+        m = INC_RE.match(line)
+        if m:
+            includes.append(m.group(1))
+    return classes, includes
+
+
+def _function_name(code: str, owner: str = "") -> str | None:
+    """Declared function name in a declaration line: first call-like name that isn't a macro/type."""
+    for m in CALL_RE.finditer(code):
+        name = m.group(1)
+        if name in NOT_FUNCTION_NAMES or name.lstrip("~").isupper():
+            continue
+        prefix = code[: m.start()].strip()
+        if name.startswith("~") or (not prefix and name == owner):
+            return name
+        if prefix and not prefix.endswith((",", "=", "(", "return", ":")):
+            return name
+        return None
+    return None
+
+
+def parse_symbols(txt: str) -> list[list]:
+    """
+    Heuristic symbol table: [kind, name, scope, line] rows, line numbers 1-based.
+
+    Kinds: class/struct/enum/namespace declarations (forward declarations skipped),
+    enumerators (scope = enum), member functions declared in a class body
+    (scope = class), out-of-line `Class::Member(` definitions and free functions at
+    namespace level. Works line by line on comment-stripped text with a brace stack,
+    which fits OCCT's formatting; it is not a C++ parser.
+    """
+    out: list[list] = []
+    stack: list[tuple[str, str]] = []  # (block kind, name) per open brace
+    pending: tuple[str, str] | None = None
+    for lineno, line in enumerate(strip_comments(txt).splitlines(), 1):
+        code = line.strip()
+        if not code or code.startswith("#"):
+            continue
+        top = stack[-1] if stack else ("namespace", "")
+        at_top_level = all(kind == "namespace" for kind, _ in stack)
+        decl = DECL_RE.match(line)
+        if decl and not (code.endswith(";") and "{" not in code) and top[0] != "enum":
+            kind = decl.group(1).split()[0]
+            pending = (kind, decl.group(2))
+            if kind != "namespace":
+                out.append([kind, decl.group(2), top[1] if top[0] in ("class", "struct") else "", lineno])
+        elif top[0] in ("class", "struct") and not pending:
+            name = _function_name(code, top[1])
+            if name and not code.startswith(("typedef", "using", "friend")):
+                out.append(["method", name, top[1], lineno])
+        elif at_top_level and not pending and not line[:1].isspace():
+            q = QUALIFIED_DEF_RE.search(line)
+            if q and not q.group(1).isupper():
+                out.append(["definition", q.group(2), q.group(1), lineno])
+            elif not code.endswith(";"):
+                name = _function_name(code)
+                if name and not code.startswith(("typedef", "using", "return")):
+                    out.append(["function", name, "", lineno])
+
+        # Walk braces; text inside an enum body yields enumerators.
+        seg_start = 0
+        for i, ch in enumerate(line + "\0"):
+            if ch not in "{}\0":
+                continue
+            if stack and stack[-1][0] == "enum":
+                for piece in line[seg_start:i].split(","):
+                    m = LEADING_IDENT_RE.match(piece)
+                    if m:
+                        out.append(["enumerator", m.group(1), stack[-1][1], lineno])
+            seg_start = i + 1
+            if ch == "{":
+                if pending:
+                    stack.append(pending)
+                    pending = None
+                else:
+                    stack.append(("block", ""))
+            elif ch == "}" and stack:
+                stack.pop()
+        if pending and code.endswith(";"):
+            pending = None
+    return out
+
+
+def cache_dir_for(cache_root: Path, occt: Path) -> Path:
+    """Per-checkout shard dir, so several OCCT trees can share one cache root."""
+    key = hashlib.sha1(str(occt.resolve()).encode("utf-8")).hexdigest()[:12]
+    return cache_root / "scan" / key
+
+
+def _load_shard(path: Path) -> dict:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except Exception:
+        return {}
+    if not isinstance(data, dict) or data.get("version") != SCAN_CACHE_VERSION:
+        return {}
+    files = data.get("files")
+    return files if isinstance(files, dict) else {}
+
+
+def _write_shard(path: Path, files: dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = json.dumps({"version": SCAN_CACHE_VERSION, "files": files}, separators=(",", ":"))
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".shard-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+
+
+def _decode(data: bytes) -> str:
+    # Same decoding/newline handling as Path.read_text(errors="ignore").
+    return io.TextIOWrapper(io.BytesIO(data), errors="ignore").read()
+
+
+def record_includes(rec: dict, pp: tuple | None = None) -> list[str]:
+    """A parsed record's include targets, preprocessed for `pp` when given."""
+    return rec["pp"][pp[0]] if pp else rec["includes"]
+
+
+def parse_files(
+    occt: Path, files: list[Path], shard: Path | None = None, pp: tuple | None = None, symbols: bool = False
+) -> dict[str, dict]:
+    """
+    Parse `files`, reusing cached results from `shard` when possible.
+
+    Returns {occt-relative path: {"size", "lines", "classes", "includes", ...}}; unreadable
+    files are absent. A cached entry is reused when mtime and size match, or when
+    the content hash matches (e.g. after a checkout touched the file but not its bytes).
+    With `pp`, records also carry `pp[key]` (see `record_includes`); with `symbols`,
+    a `symbols` list (see `parse_symbols`).
+    """
+    cached = _load_shard(shard) if shard else {}
+    fresh: dict[str, dict] = {}
+    dirty = False
+    for f in files:
+        rel = str(f.relative_to(occt))
+        try:
+            st = f.stat()
+        except OSError:
+            continue
+        rec = cached.get(rel)
+        txt = None
+        if not (rec and rec.get("mtime_ns") == st.st_mtime_ns and rec.get("size") == st.st_size):
+            try:
+                data = f.read_bytes()
+            except Exception:
+                continue
+            digest = hashlib.sha1(data).hexdigest()
+            dirty = True
+            if rec and rec.get("sha1") == digest:
+                rec = dict(rec, mtime_ns=st.st_mtime_ns, size=st.st_size)
+            else:
+                txt = _decode(data)
+                rec = _parse_record(txt, st, digest)
+        need_pp = pp and pp[0] not in rec.get("pp", {})
+        need_symbols = symbols and "symbols" not in rec
+        if need_pp or need_symbols:
+            if txt is None:
+                try:
+                    txt = _decode(f.read_bytes())
+                except Exception:
+                    continue
+            rec = dict(rec)
+            if need_pp:
+                sets = dict(rec.get("pp", {}))
+                while len(sets) >= PP_CACHE_SETS:
+                    sets.pop(next(iter(sets)))
+                sets[pp[0]] = active_includes(txt, pp[1])
+                rec["pp"] = sets
+            if need_symbols:
+                rec["symbols"] = parse_symbols(txt)
+            dirty = True
+        fresh[rel] = rec
+    if shard and (dirty or fresh.keys() != cached.keys()):
+        _write_shard(shard, fresh)
+    return fresh
+
+
+def _parse_record(txt: str, st: os.stat_result, digest: str) -> dict:
+    classes, includes = parse_text(txt)
+    return {
+        "mtime_ns": st.st_mtime_ns,
+        "size": st.st_size,
+        "sha1": digest,
+        "lines": txt.count("\n") + (1 if txt and not txt.endswith("\n") else 0),
+        "classes": classes,
+        "includes": includes,
+    }
+
+
+def scan_package(
+    occt: Path, pkg_dir: Path, cache_dir: Path | None = None, pp: tuple | None = None, symbols: bool = False
+) -> dict:
+    """
+    Scan one package directory.
+
+    File order follows `rglob("*")` so the derived `packages.json` and include
+    edge order match the historical serial scanner. `includes` maps each readable
+    file's OCCT-relative path to its include targets and `stats` to its
+    (bytes, lines); unreadable files are absent from both. With `pp`, `includes`
+    holds the preprocessor-aware lists; with `symbols`, `symbols` maps each file to
+    its `parse_symbols` rows.
+    """
+    headers, sources, files = [], [], []
+    for f in pkg_dir.rglob("*"):
+        if not f.is_file():
+            continue
+        ext = f.suffix.lower()
+        if ext in HEADER_EXTS:
+            headers.append(str(f.relative_to(occt)))
+        elif ext in SOURCE_EXTS:
+            sources.append(str(f.relative_to(occt)))
+        else:
+            continue
+        files.append(f)
+
+    shard = cache_dir / f"{pkg_dir.name}.json" if cache_dir else None
+    parsed = parse_files(occt, files, shard, pp, symbols)
+    classes = []
+    for rel in headers:
+        if rel in parsed:
+            classes.extend(parsed[rel]["classes"])
+    out = {
+        "pkg": pkg_dir.name,
+        "headers": headers,
+        "sources": sources,
+        "classes": classes,
+        "includes": {rel: record_includes(rec, pp) for rel, rec in parsed.items()},
+        "stats": {rel: (rec["size"], rec["lines"]) for rel, rec in parsed.items()},
+    }
+    if symbols:
+        out["symbols"] = {rel: rec["symbols"] for rel, rec in parsed.items()}
+    return out
+
+
+def read_toolkit_packages(occt: Path) -> dict[str, str]:
+    """{package: toolkit} from the `src/TK*/PACKAGES` lists of a flat-layout checkout."""
+    toolkit_of = {}
+    for packages in sorted((occt / "src").glob("*/PACKAGES")):
+        try:
+            names = packages.read_text(errors="ignore").split()
+        except Exception:
+            continue
+        for name in names:
+            toolkit_of.setdefault(name, packages.parent.name)
+    return toolkit_of
+
+
+def _scan_package_args(args: tuple) -> dict:
+    return scan_package(*args)
+
+
+def scan_tree(
+    occt: Path, jobs: int = 0, cache_dir: Path | None = None, pp: tuple | None = None, symbols: bool = False
+) -> list[dict]:
+    """
+    Scan every `src/<pkg>` directory, in sorted package order.
+
+    `jobs` <= 0 uses one worker per CPU; `jobs` == 1 scans in-process.
+    `cache_dir` (see `cache_dir_for`) enables the persistent per-package shards.
+    `pp` switches include extraction to the preprocessor-aware mode; `symbols`
+    adds per-file symbol rows.
+    """
+    src = occt / "src"
+    pkg_dirs = sorted(p for p in src.iterdir() if p.is_dir())
+    if jobs <= 0:
+        jobs = os.cpu_count() or 1
+    work = [(occt, d, cache_dir, pp, symbols) for d in pkg_dirs]
+    if jobs == 1 or len(work) <= 1:
+        return [_scan_package_args(w) for w in work]
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        return list(pool.map(_scan_package_args, work, chunksize=4))
@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Python-native OCCT symbol index (SQLite), built from the package scanner's per-file parse.
+
+Unlike `clangd_index.sh` this needs no clangd and the result is queryable from any
+tool. Rows come from `occt_source_scan.parse_symbols` (classes, enums, enumerators,
+member declarations, out-of-line definitions, free functions) and share the scan
+cache, so a rebuild after a tag bump only re-parses changed files.
+
+    tools/occt_symbols.py build --occt occt
+    tools/occt_symbols.py query --prefix BRep_Tool::Cu
+    tools/occt_symbols.py query --contains walkingfail
+    tools/occt_symbols.py check_anchors notes/dossiers
+
+Lookups: exact/prefix on `qualname` and `name` use B-tree indexes; substring search
+intersects a trigram table over distinct lower-cased names, then verifies matches.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import re
+import sqlite3
+import time
+from pathlib import Path
+
+from occt_source_scan import cache_dir_for, scan_tree
+
+SCHEMA = """
+CREATE TABLE meta(key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE files(id INTEGER PRIMARY KEY, path TEXT NOT NULL UNIQUE, pkg TEXT NOT NULL, lines INTEGER NOT NULL);
+CREATE TABLE names(id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE);
+CREATE TABLE symbols(
+  name_id INTEGER NOT NULL,
+  qualname TEXT NOT NULL,
+  kind TEXT NOT NULL,
+  file_id INTEGER NOT NULL,
+  line INTEGER NOT NULL
+);
+CREATE TABLE trigrams(tri TEXT NOT NULL, name_id INTEGER NOT NULL, PRIMARY KEY(tri, name_id)) WITHOUT ROWID;
+"""
+# Created after the bulk insert; cheaper than maintaining them row by row.
+INDEXES = """
+CREATE INDEX symbols_qualname ON symbols(qualname);
+CREATE INDEX symbols_name ON symbols(name_id);
+"""
+
+ANCHOR_RE = re.compile(r"`(?P<prefix>[\w./-]*?)(?P<path>src/[\w./+-]+?)(?:(?::|#L)(?P<lo>\d+)(?:-L?(?P<hi>\d+))?)?`")
+QUALNAME_RE = re.compile(r"`(~?[A-Za-z_]\w*(?:::~?[A-Za-z_]\w*)+)(?:\([^`]*\))?`")
+
+
+def trigrams(name: str) -> set[str]:
+    low = name.lower()
+    return {low[i : i + 3] for i in range(len(low) - 2)}
+
+
+def default_db(repo_root: Path) -> Path:
+    return repo_root / ".cache" / "maps" / "symbols.sqlite"
+
+
+def build(occt: Path, db_path: Path, occt_label: str, jobs: int = 0, cache_dir: Path | None = None) -> dict:
+    """(Re)build the index atomically; returns row counts."""
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = db_path.with_name(db_path.name + ".tmp")
+    if tmp.exists():
+        tmp.unlink()
+    con = sqlite3.connect(tmp)
+    try:
+        con.execute("PRAGMA journal_mode=OFF")
+        con.execute("PRAGMA synchronous=OFF")
+        con.executescript(SCHEMA)
+        name_ids: dict[str, int] = {}
+        files, rows = [], []
+        for scanned in scan_tree(occt, jobs, cache_dir, symbols=True):
+            for rel, syms in scanned["symbols"].items():
+                file_id = len(files) + 1
+                files.append((file_id, rel, scanned["pkg"], scanned["stats"][rel][1]))
+                for kind, name, scope, line in syms:
+                    name_id = name_ids.setdefault(name, len(name_ids) + 1)
+                    rows.append((name_id, f"{scope}::{name}" if scope else name, kind, file_id, line))
+        con.executemany("INSERT INTO files VALUES (?, ?, ?, ?)", files)
+        con.executemany("INSERT INTO names VALUES (?, ?)", ((i, n) for n, i in name_ids.items()))
+        con.executemany("INSERT INTO symbols VALUES (?, ?, ?, ?, ?)", rows)
+        con.executemany(
+            "INSERT INTO trigrams VALUES (?, ?)",
+            ((t, i) for n, i in name_ids.items() for t in trigrams(n)),
+        )
+        con.executescript(INDEXES)
+        con.executemany(
+            "INSERT INTO meta VALUES (?, ?)",
+            [("occt_root", occt_label), ("built_at", time.strftime("%Y-%m-%dT%H:%M:%S%z"))],
+        )
+        con.commit()
+    finally:
+        con.close()
+    os.replace(tmp, db_path)
+    return {"files": len(files), "names": len(name_ids), "symbols": len(rows)}
+
+
+class SymbolIndex:
+    """Read-only queries; rows are (qualname, kind, path, line)."""
+
+    _ROW = "SELECT s.qualname, s.kind, f.path, s.line FROM symbols s JOIN files f ON f.id = s.file_id"
+
+    def __init__(self, db_path: Path):
+        if not db_path.is_file():
+            raise FileNotFoundError(f"{db_path}: no symbol index (run `occt_symbols.py build`)")
+        self.con = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+
+    def close(self) -> None:
+        self.con.close()
+
+    def __enter__(self) -> "SymbolIndex":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def meta(self, key: str) -> str | None:
+        row = self.con.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def file_lines(self, path: str) -> int | None:
+        """Line count of an indexed file (`src/...`), or None if it isn't in the index."""
+        row = self.con.execute("SELECT lines FROM files WHERE path = ?", (path,)).fetchone()
+        return row[0] if row else None
+
+    def lookup(self, name: str, limit: int = 50) -> list[tuple]:
+        """Exact match on `Scope::name`, or on the bare name when there is no scope."""
+        if "::" in name:
+            sql = f"{self._ROW} WHERE s.qualname = ? ORDER BY f.path, s.line LIMIT ?"
+        else:
+            sql = f"{self._ROW} JOIN names n ON n.id = s.name_id WHERE n.name = ? ORDER BY f.path, s.line LIMIT ?"
+        return self.con.execute(sql, (name, limit)).fetchall()
+
+    def prefix(self, text: str, limit: int = 50) -> list[tuple]:
+        hi = text + "\U0010ffff"
+        if "::" in text:
+            sql = f"{self._ROW} WHERE s.qualname >= ? AND s.qualname < ? ORDER BY s.qualname, f.path LIMIT ?"
+        else:
+            sql = (
+                f"{self._ROW} JOIN names n ON n.id = s.name_id"
+                " WHERE n.name >= ? AND n.name < ? ORDER BY n.name, s.qualname, f.path LIMIT ?"
+            )
+        return self.con.execute(sql, (text, hi, limit)).fetchall()
+
+    def contains(self, text: str, limit: int = 50) -> list[tuple]:
+        """Case-insensitive substring match on symbol names."""
+        low = text.lower()
+        tris = sorted(trigrams(low))
+        if tris:
+            marks = ",".join("?" * len(tris))
+            name_ids = f"SELECT name_id FROM trigrams WHERE tri IN ({marks}) GROUP BY name_id HAVING COUNT(*) = ?"
+            params: list = [*tris, len(tris)]
+        else:  # shorter than a trigram: plain scan of the (deduplicated) names
+            name_ids, params = "SELECT id FROM names", []
+        sql = (
+            f"{self._ROW} JOIN names n ON n.id = s.name_id"
+            f" WHERE s.name_id IN ({name_ids}) AND instr(lower(n.name), ?) > 0"
+            " ORDER BY n.name, s.qualname, f.path LIMIT ?"
+        )
+        return self.con.execute(sql, (*params, low, limit)).fetchall()
+
+
+def check_anchors(idx: SymbolIndex, paths: list[Path], anchor_prefix: str) -> tuple[list[str], list[str], int]:
+    """
+    Validate `<anchor_prefix>src/...` file anchors (and `:N`/`#LN-LM` line suffixes)
+    plus backticked `Class::member` names on the same lines.
+    Returns (errors, unresolved symbols, anchors checked).
+    """
+    errors, unresolved = [], []
+    n_anchors = 0
+    md_files = [p for root in paths for p in (sorted(root.rglob("*.md")) if root.is_dir() else [root])]
+    for md in md_files:
+        for lineno, line in enumerate(md.read_text(errors="ignore").splitlines(), 1):
+            anchors = [m for m in ANCHOR_RE.finditer(line) if m.group("prefix") == anchor_prefix]
+            if not anchors:
+                continue
+            where = f"{md}:{lineno}"
+            for m in anchors:
+                n_anchors += 1
+                n_lines = idx.file_lines(m.group("path"))
+                if n_lines is None:
+                    errors.append(f"{where}: missing file {anchor_prefix}{m.group('path')}")
+                    continue
+                hi = int(m.group("hi") or m.group("lo") or 0)
+                if hi > n_lines:
+                    errors.append(f"{where}: {m.group('path')} has {n_lines} lines, anchor points at {hi}")
+            for q in QUALNAME_RE.finditer(line):
+                if not idx.lookup(q.group(1), limit=1):
+                    unresolved.append(f"{where}: unresolved symbol {q.group(1)}")
+    return errors, unresolved, n_anchors
+
+
+def print_rows(rows: list[tuple]) -> None:
+    for qualname, kind, path, line in rows:
+        print(f"{qualname}\t{kind}\t{path}:{line}")
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--db", default="", help="index path (default: <repo>/.cache/maps/symbols.sqlite)")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+
+    b = sub.add_parser("build", help="scan the OCCT tree and (re)write the index")
+    b.add_argument("--occt", required=True)
+    b.add_argument("--jobs", type=int, default=0)
+    b.add_argument("--cache_dir", default="", help="scan cache root (default: <repo>/.cache/maps)")
+    b.add_argument("--no_cache", action="store_true")
+
+    q = sub.add_parser("query", help="look up symbols")
+    g = q.add_mutually_exclusive_group(required=True)
+    g.add_argument("--exact")
+    g.add_argument("--prefix")
+    g.add_argument("--contains")
+    q.add_argument("--limit", type=int, default=50)
+
+    c = sub.add_parser("check_anchors", help="validate occt/src/... anchors in markdown")
+    c.add_argument("paths", nargs="*", default=["notes/dossiers"])
+    c.add_argument("--anchor_prefix", default="occt/", help="text before `src/` in anchors")
+    c.add_argument("--strict", action="store_true", help="fail on unresolved Class::member names too")
+    args = ap.parse_args()
+
+    repo_root = Path(__file__).resolve().parents[1]
+    db_path = Path(args.db).resolve() if args.db else default_db(repo_root)
+
+    if args.cmd == "build":
+        t0 = time.perf_counter()
+        occt = Path(args.occt).resolve()
+        try:
+            occt_label = str(occt.relative_to(repo_root))
+        except ValueError:
+            occt_label = str(occt)
+        cache_dir = None
+        if not args.no_cache:
+            cache_root = Path(args.cache_dir).resolve() if args.cache_dir else repo_root / ".cache" / "maps"
+            cache_dir = cache_dir_for(cache_root, occt)
+        counts = build(occt, db_path, occt_label, args.jobs, cache_dir)
+        print(
+            f"[symbols] {counts['symbols']} symbols ({counts['names']} names) in {counts['files']} files"
+            f" -> {db_path} in {time.perf_counter() - t0:.2f}s"
+        )
+        return 0
+
+    with SymbolIndex(db_path) as idx:
+        if args.cmd == "query":
+            if args.exact:
+                rows = idx.lookup(args.exact, args.limit)
+            elif args.prefix:
+                rows = idx.prefix(args.prefix, args.limit)
+            else:
+                rows = idx.contains(args.contains, args.limit)
+            print_rows(rows)
+            return 0 if rows else 1
+
+        t0 = time.perf_counter()
+        errors, unresolved, n_anchors = check_anchors(idx, [Path(p) for p in args.paths], args.anchor_prefix)
+        for msg in errors + unresolved:
+            print(msg)
+        print(
+            f"[symbols] {n_anchors} anchors: {len(errors)} broken, {len(unresolved)} unresolved symbols"
+            f" ({(time.perf_counter() - t0) * 1000:.0f} ms)"
+        )
+        return 1 if errors or (args.strict and unresolved) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,46 +1,255 @@
 #!/usr/bin/env python3
 import argparse
+import codecs
+import gzip
+import hashlib
 import json
 import os
 import re
 import shutil
+import subprocess
 import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
+from typing import Callable
 
 
 LINK_RE = re.compile(r"\]\(([^)]+)\)")
 GENERATED_BANNER_RE = re.compile(
     r"(?m)^_Generated by `tools/gen_overview_pages\.py`\.\s*Edit only inside `MANUAL:\*` blocks\._\s*$\n?"
 )
+# `- describe: \`V7_9_3-12-gabcdef-dirty\`` -> V7_9_3 (empty without a git checkout).
+PROVENANCE_DESCRIBE_RE = re.compile(r"(?m)^- describe: `(V\d+(?:_[A-Za-z0-9]+)*)(?:-\d+-g[0-9a-f]+)?(?:-dirty)?`")
 OCCT_CODE_REF_RE = re.compile(r"(?<!\[)`(occt/src/[^`]+?)`")
 
+# Bump whenever transform_markdown() would produce different output for the same input,
+# so every manifest entry is invalidated and all docs are re-transformed.
+TRANSFORM_VERSION = 2
+MANIFEST_VERSION = 1
+
+
+class SyncManifest:
+    """
+    Persisted record of previous copy_file() runs (`<site>/.sync_tmp/manifest.json`).
+
+    Per destination it keeps the source fingerprint (mtime/size + sha1), a key for
+    the transform inputs (paths, OCCT tag, TRANSFORM_VERSION) and the destination's
+    sha1/mtime/size. When all still match, the transform and the destination read
+    are both skipped; source bytes are only hashed when their mtime/size changed.
+    """
+
+    def __init__(self, path: Path, site_root: Path):
+        self.path = path
+        self.site_root = site_root
+        self.entries: dict[str, dict] = {}
+        self.seen: set[str] = set()
+        self.dirty = False
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except Exception:
+            return
+        if isinstance(data, dict) and data.get("version") == MANIFEST_VERSION:
+            self.entries = data.get("files") or {}
+
+    def _key(self, dst: Path) -> str:
+        return dst.relative_to(self.site_root).as_posix()
+
+    def source_hash(self, src: Path, dst: Path) -> tuple[os.stat_result, str]:
+        st = src.stat()
+        entry = self.entries.get(self._key(dst))
+        if entry and entry.get("src_mtime_ns") == st.st_mtime_ns and entry.get("src_size") == st.st_size:
+            return st, entry["src_sha1"]
+        return st, hashlib.sha1(src.read_bytes()).hexdigest()
+
+    def is_fresh(self, dst: Path, src_st: os.stat_result, src_sha1: str, transform_key: str) -> bool:
+        key = self._key(dst)
+        self.seen.add(key)
+        entry = self.entries.get(key)
+        if not entry or entry.get("src_sha1") != src_sha1 or entry.get("transform") != transform_key:
+            return False
+        try:
+            st = dst.stat()
+        except OSError:
+            return False
+        if entry.get("dst_mtime_ns") != st.st_mtime_ns or entry.get("dst_size") != st.st_size:
+            return False
+        if entry.get("src_mtime_ns") != src_st.st_mtime_ns:
+            # Touched but unchanged source: remember the new mtime so it isn't rehashed.
+            entry["src_mtime_ns"] = src_st.st_mtime_ns
+            self.dirty = True
+        return True
+
+    def record(self, dst: Path, src_st: os.stat_result, src_sha1: str, transform_key: str, data: bytes) -> None:
+        st = dst.stat()
+        self.entries[self._key(dst)] = {
+            "src_mtime_ns": src_st.st_mtime_ns,
+            "src_size": src_st.st_size,
+            "src_sha1": src_sha1,
+            "transform": transform_key,
+            "dst_sha1": hashlib.sha1(data).hexdigest(),
+            "dst_mtime_ns": st.st_mtime_ns,
+            "dst_size": st.st_size,
+        }
+        self.dirty = True
+
+    def forget(self, dst: Path) -> None:
+        if self.entries.pop(self._key(dst), None) is not None:
+            self.dirty = True
+
+    def save(self, prune: bool = True) -> None:
+        # Forget destinations that were not produced by this run (removed sources).
+        # Watch-mode batches touch a few docs at a time and forget() removals explicitly.
+        stale = set(self.entries) - self.seen if prune else set()
+        for key in stale:
+            del self.entries[key]
+        if not (self.dirty or stale):
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        tmp.write_text(
+            json.dumps({"version": MANIFEST_VERSION, "files": self.entries}, separators=(",", ":")),
+            encoding="utf-8",
+        )
+        os.replace(tmp, self.path)
+        self.dirty = False
+
+
+def transform_key(*, src_rel: str, dst_rel: str, occt_tag: str) -> str:
+    return f"{TRANSFORM_VERSION}:{occt_tag}:{src_rel}:{dst_rel}"
+
+
+def read_golden_version(path: Path, chunk: int = 4096) -> str:
+    """
+    OCCT version recorded in a repro oracle: meta.occt_version, else top-level occt_version.
+
+    Decodes top-level members from the front of the file and stops at `meta`, so a
+    large oracle is only read up to its header. Returns "" when there is none;
+    raises ValueError on malformed JSON before that point.
+    """
+    decoder = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    with open(path, "rb") as f:
+        buf = ""
+        eof = False
+
+        def fill() -> bool:
+            nonlocal buf, eof
+            if eof:
+                return False
+            more = f.read(max(chunk, len(buf)))
+            eof = not more
+            buf += utf8.decode(more, final=eof)
+            return not eof
+
+        def token(i: int) -> int:
+            # Index of the next non-whitespace character, reading ahead as needed.
+            while True:
+                while i < len(buf) and buf[i] in " \t\r\n":
+                    i += 1
+                if i < len(buf) or not fill():
+                    return i
+
+        def value(i: int):
+            # A value ending exactly at the buffer end may be a truncated number.
+            while True:
+                try:
+                    v, end = decoder.raw_decode(buf, i)
+                    if end < len(buf) or eof:
+                        return v, end
+                except json.JSONDecodeError:
+                    if eof:
+                        raise
+                fill()
+
+        fallback = ""
+        pos = token(0)
+        if buf[pos : pos + 1] != "{":
+            return ""
+        pos += 1
+        while True:
+            pos = token(pos)
+            if buf[pos : pos + 1] != '"':
+                return fallback
+            key, pos = value(pos)
+            pos = token(pos)
+            if buf[pos : pos + 1] != ":":
+                raise ValueError(f"{path}: expected ':' after {key!r}")
+            v, pos = value(token(pos + 1))
+            if key == "meta" and isinstance(v, dict):
+                version = str(v.get("occt_version") or "").strip()
+                if version:
+                    return version
+            elif key == "occt_version":
+                fallback = str(v or "").strip()
+            pos = token(pos)
+            if buf[pos : pos + 1] != ",":
+                return fallback
+            pos += 1
+
+
+def tag_from_provenance(repo_root: Path) -> str:
+    """OCCT tag from the `describe:` line gen_maps writes to notes/maps/provenance.md, if any."""
+    try:
+        text = (repo_root / "notes" / "maps" / "provenance.md").read_text(encoding="utf-8", errors="replace")
+    except OSError:
+        return ""
+    m = PROVENANCE_DESCRIBE_RE.search(text)
+    return m.group(1) if m else ""
+
 
 def detect_occt_tag(repo_root: Path) -> str:
     """
-    Best-effort: extract an OCCT tag from any repro oracle JSON.
-    Prefers meta.occt_version, falls back to top-level occt_version.
+    Best-effort OCCT tag for source links.
+
+    Order: the maps provenance (`git describe` of the checkout), then the repro
+    oracles (meta.occt_version, falling back to top-level occt_version). The oracle
+    scan is cached in `.cache/site/occt_tag.json`, keyed on the golden files'
+    paths, mtimes and sizes, and only reads each oracle up to its `meta` header.
     """
-    for p in sorted((repo_root / "repros").glob("*/golden/*.json")):
+    tag = tag_from_provenance(repo_root)
+    if tag:
+        return tag
+
+    goldens = sorted((repo_root / "repros").glob("*/golden/*.json"))
+    key = []
+    for p in goldens:
+        try:
+            st = p.stat()
+        except OSError:
+            continue
+        key.append([p.relative_to(repo_root).as_posix(), st.st_mtime_ns, st.st_size])
+    cache = repo_root / ".cache" / "site" / "occt_tag.json"
+    try:
+        cached = json.loads(cache.read_text(encoding="utf-8"))
+        if cached.get("key") == key:
+            return cached["tag"]
+    except Exception:
+        pass
+
+    tag = "master"
+    for p in goldens:
         try:
-            obj = json.loads(p.read_text(encoding="utf-8", errors="replace"))
+            version = read_golden_version(p)
         except Exception:
             continue
-        version = ""
-        if isinstance(obj, dict):
-            meta = obj.get("meta")
-            if isinstance(meta, dict):
-                version = str(meta.get("occt_version") or "")
-            if not version:
-                version = str(obj.get("occt_version") or "")
-        version = version.strip()
         if version:
             # OCCT tags are named like V7_9_3.
-            return "V" + version.replace(".", "_")
-    # Fall back to a reasonable default; links are still useful even if the tag isn't exact.
-    return "master"
+            tag = "V" + version.replace(".", "_")
+            break
+    # Otherwise fall back to a reasonable default; links are still useful even if the tag isn't exact.
+    try:
+        cache.parent.mkdir(parents=True, exist_ok=True)
+        cache.write_text(json.dumps({"key": key, "tag": tag}) + "\n", encoding="utf-8")
+    except OSError:
+        pass
+    return tag
 
 
-def link_occt_code_refs(md: str, *, occt_tag: str) -> str:
+def occt_code_ref_repl(occt_tag: str):
+    """re.sub replacement for OCCT_CODE_REF_RE: `occt/src/...` -> upstream GitHub link."""
     base = f"https://github.com/Open-Cascade-SAS/OCCT/blob/{occt_tag}/"
 
     def repl(match: re.Match[str]) -> str:
@@ -61,12 +270,12 @@ def link_occt_code_refs(md: str, *, occt_tag: str) -> str:
         url = base + rel + suffix
         return f"[`{raw}`]({url})"
 
-    return OCCT_CODE_REF_RE.sub(repl, md)
+    return repl
 
 
-def rewrite_internal_markdown_links(md: str, *, from_rel: str) -> str:
+def internal_link_repl(from_rel: str):
     """
-    Rewrite markdown links for Starlight:
+    re.sub replacement for LINK_RE that rewrites markdown links for Starlight:
     - Convert .md -> trailing slash routes
     - Convert */README.md -> */readme/
     - Rewrite repo-root style links (notes/.../foo.md) into correct relative links
@@ -124,42 +333,266 @@ def rewrite_internal_markdown_links(md: str, *, from_rel: str) -> str:
         target = match.group(1).strip()
         return f"]({rewrite_target(target)})"
 
-    return LINK_RE.sub(repl, md)
+    return repl
+
+
+_BANNER_PREFIX = "_Generated by `tools/gen_overview_pages.py`."
+_BANNER_LINE_RE = re.compile(GENERATED_BANNER_RE.pattern.replace("(?m)^", "").replace("$\\n?", ""))
+
+
+# Lines some stage may change start with one of these (headings, frontmatter fences,
+# the generated banner) or contain one of the inline triggers (links, OCCT code refs).
+_LINE_PREFIXES = ("#", "---\n", "_Generated by ")
+_INLINE_TRIGGERS = ("](", "`occt/src/")
+_LEADING_BLANK_LINES_RE = re.compile(r"(?:[^\S\n]*\n)*(?:[^\S\n]+\Z)?")
+_INDENTED_H1_RE = re.compile(r"(?m)^[^\S\n]+# .*$")
 
 
-def strip_section(md: str, heading: str) -> str:
+def _tokenize(text: str) -> list[tuple[bool, str]]:
     """
-    Remove a markdown section by exact heading line (e.g. "## Backlog tasks"),
-    up to (but not including) the next heading of same or higher level.
+    Split `text` into (special, chunk) tokens: single lines some stage may change, and
+    the runs of plain lines between them. Located with str.find, so plain text costs
+    no per-line Python work.
     """
-    lines = md.splitlines(keepends=True)
-    i = 0
-    while i < len(lines):
-        if lines[i].rstrip("\n") != heading:
-            i += 1
+    starts = {0} if text.startswith(_LINE_PREFIXES) else set()
+    for prefix in _LINE_PREFIXES:
+        i = text.find("\n" + prefix)
+        while i != -1:
+            starts.add(i + 1)
+            i = text.find("\n" + prefix, i + 1)
+    for trigger in _INLINE_TRIGGERS:
+        i = text.find(trigger)
+        while i != -1:
+            starts.add(text.rfind("\n", 0, i) + 1)
+            eol = text.find("\n", i)
+            i = -1 if eol == -1 else text.find(trigger, eol)
+
+    tokens = []
+    pos = 0
+    for start in sorted(starts):
+        if start > pos:
+            tokens.append((False, text[pos:start]))
+        eol = text.find("\n", start)
+        pos = len(text) if eol == -1 else eol + 1
+        tokens.append((True, text[start:pos]))
+    if pos < len(text):
+        tokens.append((False, text[pos:]))
+    return tokens
+
+
+def _title(tokens: list[tuple[bool, str]]) -> str:
+    """Text of the first line whose stripped form starts with `# ` ("" if none)."""
+    for special, chunk in tokens:
+        if special:
+            line = chunk.strip()
+            if line.startswith("# "):
+                return line[2:].strip()
+            continue
+        for m in _INDENTED_H1_RE.finditer(chunk):
+            line = m.group().strip()
+            if line.startswith("# "):
+                return line[2:].strip()
+    return ""
+
+
+def _inline_stage(tokens, *, from_rel: str, occt_tag: str):
+    """Link rewrites and OCCT code refs, one special line at a time."""
+    link_repl = internal_link_repl(from_rel)
+    code_repl = occt_code_ref_repl(occt_tag)
+    for special, line in tokens:
+        if special:
+            # Link targets and code refs never span lines (CommonMark link destinations can't).
+            if "](" in line:
+                line = LINK_RE.sub(link_repl, line)
+            if "`occt/src/" in line:
+                line = OCCT_CODE_REF_RE.sub(code_repl, line)
+        yield special, line
+
+
+def _banner_stage(tokens):
+    """GENERATED_BANNER_RE: the banner line and the blank lines after it."""
+    dropping = False
+    for special, chunk in tokens:
+        if dropping:
+            if not special:
+                chunk = chunk[_LEADING_BLANK_LINES_RE.match(chunk).end() :]
+                if not chunk:
+                    continue
+            dropping = False
+        if special and chunk.startswith(_BANNER_PREFIX) and _BANNER_LINE_RE.fullmatch(chunk):
+            dropping = True
+            continue
+        yield special, chunk
+
+
+def _section_stage(tokens, heading: str):
+    """Drop the `heading` section up to the next heading of the same or higher level."""
+    level = len(heading.split(" ", 1)[0])
+    skipping = False
+    for special, line in tokens:
+        if skipping:
+            if not (special and line.startswith("#")):
+                continue
+            hashes = len(line) - len(line.lstrip("#"))
+            if hashes > level or line[hashes : hashes + 1] != " ":
+                continue
+            skipping = False
+        if special and line.rstrip("\n") == heading:
+            skipping = True
+            continue
+        yield special, line
+
+
+def _first_h1_stage(tokens: list[tuple[bool, str]]):
+    """Drop the first `# ` line after the frontmatter, plus one blank line after it."""
+    if tokens[:1] != [(True, "---\n")]:
+        yield from tokens
+        return
+    # The closing fence must be at least the third line (cf. `text.find("\n---\n", 4)`).
+    start = 2 if tokens[1:2] == [(True, "---\n")] else 1
+    end = next((j for j in range(start, len(tokens)) if tokens[j] == (True, "---\n")), None)
+    if end is None:
+        yield from tokens
+        return
+    yield from tokens[: end + 1]
+    it = iter(tokens[end + 1 :])
+    for special, line in it:
+        if special and line.startswith("# "):
+            nxt = next(it, None)
+            if nxt is not None:
+                special, chunk = nxt
+                if not special:
+                    first, sep, rest = chunk.partition("\n")
+                    if first.strip() == "":
+                        chunk = rest
+                    if chunk:
+                        yield special, chunk
+                elif chunk.strip() != "":
+                    yield nxt
+            break
+        yield special, line
+    yield from it
+
+
+def transform_markdown(text: str, *, src_rel: str, dst_rel: str, occt_tag: str) -> str:
+    """
+    Repo markdown -> Starlight page text (pure; safe to run in worker processes).
+
+    Line endings are normalized to "\n" (CommonMark's \r\n and \r included), then
+    the text is split once into the lines a stage may change and opaque runs of
+    plain lines. Those tokens flow through chained stages: inline rewrites,
+    generated banner, hub sections, frontmatter title, first H1, "## Backlog tasks".
+    Only the frontmatter title needs the whole document, so tokens are collected
+    once before it. Every rewrite is line-local; tools/bench_site_transform.py
+    checks the result against the older whole-document regex passes.
+    """
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    # A stage is only chained in when its trigger occurs in the text; the inline
+    # rewrites can't create a line any later stage matches on.
+    tokens = _tokenize(text)
+    if any(trigger in text for trigger in _INLINE_TRIGGERS):
+        tokens = _inline_stage(tokens, from_rel=dst_rel, occt_tag=occt_tag)
+    if _BANNER_PREFIX in text:
+        tokens = _banner_stage(tokens)
+    if src_rel.startswith("maps/hub-"):
+        # Hubs are generated index pages; keep the “meat” and drop redundant artifact pointers.
+        for heading in ("## Artifacts", "## Backlog"):
+            if heading in text:
+                tokens = _section_stage(tokens, heading)
+    tokens = list(tokens)
+
+    if tokens[:1] != [(True, "---\n")]:
+        title = _title(tokens)
+        if not title:
+            title = Path(dst_rel).stem.replace("-", " ").strip() or "Document"
+        # YAML frontmatter accepts JSON scalars; JSON encoding avoids quoting pitfalls.
+        fm = ["---\n", f"title: {json.dumps(title)}\n", "---\n", "\n"]
+        tokens[:0] = [(True, line) for line in fm]
+
+    # Starlight renders the frontmatter title as the page heading; backlog tracking stays out of the site.
+    tokens = _first_h1_stage(tokens)
+    if "## Backlog tasks" in text:
+        tokens = _section_stage(tokens, "## Backlog tasks")
+    return "".join([chunk for _, chunk in tokens])
+
+
+def _transform_job(job: tuple[str, str, str, str]) -> str:
+    src, src_rel, dst_rel, occt_tag = job
+    text = Path(src).read_text(encoding="utf-8", errors="replace")
+    return transform_markdown(text, src_rel=src_rel, dst_rel=dst_rel, occt_tag=occt_tag)
+
+
+@dataclass(frozen=True)
+class DocJob:
+    src: Path
+    dst: Path
+    src_rel: str
+    dst_rel: str
+
+
+def glob_docs(root: Path, pattern: str, dest_root: Path, *, dst_rel_prefix: str = "") -> list[DocJob]:
+    docs = []
+    for src in sorted(root.glob(pattern)):
+        if not src.is_file():
             continue
+        rel = src.relative_to(root)
+        docs.append(
+            DocJob(
+                src,
+                dest_root / rel,
+                str(rel),
+                str((Path(dst_rel_prefix) / rel).as_posix()) if dst_rel_prefix else str(rel),
+            )
+        )
+    return docs
+
+
+# Below this many stale docs a pool costs more to start than it saves.
+PARALLEL_MIN_DOCS = 16
+
+
+def sync_docs(
+    docs: list[DocJob],
+    *,
+    tmp_root: Path,
+    occt_tag: str,
+    keep: set[Path] | None = None,
+    manifest: SyncManifest | None = None,
+    jobs: int = 1,
+) -> int:
+    """
+    Transform and write `docs`. Freshness checks and all writes happen in this
+    process in `docs` order; only the transforms fan out to a process pool
+    (`jobs` > 1, or 0 = one per CPU), so output and `keep` match the serial path.
+    """
+    stale: list[tuple[DocJob, tuple | None]] = []
+    for doc in docs:
+        if manifest is not None:
+            t_key = transform_key(src_rel=doc.src_rel, dst_rel=doc.dst_rel, occt_tag=occt_tag)
+            src_st, src_sha1 = manifest.source_hash(doc.src, doc.dst)
+            if manifest.is_fresh(doc.dst, src_st, src_sha1, t_key):
+                if keep is not None:
+                    keep.add(doc.dst.resolve())
+                continue
+            stale.append((doc, (src_st, src_sha1, t_key)))
+        else:
+            stale.append((doc, None))
+
+    work = [(str(doc.src), doc.src_rel, doc.dst_rel, occt_tag) for doc, _ in stale]
+    if jobs <= 0:
+        jobs = os.cpu_count() or 1
+    if jobs > 1 and len(work) >= PARALLEL_MIN_DOCS:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            texts = list(pool.map(_transform_job, work, chunksize=4))
+    else:
+        texts = [_transform_job(w) for w in work]
 
-        level = len(heading.split(" ", 1)[0])  # number of '#'
-        start = i
-        i += 1
-        while i < len(lines):
-            line = lines[i]
-            if line.startswith("#"):
-                hashes = len(line) - len(line.lstrip("#"))
-                if hashes <= level and line[hashes : hashes + 1] == " ":
-                    break
-            i += 1
-
-        del lines[start:i]
-        # trim extra blank lines where the section was removed
-        while start < len(lines) and lines[start].strip() == "":
-            del lines[start]
-        if start > 0 and lines[start - 1].strip() == "":
-            while start < len(lines) and lines[start].strip() == "":
-                del lines[start]
-        i = start
-
-    return "".join(lines)
+    for (doc, fingerprint), text in zip(stale, texts):
+        write_text_atomic(doc.dst, text, tmp_root=tmp_root, keep=keep)
+        if manifest is not None:
+            manifest.record(doc.dst, *fingerprint, text.encode("utf-8"))
+    return len(docs)
 
 
 def copy_file(
@@ -171,86 +604,11 @@ def copy_file(
     dst_rel: str,
     occt_tag: str,
     keep: set[Path] | None = None,
+    manifest: SyncManifest | None = None,
 ) -> None:
-    dst.parent.mkdir(parents=True, exist_ok=True)
-    text = src.read_text(encoding="utf-8", errors="replace")
-    text = rewrite_internal_markdown_links(text, from_rel=dst_rel)
-    text = link_occt_code_refs(text, occt_tag=occt_tag)
-
-    # Site-specific cleanup for generated scaffolding.
-    text = GENERATED_BANNER_RE.sub("", text)
-    if src_rel.startswith("maps/hub-"):
-        # Hubs are generated index pages; keep the “meat” and drop redundant artifact pointers.
-        text = strip_section(text, "## Artifacts")
-        text = strip_section(text, "## Backlog")
-
-    if not text.startswith("---\n"):
-        title = None
-        for line in text.splitlines():
-            line = line.strip()
-            if line.startswith("# "):
-                title = line[len("# ") :].strip()
-                break
-        if not title:
-            title = dst.stem.replace("-", " ").strip() or "Document"
-        # YAML frontmatter accepts JSON scalars; JSON encoding avoids quoting pitfalls.
-        text = f"---\ntitle: {json.dumps(title)}\n---\n\n{text}"
-
-    # Starlight will render the frontmatter title as the page heading.
-    # Many repo docs also include an H1 (`# ...`) as the first line, which would
-    # otherwise show the title twice. Strip the first H1 after frontmatter.
-    if text.startswith("---\n"):
-        end = text.find("\n---\n", 4)
-        if end != -1:
-            frontmatter = text[: end + len("\n---\n")]
-            body = text[end + len("\n---\n") :]
-            body_lines = body.splitlines(keepends=True)
-            for i, line in enumerate(body_lines):
-                if line.startswith("# "):
-                    del body_lines[i]
-                    if i < len(body_lines) and body_lines[i].strip() == "":
-                        del body_lines[i]
-                    body = "".join(body_lines)
-                    text = frontmatter + body
-                    break
-
-    # Site-specific pruning: keep backlog tracking out of the rendered docs.
-    text = strip_section(text, "## Backlog tasks")
-
-    # Avoid touching the file if nothing changed; helps Astro watchers and keeps diffs clean.
-    if dst.is_file():
-        try:
-            existing = dst.read_text(encoding="utf-8", errors="replace")
-        except Exception:
-            existing = None
-        if existing == text:
-            if keep is not None:
-                keep.add(dst.resolve())
-            return
-
-    # Write atomically to avoid transient partial reads during Astro's file-watching.
-    # Keep temp files OUT of the docs tree so Starlight doesn't accidentally index them.
-    tmp_root.mkdir(parents=True, exist_ok=True)
-    target_mode = 0o644
-    tmp_path = None
-    try:
-        with tempfile.NamedTemporaryFile(
-            mode="w",
-            encoding="utf-8",
-            dir=tmp_root,
-            prefix="sync-",
-            suffix=".tmp",
-            delete=False,
-        ) as f:
-            tmp_path = Path(f.name)
-            f.write(text)
-        os.chmod(tmp_path, target_mode)
-        os.replace(tmp_path, dst)
-        if keep is not None:
-            keep.add(dst.resolve())
-    finally:
-        if tmp_path and tmp_path.exists():
-            tmp_path.unlink(missing_ok=True)
+    sync_docs(
+        [DocJob(src, dst, src_rel, dst_rel)], tmp_root=tmp_root, occt_tag=occt_tag, keep=keep, manifest=manifest
+    )
 
 
 def copy_glob(
@@ -262,23 +620,17 @@ def copy_glob(
     occt_tag: str,
     dst_rel_prefix: str = "",
     keep: set[Path] | None = None,
+    manifest: SyncManifest | None = None,
+    jobs: int = 1,
 ) -> int:
-    count = 0
-    for src in sorted(root.glob(pattern)):
-        if not src.is_file():
-            continue
-        rel = src.relative_to(root)
-        copy_file(
-            src,
-            dest_root / rel,
-            tmp_root=tmp_root,
-            src_rel=str(rel),
-            dst_rel=str((Path(dst_rel_prefix) / rel).as_posix()) if dst_rel_prefix else str(rel),
-            occt_tag=occt_tag,
-            keep=keep,
-        )
-        count += 1
-    return count
+    return sync_docs(
+        glob_docs(root, pattern, dest_root, dst_rel_prefix=dst_rel_prefix),
+        tmp_root=tmp_root,
+        occt_tag=occt_tag,
+        keep=keep,
+        manifest=manifest,
+        jobs=jobs,
+    )
 
 
 def write_text_atomic(dst: Path, text: str, *, tmp_root: Path, keep: set[Path] | None = None) -> None:
@@ -352,12 +704,108 @@ def write_bytes_atomic(dst: Path, data: bytes, *, tmp_root: Path, keep: set[Path
             tmp_path.unlink(missing_ok=True)
 
 
-def sync_tree(src_root: Path, dst_root: Path, *, tmp_root: Path) -> None:
+FICLONE = 0x40049409  # linux/fs.h: _IOW(0x94, 9, int)
+LINK_MODES = ("auto", "reflink", "hardlink", "copy")
+
+
+def _reflink(src: Path, dst: Path) -> bool:
+    try:
+        import fcntl
+    except ImportError:
+        return False
+    try:
+        with open(src, "rb") as fs, open(dst, "wb") as fd:
+            fcntl.ioctl(fd.fileno(), FICLONE, fs.fileno())
+        return True
+    except OSError:
+        dst.unlink(missing_ok=True)
+        return False
+
+
+@lru_cache(maxsize=None)
+def _git_tracked(top: Path) -> frozenset[Path] | None:
+    try:
+        out = subprocess.run(["git", "-C", str(top), "ls-files", "-z"], capture_output=True, check=True).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return frozenset(top / rel for rel in out.decode("utf-8", "surrogateescape").split("\0") if rel)
+
+
+def _is_tracked(src: Path) -> bool:
+    """Whether git tracks `src`; inside a checkout git can't list, assume it does."""
+    src = src.resolve()
+    top = next((p for p in src.parents if (p / ".git").exists()), None)
+    if top is None:
+        return False
+    tracked = _git_tracked(top)
+    return tracked is None or src in tracked
+
+
+def mirror_file(src: Path, dst: Path, *, tmp_root: Path, mode: str = "auto") -> str:
+    """
+    Make `dst` a copy of `src`; returns how: "fresh", "reflink", "hardlink" or "copy".
+
+    `dst` is fresh when it is the same inode as `src` or matches its size and mtime
+    (mirrored files get the source mtime). Otherwise it is replaced atomically by a
+    copy-on-write reflink, else a byte copy; `mode` pins one method (falling back to
+    "copy"). "hardlink" is opt-in and skips git-tracked sources: a tool rewriting
+    the published file in place would otherwise rewrite the committed one.
+    """
+    st = src.stat()
+    try:
+        dst_st = dst.stat()
+    except OSError:
+        dst_st = None
+    if dst_st is not None and (
+        (dst_st.st_ino, dst_st.st_dev) == (st.st_ino, st.st_dev)
+        or (dst_st.st_size, dst_st.st_mtime_ns) == (st.st_size, st.st_mtime_ns)
+    ):
+        return "fresh"
+
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    tmp_root.mkdir(parents=True, exist_ok=True)
+    fd, name = tempfile.mkstemp(dir=tmp_root, prefix="sync-", suffix=".tmp")
+    os.close(fd)
+    tmp = Path(name)
+    try:
+        how = "copy"
+        if mode in ("auto", "reflink") and _reflink(src, tmp):
+            how = "reflink"
+        elif mode == "hardlink" and not _is_tracked(src):
+            tmp.unlink(missing_ok=True)
+            try:
+                os.link(src, tmp)
+                how = "hardlink"
+            except OSError:
+                pass
+        if how == "copy":
+            shutil.copyfile(src, tmp)
+        if how != "hardlink":
+            os.chmod(tmp, 0o644)
+            os.utime(tmp, ns=(st.st_atime_ns, st.st_mtime_ns))
+        os.replace(tmp, dst)
+        return how
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
+def sync_tree(
+    src_root: Path,
+    dst_root: Path,
+    *,
+    tmp_root: Path,
+    mode: str = "auto",
+    on_file: Callable[[Path, Path], list[Path]] | None = None,
+) -> dict[str, int]:
     """
-    Mirror a directory tree into dst_root, copying only changed files and deleting stale files.
+    Mirror a directory tree into dst_root, touching only changed files (see mirror_file)
+    and deleting stale files. `on_file(src, dst)` runs after each file is mirrored and
+    returns extra files it wrote under dst_root (kept by the stale-file sweep).
+    Returns {method: file count}.
     """
+    counts: dict[str, int] = {}
     if not src_root.is_dir():
-        return
+        return counts
 
     want: set[str] = set()
     for src in src_root.rglob("*"):
@@ -365,10 +813,13 @@ def sync_tree(src_root: Path, dst_root: Path, *, tmp_root: Path) -> None:
             continue
         rel = src.relative_to(src_root).as_posix()
         want.add(rel)
-        write_bytes_atomic(dst_root / rel, src.read_bytes(), tmp_root=tmp_root)
+        how = mirror_file(src, dst_root / rel, tmp_root=tmp_root, mode=mode)
+        counts[how] = counts.get(how, 0) + 1
+        if on_file is not None:
+            want.update(p.relative_to(dst_root).as_posix() for p in on_file(src, dst_root / rel))
 
     if not dst_root.exists():
-        return
+        return counts
 
     for dst in dst_root.rglob("*"):
         if not dst.is_file():
@@ -376,6 +827,153 @@ def sync_tree(src_root: Path, dst_root: Path, *, tmp_root: Path) -> None:
         rel = dst.relative_to(dst_root).as_posix()
         if rel not in want:
             dst.unlink()
+    return counts
+
+
+def _brotli():
+    try:
+        import brotli  # optional: pip install brotli
+    except ImportError:
+        return None
+    return brotli
+
+
+class OraclePublisher:
+    """
+    Publish every lane's repro oracles (`repros/<lane>/golden/*.json`) to
+    `public/occt/oracles/` and its `golden/artifacts/` tree to
+    `public/occt/artifacts/<lane without "lane-">/`.
+
+    Each JSON file and mesh-v2 buffer (`*.mesh.bin`) also gets precompressed `.gz` (and `.br` when the optional
+    `brotli` module is installed) siblings for hosts that serve them directly.
+    Per lane, `oracles/<slug>.manifest.json` lists every published file's URL,
+    byte size, sha256 and compressed sizes, and `oracles/index.json` lists the
+    lanes, so explorers can version URLs by content hash and let the browser cache
+    them. Hashes are cached in `.sync_tmp/oracle_hashes.json` on size+mtime.
+    """
+
+    def __init__(self, site_root: Path, tmp_root: Path, *, link_mode: str = "auto"):
+        self.public = site_root / "public"
+        self.tmp_root = tmp_root
+        self.link_mode = link_mode
+        self.brotli = _brotli()
+        self.cache_path = tmp_root / "oracle_hashes.json"
+        try:
+            self.cache: dict[str, list] = json.loads(self.cache_path.read_text(encoding="utf-8"))
+        except Exception:
+            self.cache = {}
+        self.files: dict[str, dict] = {}
+
+    def _sha256(self, src: Path, st: os.stat_result) -> str:
+        key = str(src)
+        hit = self.cache.get(key)
+        if hit and hit[0] == st.st_size and hit[1] == st.st_mtime_ns:
+            return hit[2]
+        h = hashlib.sha256()
+        with open(src, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                h.update(block)
+        self.cache[key] = [st.st_size, st.st_mtime_ns, h.hexdigest()]
+        return h.hexdigest()
+
+    def _compressed(self, src: Path, dst: Path, st: os.stat_result) -> tuple[list[Path], dict[str, int]]:
+        """Write stale `.gz`/`.br` siblings of `dst`; they carry the source mtime like mirror_file."""
+        encoders = [("gzip", ".gz", lambda b: gzip.compress(b, 9, mtime=0))]
+        if self.brotli is not None:
+            encoders.append(("br", ".br", lambda b: self.brotli.compress(b, quality=11)))
+        data = None
+        written, sizes = [], {}
+        for name, ext, encode in encoders:
+            out = dst.with_name(dst.name + ext)
+            try:
+                out_st = out.stat()
+                fresh = out_st.st_mtime_ns == st.st_mtime_ns
+            except OSError:
+                fresh = False
+            if not fresh:
+                if data is None:
+                    data = src.read_bytes()
+                write_bytes_atomic(out, encode(data), tmp_root=self.tmp_root)
+                os.utime(out, ns=(st.st_atime_ns, st.st_mtime_ns))
+                out_st = out.stat()
+            written.append(out)
+            sizes[name] = out_st.st_size
+        return written, sizes
+
+    def _publish(self, src: Path, dst: Path) -> list[Path]:
+        """Record `dst` (already mirrored) in the manifest; returns its compressed siblings."""
+        st = src.stat()
+        entry = {"bytes": st.st_size, "sha256": self._sha256(src, st)}
+        extra: list[Path] = []
+        if dst.suffix == ".json" or dst.name.endswith(".mesh.bin"):
+            extra, entry["encodings"] = self._compressed(src, dst, st)
+        self.files["/" + dst.relative_to(self.public).as_posix()] = entry
+        return extra
+
+    def publish_lane(self, lane_dir: Path) -> dict:
+        slug = lane_dir.name[len("lane-") :] if lane_dir.name.startswith("lane-") else lane_dir.name
+        golden = lane_dir / "golden"
+        self.files = {}
+        oracles = []
+        for src in sorted(golden.glob("*.json")):
+            dst = self.public / "occt" / "oracles" / src.name
+            mirror_file(src, dst, tmp_root=self.tmp_root, mode=self.link_mode)
+            self._publish(src, dst)
+            oracles.append("/" + dst.relative_to(self.public).as_posix())
+        artifacts = self.public / "occt" / "artifacts" / slug
+        sync_tree(golden / "artifacts", artifacts, tmp_root=self.tmp_root, mode=self.link_mode, on_file=self._publish)
+        manifest = {"lane": lane_dir.name, "oracles": oracles, "files": dict(sorted(self.files.items()))}
+        write_text_atomic(
+            self.public / "occt" / "oracles" / f"{slug}.manifest.json",
+            json.dumps(manifest, indent=2) + "\n",
+            tmp_root=self.tmp_root,
+        )
+        return manifest
+
+    def publish_all(self, repo_root: Path) -> dict[str, dict]:
+        """
+        Publish every lane with golden JSON; prune outputs of lanes/oracles that are gone.
+        Raises ValueError, before writing anything, if two lanes' oracles would share a
+        file in the flat `oracles/` directory (or clash with the index/manifests).
+        """
+        lane_dirs = [d for d in sorted((repo_root / "repros").glob("lane-*")) if any((d / "golden").glob("*.json"))]
+        owners: dict[str, list[str]] = {}
+        for lane_dir in lane_dirs:
+            for src in (lane_dir / "golden").glob("*.json"):
+                owners.setdefault(src.name, []).append(lane_dir.name)
+        clashes = [
+            f"{name} ({', '.join(who)})"
+            for name, who in sorted(owners.items())
+            if len(who) > 1 or name == "index.json" or name.endswith(".manifest.json")
+        ]
+        if clashes:
+            raise ValueError(f"conflicting oracle names under public/occt/oracles/: {'; '.join(clashes)}")
+
+        lanes = {}
+        for lane_dir in lane_dirs:
+            lanes[lane_dir.name] = self.publish_lane(lane_dir)
+        index = {
+            lane: {"manifest": f"/occt/oracles/{lane[len('lane-'):]}.manifest.json", "oracles": m["oracles"]}
+            for lane, m in lanes.items()
+        }
+        oracles_dir = self.public / "occt" / "oracles"
+        write_text_atomic(oracles_dir / "index.json", json.dumps(index, indent=2) + "\n", tmp_root=self.tmp_root)
+
+        keep = {"index.json"} | {Path(e["manifest"]).name for e in index.values()}
+        for m in lanes.values():
+            for url in m["oracles"]:
+                name = Path(url).name
+                keep.update((name, name + ".gz", name + ".br"))
+        for p in oracles_dir.iterdir():
+            if p.is_file() and p.name not in keep:
+                p.unlink()
+        for p in (self.public / "occt" / "artifacts").iterdir() if (self.public / "occt" / "artifacts").is_dir() else ():
+            if p.is_dir() and f"lane-{p.name}" not in lanes:
+                shutil.rmtree(p)
+
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        self.cache_path.write_text(json.dumps(self.cache, separators=(",", ":")), encoding="utf-8")
+        return lanes
 
 
 def write_fillets_oracle_explorer(
@@ -387,23 +985,11 @@ def write_fillets_oracle_explorer(
     occt_tag: str,
     keep: set[Path] | None = None,
 ) -> None:
+    # The oracle and its artifacts are published by OraclePublisher.
     oracle_path = repo_root / "repros" / "lane-fillets" / "golden" / "fillets.json"
     if not oracle_path.is_file():
         return
 
-    # Publish the oracle JSON as a static asset for client-side loading.
-    public_oracle = site_root / "public" / "occt" / "oracles" / "fillets.json"
-    write_text_atomic(
-        public_oracle,
-        oracle_path.read_text(encoding="utf-8", errors="replace"),
-        tmp_root=tmp_root,
-    )
-
-    # Publish per-case mesh artifacts (generated by the repro) as static assets.
-    src_artifacts = repo_root / "repros" / "lane-fillets" / "golden" / "artifacts"
-    dst_artifacts = site_root / "public" / "occt" / "artifacts" / "fillets"
-    sync_tree(src_artifacts, dst_artifacts, tmp_root=tmp_root)
-
     # Generate an MDX page that mounts an Astro component (scripts in Markdown are not reliably executed).
     mdx = """---
 title: "Fillets Oracle Explorer"
@@ -458,6 +1044,148 @@ This page visualizes a ChFiDS data-model export (work-in-progress).
     write_text_atomic(dst, mdx, tmp_root=tmp_root, keep=keep)
 
 
+def collect_docs(repo_root: Path, dest_root: Path) -> list[DocJob]:
+    """Every synced markdown doc, landing page first."""
+    overview_src = repo_root / "notes" / "overview.md"
+    if not overview_src.is_file():
+        raise SystemExit(f"Missing source overview: {overview_src}")
+    # Landing page for the OCCT section.
+    docs = [DocJob(overview_src, dest_root / "index.md", "overview.md", "index.md")]
+    for pattern in ("maps/*.md", "dossiers/*.md"):
+        docs += glob_docs(repo_root / "notes", pattern, dest_root)
+    docs += glob_docs(repo_root / "notes" / "walkthroughs", "*.md", dest_root / "walkthroughs", dst_rel_prefix="walkthroughs")
+    docs += glob_docs(repo_root / "repros", "*/README.md", dest_root / "repros", dst_rel_prefix="repros")
+    docs += glob_docs(repo_root / "backlog", "docs/*.md", dest_root / "backlog", dst_rel_prefix="backlog")
+    return docs
+
+
+def write_explorers(
+    *,
+    repo_root: Path,
+    site_root: Path,
+    dest_root: Path,
+    tmp_root: Path,
+    occt_tag: str,
+    keep: set[Path] | None = None,
+    link_mode: str = "auto",
+) -> None:
+    # Static oracle/artifact assets the explorers load client-side.
+    try:
+        OraclePublisher(site_root, tmp_root, link_mode=link_mode).publish_all(repo_root)
+    except Exception as e:
+        print(f"[warn] oracle publishing failed: {e}")
+
+    # Site-only generated interactive pages (not present in repo docs).
+    try:
+        write_fillets_oracle_explorer(
+            repo_root=repo_root,
+            site_root=site_root,
+            dest_root=dest_root,
+            tmp_root=tmp_root,
+            occt_tag=occt_tag,
+            keep=keep,
+        )
+    except Exception:
+        # Don't fail sync if the interactive helper generation fails; the core docs are more important.
+        pass
+
+    try:
+        write_chfids_model_explorer(
+            repo_root=repo_root,
+            site_root=site_root,
+            dest_root=dest_root,
+            tmp_root=tmp_root,
+            keep=keep,
+        )
+    except Exception:
+        pass
+
+
+def watch(
+    repo_root: Path,
+    site_root: Path,
+    dest_root: Path,
+    tmp_root: Path,
+    occt_tag: str,
+    manifest: SyncManifest,
+    *,
+    poll: bool = False,
+    link_mode: str = "auto",
+) -> None:
+    """
+    Re-sync on source changes until interrupted. The doc list, OCCT tag and manifest
+    stay in memory; a change re-transforms only the touched docs. Golden JSON or
+    provenance edits re-detect the tag (re-syncing everything if it moved) and
+    refresh the explorers.
+
+    Prints `[watch] layout changed` when docs were added or removed, so a dev server
+    that caches the page list knows to reload.
+    """
+    from fs_watch import DirWatcher
+
+    roots = [repo_root / "notes", repo_root / "repros", repo_root / "backlog" / "docs"]
+    docs = {d.src.resolve(): d for d in collect_docs(repo_root, dest_root)}
+    with DirWatcher(roots, poll=poll) as watcher:
+        print(f"[watch] watching {len(docs)} docs ({watcher.kind})", flush=True)
+        retry: set[Path] = set()
+        try:
+            while True:
+                changed = {p.resolve() for p in watcher.wait()} | retry
+                retry = set()
+                # One bad batch (e.g. a file removed between the event and the sync) must
+                # not end the daemon: log it, keep watching, and retry its paths next time.
+                try:
+                    t0 = time.perf_counter()
+                    retag = any(
+                        (p.suffix == ".json" and p.parent.name == "golden") or p.name == "provenance.md" for p in changed
+                    )
+                    explorer_inputs = any("golden" in p.parts for p in changed)
+                    md = {p for p in changed if p.suffix == ".md"}
+                    removed: list[DocJob] = []
+                    if any(p not in docs or not p.exists() for p in md):
+                        fresh = {d.src.resolve(): d for d in collect_docs(repo_root, dest_root)}
+                        removed = [docs[src] for src in docs.keys() - fresh.keys()]
+                        for doc in removed:
+                            doc.dst.unlink(missing_ok=True)
+                            manifest.forget(doc.dst)
+                        layout = fresh.keys() != docs.keys()
+                        docs = fresh
+                    else:
+                        layout = False
+
+                    todo = [d for src, d in docs.items() if src in md]
+                    if retag:
+                        tag = detect_occt_tag(repo_root)
+                        if tag != occt_tag:
+                            occt_tag, todo = tag, list(docs.values())
+                    if explorer_inputs:
+                        write_explorers(
+                            repo_root=repo_root,
+                            site_root=site_root,
+                            dest_root=dest_root,
+                            tmp_root=tmp_root,
+                            occt_tag=occt_tag,
+                            link_mode=link_mode,
+                        )
+                    if not (todo or explorer_inputs or layout):
+                        continue
+                    sync_docs(todo, tmp_root=tmp_root, occt_tag=occt_tag, manifest=manifest, jobs=0)
+                    manifest.save(prune=False)
+                    names = ", ".join(sorted(d.dst_rel for d in todo)[:5]) + (" ..." if len(todo) > 5 else "")
+                    gone = f", removed {len(removed)}" if removed else ""
+                    print(
+                        f"[watch] synced {len(todo)} doc(s){gone} in {(time.perf_counter() - t0) * 1000:.0f} ms: {names}",
+                        flush=True,
+                    )
+                    if layout:
+                        print("[watch] layout changed", flush=True)
+                except Exception as e:  # noqa: BLE001
+                    retry = changed
+                    print(f"[watch] sync failed ({type(e).__name__}: {e}); still watching", flush=True)
+        except KeyboardInterrupt:
+            pass
+
+
 def main() -> int:
     ap = argparse.ArgumentParser()
     ap.add_argument("--root", default=".", help="repo root (default: .)")
@@ -472,6 +1200,29 @@ def main() -> int:
         action="store_true",
         help="delete and recreate destination subdir before syncing",
     )
+    ap.add_argument(
+        "--no-manifest",
+        action="store_true",
+        help="ignore .sync_tmp/manifest.json and re-transform every doc",
+    )
+    ap.add_argument(
+        "--jobs",
+        type=int,
+        default=0,
+        help=f"transform worker processes (default: 0 = one per CPU; pool only used for >= {PARALLEL_MIN_DOCS} stale docs)",
+    )
+    ap.add_argument(
+        "--watch",
+        action="store_true",
+        help="after the sync, keep running and re-sync individual docs as their sources change",
+    )
+    ap.add_argument("--poll", action="store_true", help="with --watch: poll mtimes instead of using inotify")
+    ap.add_argument(
+        "--link-mode",
+        choices=LINK_MODES,
+        default="auto",
+        help="how public/ assets are mirrored (default: auto = reflink, else copy; hardlink skips git-tracked files)",
+    )
     args = ap.parse_args()
 
     repo_root = Path(args.root).resolve()
@@ -486,77 +1237,23 @@ def main() -> int:
     tmp_root = site_root / ".sync_tmp"
     occt_tag = detect_occt_tag(repo_root)
     keep: set[Path] | None = set() if args.clean else None
-
-    # Landing page for the OCCT section.
-    overview_src = repo_root / "notes" / "overview.md"
-    overview_dst = dest_root / "index.md"
-    if not overview_src.is_file():
-        raise SystemExit(f"Missing source overview: {overview_src}")
-    copy_file(
-        overview_src,
-        overview_dst,
+    manifest = None if args.no_manifest else SyncManifest(tmp_root / "manifest.json", site_root)
+
+    docs = collect_docs(repo_root, dest_root)
+    # One ordered batch so the transform pool spans every glob; writes stay in this order.
+    copied = sync_docs(docs, tmp_root=tmp_root, occt_tag=occt_tag, keep=keep, manifest=manifest, jobs=args.jobs)
+    write_explorers(
+        repo_root=repo_root,
+        site_root=site_root,
+        dest_root=dest_root,
         tmp_root=tmp_root,
-        src_rel="overview.md",
-        dst_rel="index.md",
         occt_tag=occt_tag,
         keep=keep,
+        link_mode=args.link_mode,
     )
 
-    copied = 0
-    copied += copy_glob(repo_root / "notes", "maps/*.md", dest_root, tmp_root=tmp_root, occt_tag=occt_tag, keep=keep)
-    copied += copy_glob(repo_root / "notes", "dossiers/*.md", dest_root, tmp_root=tmp_root, occt_tag=occt_tag, keep=keep)
-    copied += copy_glob(
-        repo_root / "notes" / "walkthroughs",
-        "*.md",
-        dest_root / "walkthroughs",
-        tmp_root=tmp_root,
-        occt_tag=occt_tag,
-        dst_rel_prefix="walkthroughs",
-        keep=keep,
-    )
-    copied += copy_glob(
-        repo_root / "repros",
-        "*/README.md",
-        dest_root / "repros",
-        tmp_root=tmp_root,
-        occt_tag=occt_tag,
-        dst_rel_prefix="repros",
-        keep=keep,
-    )
-    copied += copy_glob(
-        repo_root / "backlog",
-        "docs/*.md",
-        dest_root / "backlog",
-        tmp_root=tmp_root,
-        occt_tag=occt_tag,
-        dst_rel_prefix="backlog",
-        keep=keep,
-    )
-
-    # Site-only generated interactive pages (not present in repo docs).
-    try:
-        write_fillets_oracle_explorer(
-            repo_root=repo_root,
-            site_root=site_root,
-            dest_root=dest_root,
-            tmp_root=tmp_root,
-            occt_tag=occt_tag,
-            keep=keep,
-        )
-    except Exception:
-        # Don't fail sync if the interactive helper generation fails; the core docs are more important.
-        pass
-
-    try:
-        write_chfids_model_explorer(
-            repo_root=repo_root,
-            site_root=site_root,
-            dest_root=dest_root,
-            tmp_root=tmp_root,
-            keep=keep,
-        )
-    except Exception:
-        pass
+    if manifest is not None:
+        manifest.save()
 
     if keep is not None:
         # Delete stale docs after we've written the fresh tree, to avoid transient missing slugs in dev.
@@ -567,7 +1264,11 @@ def main() -> int:
             if rp not in keep:
                 p.unlink()
 
-    print(f"[ok] Synced {copied + 1} markdown files into {dest_root} (occt tag: {occt_tag})")
+    print(f"[ok] Synced {copied} markdown files into {dest_root} (occt tag: {occt_tag})")
+    if args.watch:
+        if manifest is None:
+            manifest = SyncManifest(tmp_root / "manifest.json", site_root)
+        watch(repo_root, site_root, dest_root, tmp_root, occt_tag, manifest, poll=args.poll, link_mode=args.link_mode)
     return 0
 
 
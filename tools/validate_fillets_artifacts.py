@@ -8,6 +8,8 @@ from pathlib import Path
 
 from jsonschema.validators import validator_for
 
+from occt_mesh import validate_mesh
+
 
 def fail(msg: str) -> None:
     print(f"[FAIL] {msg}")
@@ -127,49 +129,8 @@ def validate_model_json(schema: dict, model_path: Path) -> list[str]:
 
 
 def validate_mesh_json(mesh_path: Path) -> list[str]:
-    errs: list[str] = []
-    try:
-        data = json.loads(mesh_path.read_text(encoding="utf-8"))
-    except Exception as e:  # noqa: BLE001
-        return [f"{mesh_path}: failed to parse JSON: {e}"]
-
-    pos = data.get("positions")
-    ind = data.get("indices")
-    if not isinstance(pos, list) or not isinstance(ind, list):
-        return [f"{mesh_path}: expected 'positions' and 'indices' arrays"]
-
-    if len(pos) < 9 or len(pos) % 3 != 0:
-        errs.append(f"{mesh_path}: positions length {len(pos)} must be >= 9 and divisible by 3")
-        return errs
-
-    if len(ind) < 3 or len(ind) % 3 != 0:
-        errs.append(f"{mesh_path}: indices length {len(ind)} must be >= 3 and divisible by 3")
-        return errs
-
-    if any(not _is_finite_number(x) for x in pos):
-        errs.append(f"{mesh_path}: positions contain non-finite values")
-        return errs
-
-    indices_int: list[int] = []
-    for x in ind:
-        if isinstance(x, int):
-            indices_int.append(x)
-        elif isinstance(x, float) and x.is_integer():
-            indices_int.append(int(x))
-        else:
-            errs.append(f"{mesh_path}: indices contain non-integer value {x!r}")
-            return errs
-
-    nverts = len(pos) // 3
-    if nverts <= 0:
-        errs.append(f"{mesh_path}: no vertices")
-        return errs
-
-    lo = min(indices_int)
-    hi = max(indices_int)
-    if lo < 0 or hi >= nverts:
-        errs.append(f"{mesh_path}: index out of range (nverts={nverts}, min={lo}, max={hi})")
-    return errs
+    # mesh-v1 (inline arrays) or mesh-v2 (header + .mesh.bin); see tools/occt_mesh.py.
+    return validate_mesh(mesh_path)
 
 
 def main() -> int: